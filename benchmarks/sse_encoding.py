@@ -0,0 +1,107 @@
+"""Benchmark SSE event encoding throughput.
+
+Compares the bytes encoder used by ``SSEStream`` and ``SSEBroker`` with the
+previous string-based formatter (whose output Starlette then encoded a second
+time) for typical payloads.
+
+Run with:
+    python benchmarks/sse_encoding.py [--number 20000] [--repeat 15]
+
+Install ``orjson`` to see the JSON fast path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import Any
+
+from fasthtml.common import Div, P, Span, to_xml
+
+from faststrap.presets import sse_event
+from faststrap.presets.streams import _encode_sse, _orjson
+
+
+def _legacy_format(payload: dict[str, Any]) -> str:
+    """The string formatter used before the bytes encoder."""
+    data = payload.get("data", "")
+    event = payload.get("event")
+    event_id = payload.get("id")
+    retry = payload.get("retry")
+
+    if isinstance(data, (dict, list, tuple)):
+        data_str = json.dumps(data, default=str)
+    else:
+        data_str = "" if data is None else str(data)
+
+    lines = data_str.splitlines() or [""]
+    parts: list[str] = []
+    if event:
+        parts.append(f"event: {event}")
+    if event_id:
+        parts.append(f"id: {event_id}")
+    if retry is not None:
+        parts.append(f"retry: {int(retry)}")
+    parts.extend(f"data: {line}" for line in lines)
+    return "\n".join(parts) + "\n\n"
+
+
+def _legacy_encode(payload: dict[str, Any]) -> bytes:
+    # Starlette encodes each str chunk before sending it.
+    return _legacy_format(payload).encode("utf-8")
+
+
+def _panel() -> Any:
+    return Div(
+        P("Orders today", cls="text-muted mb-1"),
+        Span("1,284", cls="fs-3 fw-bold"),
+        cls="card card-body",
+    )
+
+
+PAYLOADS: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {
+    "single-line text": (sse_event("42", event="count"),) * 2,
+    "multi-line HTML": (sse_event(to_xml(_panel()), event="stats"),) * 2,
+    "JSON dict": (sse_event({"kpi": "orders", "value": 1284, "delta": [1, -2, 3]}, event="kpi"),)
+    * 2,
+    "pre-serialized JSON": (
+        # The legacy formatter only accepted str; the bytes encoder takes bytes as-is.
+        sse_event('{"kpi":"orders","value":1284}', event="kpi"),
+        sse_event(b'{"kpi":"orders","value":1284}', event="kpi"),
+    ),
+    # A raw payload dict, so the component is rendered by the encoder. The
+    # legacy formatter rendered it through ``str(ft)`` on every event; the
+    # bytes encoder reuses the cached render of identical content.
+    "FT component": ({"data": _panel(), "event": "stats"},) * 2,
+}
+
+
+def _rates(
+    payloads: tuple[dict[str, Any], dict[str, Any]], number: int, repeat: int
+) -> tuple[float, float]:
+    """Return (legacy, current) events/second, interleaving runs to even out noise."""
+    legacy_payload, payload = payloads
+    legacy: list[float] = []
+    current: list[float] = []
+    for _ in range(repeat):
+        legacy.append(timeit.timeit(lambda: _legacy_encode(legacy_payload), number=number))
+        current.append(timeit.timeit(lambda: _encode_sse(payload), number=number))
+    return number / min(legacy), number / min(current)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000, help="encodes per timing run")
+    parser.add_argument("--repeat", type=int, default=15, help="timing runs per encoder")
+    args = parser.parse_args()
+
+    print(f"orjson: {'installed' if _orjson is not None else 'not installed'}")
+    print(f"{'payload':<22}{'legacy ev/s':>14}{'bytes ev/s':>14}{'speedup':>10}")
+    for name, payloads in PAYLOADS.items():
+        legacy, current = _rates(payloads, args.number, args.repeat)
+        print(f"{name:<22}{legacy:>14,.0f}{current:>14,.0f}{current / legacy:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
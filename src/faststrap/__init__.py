@@ -30,6 +30,7 @@ from .components.display import (
     CarouselItem,
     Chart,
     DataTable,
+    DataTableIndex,
     EmptyState,
     Figure,
     Image,
@@ -49,6 +50,8 @@ from .components.display import (
     THead,
     TrendCard,
     TRow,
+    WSTarget,
+    datatable_diff,
     datatable_export_params,
     render_svg,
 )
@@ -237,6 +240,8 @@ __all__ = [
     "CarouselItem",
     "Chart",
     "DataTable",
+    "DataTableIndex",
+    "datatable_diff",
     "datatable_export_params",
     "EmptyState",
     "Figure",
@@ -250,6 +255,7 @@ __all__ = [
     "Svg",
     "StatCard",
     "SSETarget",
+    "WSTarget",
     "TextClamp",
     "BsTable",
     "BsTHead",
@@ -12,6 +12,7 @@ from .display import (
     CarouselItem,
     Chart,
     DataTable,
+    DataTableIndex,
     EmptyState,
     Figure,
     Image,
@@ -29,6 +30,8 @@ from .display import (
     THead,
     TrendCard,
     TRow,
+    WSTarget,
+    datatable_diff,
     datatable_export_params,
 )
 from .feedback import (
@@ -159,6 +162,8 @@ __all__ = [
     "CarouselItem",
     "Chart",
     "DataTable",
+    "DataTableIndex",
+    "datatable_diff",
     "datatable_export_params",
     "EmptyState",
     "Figure",
@@ -169,6 +174,7 @@ __all__ = [
     "Sheet",
     "MetricCard",
     "SSETarget",
+    "WSTarget",
     "StatCard",
     "TextClamp",
     "BsTable",
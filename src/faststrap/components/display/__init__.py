@@ -4,7 +4,8 @@ from .badge import Badge
 from .card import Card
 from .carousel import Carousel, CarouselItem
 from .chart import Chart
-from .data_table import DataTable, datatable_export_params
+from .data_table import DataTable, datatable_diff, datatable_export_params
+from .data_table_index import DataTableIndex
 from .empty_state import EmptyState
 from .figure import Figure
 from .image import Image
@@ -17,6 +18,7 @@ from .stat_card import KPICard, MetricCard, StatCard, TrendCard
 from .svg import Svg, render_svg
 from .table import BsTable, BsTBody, BsTCell, BsTHead, BsTRow, Table, TBody, TCell, THead, TRow
 from .text_clamp import TextClamp
+from .ws_target import WSTarget
 
 __all__ = [
     "Badge",
@@ -25,7 +27,9 @@ __all__ = [
     "CarouselItem",
     "Chart",
     "DataTable",
+    "datatable_diff",
     "datatable_export_params",
+    "DataTableIndex",
     "EmptyState",
     "Figure",
     "Image",
@@ -35,6 +39,7 @@ __all__ = [
     "Mermaid",
     "Sheet",
     "SSETarget",
+    "WSTarget",
     "Svg",
     "render_svg",
     "MetricCard",
@@ -0,0 +1,202 @@
+"""Apache Arrow input support for Table and DataTable.
+
+pyarrow is never imported unless the caller already passed an Arrow object,
+so these helpers cost nothing when pyarrow is not installed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+_ARROW_TYPES = ("Table", "RecordBatch", "RecordBatchReader")
+
+
+def _is_arrow(data: Any) -> bool:
+    cls = data.__class__
+    return cls.__module__.startswith("pyarrow") and cls.__name__ in _ARROW_TYPES
+
+
+def _arrow_table(data: Any, *, columns: list[str] | None, max_rows: int | None) -> Any:
+    """Return ``data`` as a ``pyarrow.Table`` projected to ``columns`` and ``max_rows``.
+
+    Readers are only consumed until ``max_rows`` rows have been read.
+    """
+    import pyarrow as pa
+
+    name = data.__class__.__name__
+    if name == "RecordBatchReader":
+        if max_rows is None:
+            table = data.read_all()
+        else:
+            batches = []
+            seen = 0
+            while seen < max_rows:
+                try:
+                    batch = data.read_next_batch()
+                except StopIteration:
+                    break
+                batches.append(batch)
+                seen += batch.num_rows
+            table = pa.Table.from_batches(batches, schema=data.schema)
+    elif name == "RecordBatch":
+        table = pa.Table.from_batches([data])
+    else:
+        table = data
+
+    if columns is not None:
+        missing = [col for col in columns if col not in table.column_names]
+        if missing:
+            msg = f"Requested columns not found in Arrow table: {missing}"
+            raise ValueError(msg)
+        table = table.select(columns)
+    if max_rows is not None:
+        table = table.slice(0, max_rows)
+    return table
+
+
+def _arrow_window(table: Any, positions: Sequence[int]) -> Any:
+    """Return the rows at ``positions``; contiguous windows are zero-copy slices."""
+    if isinstance(positions, range) and positions.step == 1:
+        return table.slice(positions.start, len(positions))
+
+    import pyarrow as pa
+
+    return table.take(pa.array(positions, type=pa.int64()))
+
+
+def _is_text(dtype: Any) -> bool:
+    import pyarrow as pa
+
+    return bool(pa.types.is_string(dtype) or pa.types.is_large_string(dtype))
+
+
+def _arrow_search(table: Any, query: str, *, include_index: bool) -> list[int]:
+    """Return ascending row positions with a cell containing ``query`` (case-insensitive).
+
+    Text, integer and boolean columns are matched with ``pyarrow.compute``;
+    other types fall back to DataTable's per-cell ``str(value)`` test.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    needle = query.casefold()
+    cells: list[Any] = list(table.columns)
+    if include_index:
+        cells.insert(0, pa.array(range(table.num_rows), type=pa.int64()))
+
+    mask = None
+    for column in cells:
+        dtype = column.type
+        if _is_text(dtype):
+            hits = pc.match_substring(column, needle, ignore_case=True)
+        elif pa.types.is_integer(dtype) or pa.types.is_boolean(dtype):
+            hits = pc.match_substring(pc.cast(column, pa.string()), needle, ignore_case=True)
+        else:
+            hits = pa.array(
+                [
+                    value is not None and needle in str(value).casefold()
+                    for value in column.to_pylist()
+                ],
+                type=pa.bool_(),
+            )
+        hits = pc.fill_null(hits, False)
+        mask = hits if mask is None else pc.or_(mask, hits)
+
+    if mask is None:
+        return []
+    return [int(pos) for pos in pc.indices_nonzero(mask).to_pylist()]
+
+
+def _arrow_ranks(column: Any) -> Any:
+    """Dense ranks for ``column`` with nulls ranked last (text compares lowercased)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    dtype = column.type
+    if _is_text(dtype):
+        column = pc.utf8_lower(column)
+    elif pa.types.is_boolean(dtype):
+        column = pc.cast(column, pa.int8())
+    try:
+        ranks = pc.rank(column, sort_keys="ascending", tiebreaker="dense")
+    except (pa.ArrowNotImplementedError, pa.ArrowTypeError):
+        from .data_table_index import _column_ranks
+
+        ranks = pa.array(_column_ranks(column.to_pylist())[1])
+    return pc.cast(ranks, pa.int64())
+
+
+def _arrow_sort(
+    table: Any,
+    specs: Sequence[tuple[str, str]],
+    positions: Sequence[int] | None = None,
+) -> list[int]:
+    """Stable-sort row positions by ``specs`` with ``pyarrow.compute``.
+
+    Matches DataTable's list sort: nulls sort last ascending and first
+    descending, and ties keep their original row order.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    subset = None
+    if positions is not None:
+        subset = pa.array(positions, type=pa.int64())
+        table = table.take(subset)
+
+    keys = {}
+    for idx, (col, direction) in enumerate(specs):
+        ranks = _arrow_ranks(table.column(col))
+        keys[f"k{idx}"] = pc.negate(ranks) if direction == "desc" else ranks
+    order = pc.sort_indices(pa.table(keys), sort_keys=[(name, "ascending") for name in keys])
+
+    if subset is not None:
+        order = subset.take(order)
+    return [int(pos) for pos in order.to_pylist()]
+
+
+def _format_arrow_column(column: Any, formatter: Any, none_as: str) -> list[str]:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    from .table import _escape_column, _format_values
+
+    dtype = column.type
+    missing = pc.is_null(column, nan_is_null=True)
+    has_missing = pc.any(missing).as_py()
+    present = pc.filter(column, pc.invert(missing)) if has_missing else column
+
+    if formatter is None and pa.types.is_integer(dtype):
+        texts = pc.cast(present, pa.string()).to_pylist()
+    elif formatter is None:
+        texts = [str(value) for value in present.to_pylist()]
+    elif isinstance(formatter, str) and "{" not in formatter and pa.types.is_temporal(dtype):
+        texts = pc.strftime(present, format=formatter).to_pylist()
+    else:
+        texts = _format_values(present.to_pylist(), formatter)
+
+    numeric = pa.types.is_integer(dtype) or pa.types.is_floating(dtype)
+    if formatter is not None or not (numeric or pa.types.is_temporal(dtype)):
+        texts = _escape_column(texts)
+
+    if not has_missing:
+        return list(texts)
+    result = [none_as] * len(column)
+    valid = pc.indices_nonzero(pc.invert(missing)).to_pylist()
+    for pos, text in zip(valid, texts, strict=True):
+        result[pos] = text
+    return result
+
+
+def _format_arrow_columns(
+    table: Any,
+    *,
+    formatters: dict[str, Any] | None,
+    none_as: str,
+) -> list[list[str]]:
+    """Format an Arrow window column by column into escaped strings."""
+    return [
+        _format_arrow_column(table.column(name), (formatters or {}).get(str(name)), none_as)
+        for name in table.column_names
+    ]
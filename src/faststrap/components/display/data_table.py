@@ -5,10 +5,12 @@ from __future__ import annotations
 import hashlib
 import json
 import math
-from typing import Any, Literal, cast
+import re
+from collections.abc import Sequence
+from typing import Any, Literal
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from fasthtml.common import A, Div, Form, Input, Li, Nav, Span, Ul
+from fasthtml.common import A, Div, Form, Input, Li, Nav, NotStr, Span, Template, Ul
 
 from ...core._ids import uniquify_id
 from ...core._stability import beta
@@ -16,11 +18,33 @@ from ...core.base import merge_classes
 from ...core.registry import register
 from ...core.theme import resolve_defaults
 from ...utils.attrs import convert_attrs
-from .table import Table, TBody, TCell, THead, TRow, _normalize_table_data
+from ._arrow import (
+    _arrow_search,
+    _arrow_sort,
+    _arrow_table,
+    _arrow_window,
+    _format_arrow_columns,
+    _is_arrow,
+)
+from .data_table_index import DataTableIndex, SortSpec, _sort_records
+from .table import (
+    CellFormatter,
+    Table,
+    TBody,
+    TCell,
+    THead,
+    TRow,
+    _format_record_columns,
+    _is_missing,
+    _normalize_table_data,
+    _render_body_rows,
+)
 
 SortableDirection = Literal["asc", "desc"]
 ResponsiveType = Literal["sm", "md", "lg", "xl", "xxl"]
 
+_SAFE_ROW_KEY = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
 
 def _stable_table_id(
     *,
@@ -84,19 +108,50 @@ def _matches_search(
     return any(needle in ("" if value is None else str(value)).casefold() for value in values)
 
 
-def _sort_key(value: Any) -> tuple[int, int, Any]:
-    if value is None:
-        return (1, 1, "")
-    if isinstance(value, bool):
-        return (0, 0, int(value))
-    if isinstance(value, (int, float)):
-        return (0, 0, value)
-    return (0, 1, str(value).casefold())
+def _parse_sort(
+    sort: str | list[str] | tuple[str, ...] | None,
+    direction: SortableDirection,
+) -> list[SortSpec]:
+    """Normalize ``sort`` into ``(column, direction)`` pairs.
+
+    A ``-`` prefix sorts that column descending and ``+`` ascending; unprefixed
+    columns use ``direction``. Repeated columns keep their first occurrence.
+    """
+    if not sort:
+        return []
+    raw = [sort] if isinstance(sort, str) else list(sort)
+    specs: list[SortSpec] = []
+    seen: set[str] = set()
+    for item in raw:
+        item = str(item).strip()
+        column_dir: SortableDirection = direction
+        if item[:1] == "-":
+            item, column_dir = item[1:], "desc"
+        elif item[:1] == "+":
+            item, column_dir = item[1:], "asc"
+        if item and item not in seen:
+            seen.add(item)
+            specs.append((item, column_dir))
+    return specs
+
+
+def _sort_params(specs: list[SortSpec]) -> dict[str, Any]:
+    """Encode sort specs in the query contract.
+
+    A single column keeps the ``sort=<col>&direction=<dir>`` form; multiple
+    columns use repeated ``sort`` params with a ``-`` prefix for descending.
+    """
+    if not specs:
+        return {}
+    if len(specs) == 1:
+        column, column_dir = specs[0]
+        return {"sort": column, "direction": column_dir}
+    return {"sort": [f"-{col}" if col_dir == "desc" else col for col, col_dir in specs]}
 
 
 def datatable_export_params(
     *,
-    sort: str | None = None,
+    sort: str | list[str] | None = None,
     direction: SortableDirection = "asc",
     search: str | None = None,
     search_param: str = "q",
@@ -119,9 +174,7 @@ def datatable_export_params(
                 continue
             params[str(key)] = normalized
 
-    if sort:
-        params["sort"] = sort
-        params["direction"] = direction
+    params.update(_sort_params(_parse_sort(sort, direction)))
 
     if search is not None:
         params[search_param] = search
@@ -135,6 +188,178 @@ def datatable_export_params(
     return params
 
 
+def _virtual_window(page: int, per_page: int) -> tuple[int, int]:
+    """Return the ``(start, stop)`` row window rendered for a virtual page.
+
+    Each virtual response renders the requested page plus the following one so
+    the viewport never scrolls into an empty gap while the next window loads.
+    """
+    start = (page - 1) * per_page
+    return start, start + per_page * 2
+
+
+def _spacer_row(height: int, *, colspan: int, position: str) -> Any:
+    return TRow(
+        TCell(
+            colspan=colspan,
+            style=f"height: {height}px; padding: 0; border: 0;",
+        ),
+        cls="faststrap-virtual-spacer",
+        aria_hidden="true",
+        data_fs_virtual_spacer=position,
+    )
+
+
+def _row_dom_id(table_id: str, value: Any) -> str:
+    """Return the stable ``<tr>`` id for a ``row_key`` value.
+
+    Short ids made of letters, digits, ``-`` and ``_`` are used verbatim;
+    anything else is hashed so the id is always a valid CSS selector.
+    """
+    text = "" if value is None else str(value)
+    if not _SAFE_ROW_KEY.fullmatch(text):
+        text = "h" + hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+    return f"{table_id}-row-{text}"
+
+
+def _empty_row(empty_text: str, *, colspan: int) -> Any:
+    return TRow(TCell(empty_text, colspan=max(1, colspan), cls="text-center text-muted"))
+
+
+def _render_keyed_rows(
+    records: Sequence[dict[str, Any]],
+    columns: list[str],
+    row_ids: Sequence[str],
+    *,
+    formatters: dict[str, CellFormatter] | None,
+    none_as: str,
+    row_attrs: dict[str, Any] | None = None,
+) -> NotStr:
+    block = _format_record_columns(records, columns, formatters=formatters, none_as=none_as)
+    return _render_body_rows(block, row_count=len(records), row_attrs=row_attrs, row_ids=row_ids)
+
+
+def _same_cells(old: dict[str, Any], new: dict[str, Any], columns: list[str]) -> bool:
+    for col in columns:
+        before, after = old.get(col), new.get(col)
+        if before != after and not (_is_missing(before) and _is_missing(after)):
+            return False
+    return True
+
+
+def datatable_diff(
+    old_rows: Any,
+    new_rows: Any,
+    *,
+    row_key: str,
+    table_id: str,
+    columns: list[str] | None = None,
+    formatters: dict[str, CellFormatter] | None = None,
+    none_as: str = "",
+    empty_text: str = "No data available",
+) -> Any:
+    """Build out-of-band swaps that update a ``DataTable(row_key=...)`` in place.
+
+    Only changed rows are sent: updated rows replace their ``<tr>``, deleted
+    rows are removed, and inserted rows are placed after the previous kept
+    row. Fragments are wrapped in a ``<template>`` so table rows survive HTML
+    parsing. If the kept rows were reordered, the columns changed, or either
+    side is empty, the whole ``<tbody>`` is replaced instead.
+
+    Args:
+        old_rows: Rows currently rendered (list of dicts, DataFrame, or Arrow).
+        new_rows: Rows that should be rendered.
+        row_key: Column holding a unique, stable row key.
+        table_id: The DataTable ``table_id`` the rows belong to.
+        columns: Optional column order (must match the rendered table).
+        formatters: Per-column formatters (as in ``DataTable``).
+        none_as: Substitute for missing values.
+        empty_text: Text to display when ``new_rows`` is empty.
+
+    Example:
+        >>> AutoRefresh("/orders/changes", target="this", hx_swap="none")
+        >>> DataTable.diff(previous, current, row_key="id", table_id="orders")
+    """
+    old_columns, old_records, _ = _normalize_table_data(
+        old_rows, columns=columns, max_rows=None, include_index=False
+    )
+    new_columns, new_records, _ = _normalize_table_data(
+        new_rows, columns=columns, max_rows=None, include_index=False
+    )
+    if not new_records:
+        new_columns = old_columns
+    if (old_records or new_records) and row_key not in new_columns:
+        msg = f"row_key {row_key!r} is not one of the table columns"
+        raise ValueError(msg)
+
+    body_id = f"{table_id}-body"
+    old_ids = [_row_dom_id(table_id, row.get(row_key)) for row in old_records]
+    new_ids = [_row_dom_id(table_id, row.get(row_key)) for row in new_records]
+    if len(set(new_ids)) != len(new_ids):
+        msg = f"row_key {row_key!r} values must be unique"
+        raise ValueError(msg)
+
+    old_by_id = dict(zip(old_ids, old_records, strict=True))
+    new_set = set(new_ids)
+    kept_old = [row_id for row_id in old_ids if row_id in new_set]
+    kept_new = [row_id for row_id in new_ids if row_id in old_by_id]
+
+    if not old_records or not new_records or old_columns != new_columns or kept_old != kept_new:
+        if new_records:
+            rows: Any = _render_keyed_rows(
+                new_records, new_columns, new_ids, formatters=formatters, none_as=none_as
+            )
+        else:
+            rows = _empty_row(empty_text, colspan=len(new_columns))
+        return Template(TBody(rows, id=body_id, hx_swap_oob="true"))
+
+    fragments: list[str] = [
+        f'<tr id="{row_id}" hx-swap-oob="delete"></tr>'
+        for row_id in old_ids
+        if row_id not in new_set
+    ]
+
+    updated = [
+        pos
+        for pos, row_id in enumerate(new_ids)
+        if row_id in old_by_id and not _same_cells(old_by_id[row_id], new_records[pos], new_columns)
+    ]
+    if updated:
+        fragments.append(
+            str(
+                _render_keyed_rows(
+                    [new_records[pos] for pos in updated],
+                    new_columns,
+                    [new_ids[pos] for pos in updated],
+                    row_attrs={"hx_swap_oob": "true"},
+                    formatters=formatters,
+                    none_as=none_as,
+                )
+            )
+        )
+
+    # Consecutive inserted rows share one wrapper; htmx inserts its children.
+    anchor = f"afterbegin:#{body_id}"
+    run: list[int] = []
+    for pos, row_id in enumerate([*new_ids, None]):
+        if row_id is not None and row_id not in old_by_id:
+            run.append(pos)
+            continue
+        if run:
+            inserted = _render_keyed_rows(
+                [new_records[idx] for idx in run],
+                new_columns,
+                [new_ids[idx] for idx in run],
+                formatters=formatters,
+                none_as=none_as,
+            )
+            fragments.append(f'<tbody hx-swap-oob="{anchor}">{inserted}</tbody>')
+            run = []
+        anchor = f"afterend:#{row_id}"
+
+    return Template(NotStr("\n".join(fragments)))
+
+
 def _link_attrs(
     url: str,
     *,
@@ -164,14 +389,16 @@ def DataTable(
     header_map: dict[str, str] | None = None,
     max_rows: int | None = None,
     include_index: bool = False,
+    row_key: str | None = None,
     empty_text: str = "No data available",
     none_as: str = "",
+    formatters: dict[str, CellFormatter] | None = None,
     striped: bool = True,
     hover: bool = True,
     bordered: bool = False,
     responsive: bool | ResponsiveType = True,
     sortable: bool | list[str] = False,
-    sort: str | None = None,
+    sort: str | list[str] | None = None,
     direction: SortableDirection = "asc",
     searchable: bool = False,
     search: str | None = None,
@@ -188,6 +415,9 @@ def DataTable(
     hx_target: str | None = None,
     hx_swap: str | None = "outerHTML",
     push_url: bool = False,
+    virtual: bool = False,
+    row_height: int = 40,
+    viewport_height: int = 480,
     table_id: str | None = None,
     table_cls: str | None = None,
     table_attrs: dict[str, Any] | None = None,
@@ -196,20 +426,29 @@ def DataTable(
     """DataTable with optional sorting, search, and pagination.
 
     Args:
-        data: List of dicts or pandas/polars DataFrame.
+        data: List of dicts, pandas/polars DataFrame, pyarrow Table /
+            RecordBatch / RecordBatchReader, or a prebuilt ``DataTableIndex``
+            (which then owns ``columns``, ``max_rows`` and ``include_index``
+            and answers ``search`` from its index).
         columns: Optional column order.
         header_map: Optional display name mapping for headers.
         max_rows: Optional max rows to render (pre-pagination).
         include_index: Include index column for DataFrame or list data.
+        row_key: Column with a unique key per row. Rows get stable
+            ``{table_id}-row-{key}`` ids and the body gets ``{table_id}-body``
+            so ``DataTable.diff`` can update individual rows.
         empty_text: Text to display when no records exist.
-        none_as: Substitute for None values.
+        none_as: Substitute for missing values (None or NaN).
+        formatters: Per-column formatters: a ``"{:,.2f}"`` format string,
+            a ``"%Y-%m-%d"`` strftime pattern, or a callable.
         striped: Enable zebra striping.
         hover: Enable row hover styles.
         bordered: Enable borders.
         responsive: Wrap table in Bootstrap responsive container.
         sortable: True for all columns or a list of sortable columns.
-        sort: Current sort column.
-        direction: Current sort direction.
+        sort: Current sort column, or a list of columns for multi-column sort
+            (``["region", "-revenue"]``; a ``-`` prefix sorts descending).
+        direction: Current sort direction (for columns without a prefix).
         searchable: Render a search input.
         search: Current search value.
         search_param: Query param name for search.
@@ -225,6 +464,12 @@ def DataTable(
         hx_target: HTMX target selector.
         hx_swap: HTMX swap strategy for links/search.
         push_url: If True, enable hx-push-url for links.
+        virtual: Render a fixed-height scroll viewport that fetches row windows
+            from ``endpoint`` while scrolling instead of paginating. ``per_page``
+            sets the window size; each response renders ``page`` and the page
+            after it between top/bottom spacer rows.
+        row_height: Fixed row height (px) used to position virtual windows.
+        viewport_height: Height (px) of the virtual scroll viewport.
         table_id: Explicit wrapper id (auto-generated if omitted).
         table_cls: Extra CSS classes for the table element.
         table_attrs: Extra attributes applied to the table element.
@@ -260,16 +505,49 @@ def DataTable(
     if c_pagination and page < 1:
         msg = f"page must be >= 1, got {page}"
         raise ValueError(msg)
-    if c_pagination and c_per_page < 1:
+    if (c_pagination or virtual) and c_per_page < 1:
         msg = f"per_page must be >= 1, got {c_per_page}"
         raise ValueError(msg)
+    if virtual:
+        if endpoint is None:
+            msg = "DataTable(virtual=True) requires an endpoint to fetch row windows"
+            raise ValueError(msg)
+        if page < 1:
+            msg = f"page must be >= 1, got {page}"
+            raise ValueError(msg)
+        if row_height < 1:
+            msg = f"row_height must be >= 1, got {row_height}"
+            raise ValueError(msg)
+
+    table_index: DataTableIndex | None = None
+    arrow_table: Any = None
+    records: list[dict[str, Any]] = []
+    index_values: list[str] | None = None
+    if isinstance(data, DataTableIndex):
+        if columns is not None or max_rows is not None:
+            msg = "Configure columns and max_rows on the DataTableIndex, not on DataTable"
+            raise ValueError(msg)
+        table_index = data
+        include_index = data.include_index
+        resolved_columns = list(data.columns)
+        records = data.records
+        index_values = data.index_values
+    elif _is_arrow(data):
+        # Arrow data stays columnar: search/sort run in pyarrow.compute and only
+        # the rendered window is converted to Python strings.
+        arrow_table = _arrow_table(data, columns=columns, max_rows=max_rows)
+        resolved_columns = [str(col) for col in arrow_table.column_names]
+    else:
+        resolved_columns, records, index_values = _normalize_table_data(
+            data,
+            columns=columns,
+            max_rows=max_rows,
+            include_index=include_index,
+        )
 
-    resolved_columns, records, index_values = _normalize_table_data(
-        data,
-        columns=columns,
-        max_rows=max_rows,
-        include_index=include_index,
-    )
+    if row_key is not None and row_key not in resolved_columns:
+        msg = f"row_key {row_key!r} is not one of the table columns"
+        raise ValueError(msg)
 
     if isinstance(c_sortable, list):
         sortable_columns = [col for col in c_sortable if col in resolved_columns]
@@ -278,51 +556,73 @@ def DataTable(
     else:
         sortable_columns = []
 
-    if search:
-        filtered_records: list[dict[str, Any]] = []
-        filtered_index_values: list[str] | None = [] if index_values is not None else None
-        for idx, row in enumerate(records):
-            current_index = index_values[idx] if index_values is not None else None
+    sort_specs = [spec for spec in _parse_sort(sort, c_direction) if spec[0] in sortable_columns]
+
+    row_total = len(records) if arrow_table is None else arrow_table.num_rows
+    positions: Sequence[int] = range(row_total)
+    if search and table_index is not None:
+        positions = table_index.search(search)
+    elif search and arrow_table is not None:
+        positions = _arrow_search(arrow_table, search, include_index=include_index)
+    elif search:
+        positions = [
+            idx
+            for idx, row in enumerate(records)
             if _matches_search(
                 row,
                 columns=resolved_columns,
                 query=search,
-                index_value=current_index if include_index else None,
-            ):
-                filtered_records.append(row)
-                if filtered_index_values is not None and current_index is not None:
-                    filtered_index_values.append(current_index)
-        records = filtered_records
-        if filtered_index_values is not None:
-            index_values = filtered_index_values
-
-    if sort not in sortable_columns:
-        sort = None
-    elif endpoint is None:
-        active_sort = cast(str, sort)
-        indexed_records = list(enumerate(records))
-        indexed_records.sort(
-            key=lambda item: _sort_key(item[1].get(active_sort)),
-            reverse=c_direction == "desc",
-        )
-        records = [record for _, record in indexed_records]
-        if index_values is not None:
-            index_values = [index_values[idx] for idx, _ in indexed_records]
+                index_value=(
+                    index_values[idx] if include_index and index_values is not None else None
+                ),
+            )
+        ]
+
+    # Virtual windows are sliced here unless total_rows says the caller did it.
+    sorts_locally = endpoint is None or (virtual and total_rows is None)
+    if sort_specs and sorts_locally:
+        if table_index is not None:
+            positions = table_index.sort(sort_specs, positions if search else None)
+        elif arrow_table is not None:
+            positions = _arrow_sort(arrow_table, sort_specs, positions if search else None)
+        else:
+            order = _sort_records([records[pos] for pos in positions], sort_specs)
+            positions = [positions[idx] for idx in order]
 
-    full_count = len(records)
+    full_count = len(positions)
     total_count = total_rows if total_rows is not None else full_count
 
-    if c_pagination and endpoint is None and base_url is None:
+    window_start = 0
+    if virtual:
+        total_pages = 1
+        window_start, window_stop = _virtual_window(page, c_per_page)
+        if total_rows is None:
+            positions = positions[window_start:window_stop]
+    elif c_pagination and endpoint is None and base_url is None:
         total_pages = math.ceil(total_count / c_per_page) if total_count else 1
         start = (page - 1) * c_per_page
-        records = records[start : start + c_per_page]
-        if index_values is not None:
-            index_values = index_values[start : start + c_per_page]
+        positions = positions[start : start + c_per_page]
     elif c_pagination:
         total_pages = math.ceil(total_count / c_per_page) if total_count else 1
     else:
         total_pages = 1
 
+    # Only the rows that will actually render are materialized.
+    if arrow_table is not None:
+        window = _arrow_window(arrow_table, positions)
+        row_count = window.num_rows
+        if include_index:
+            index_values = [str(pos) for pos in positions]
+        if row_key is not None:
+            key_values = window.column(row_key).to_pylist()
+    else:
+        records = [records[pos] for pos in positions]
+        row_count = len(records)
+        if index_values is not None:
+            index_values = [index_values[pos] for pos in positions]
+        if row_key is not None:
+            key_values = [row.get(row_key) for row in records]
+
     visible_columns = list(resolved_columns)
     if include_index:
         visible_columns = ["index", *visible_columns]
@@ -348,32 +648,30 @@ def DataTable(
     base_params: dict[str, Any] = {}
     if filters:
         base_params.update(filters)
-    if c_pagination:
+    if c_pagination or virtual:
         base_params["per_page"] = c_per_page
     if search:
         base_params[search_param] = search
-    if sort:
-        base_params["sort"] = sort
-        base_params["direction"] = c_direction
+    base_params.update(_sort_params(sort_specs))
 
     head_cells: list[Any] = []
+    sort_directions = dict(sort_specs)
+    primary_sort = sort_specs[0][0] if sort_specs else None
     for col in visible_columns:
         header_label = (header_map or {}).get(col, col)
         if col in sortable_columns and link_base:
-            current = sort == col
-            next_dir: SortableDirection = "desc" if current and c_direction == "asc" else "asc"
-            params = {**base_params, "sort": col, "direction": next_dir, "page": page}
+            col_dir = sort_directions.get(col)
+            current = col == primary_sort
+            next_dir: SortableDirection = "desc" if current and col_dir == "asc" else "asc"
+            params = {
+                **base_params,
+                **_sort_params([(col, next_dir)]),
+                "page": 1 if virtual else page,
+            }
             url = _build_url(link_base, params)
             link = A(
                 header_label,
-                (
-                    Span(
-                        "asc" if current and c_direction == "asc" else "desc",
-                        cls="ms-1 text-muted small",
-                    )
-                    if current
-                    else None
-                ),
+                Span(col_dir, cls="ms-1 text-muted small") if col_dir else None,
                 cls="text-decoration-none",
                 **_link_attrs(
                     url,
@@ -383,42 +681,56 @@ def DataTable(
                     push_url=push_url,
                 ),
             )
-            aria_sort = (
-                "ascending"
-                if current and c_direction == "asc"
-                else "descending" if current else None
+            aria_sort = "ascending" if col_dir == "asc" else "descending" if col_dir else None
+            head_cells.append(
+                TCell(
+                    link,
+                    header=True,
+                    scope="col",
+                    aria_sort=aria_sort if current else None,
+                )
             )
-            head_cells.append(TCell(link, header=True, scope="col", aria_sort=aria_sort))
         else:
             head_cells.append(TCell(header_label, header=True, scope="col"))
 
-    thead = THead(TRow(*head_cells))
+    thead = THead(TRow(*head_cells), cls="sticky-top" if virtual else None)
 
-    if not records:
-        tbody = TBody(
-            TRow(
-                TCell(
-                    c_empty_text,
-                    colspan=max(1, len(visible_columns)),
-                    cls="text-center text-muted",
-                )
+    body_rows: list[Any] = []
+    if not row_count:
+        body_rows.append(_empty_row(c_empty_text, colspan=len(visible_columns)))
+    else:
+        if arrow_table is not None:
+            block = _format_arrow_columns(window, formatters=formatters, none_as=c_none_as)
+        else:
+            block = _format_record_columns(
+                records, resolved_columns, formatters=formatters, none_as=c_none_as
+            )
+        body_rows.append(
+            _render_body_rows(
+                block,
+                row_count=row_count,
+                index_values=index_values if include_index else None,
+                row_attrs={"style": f"height: {row_height}px;"} if virtual else None,
+                row_ids=(
+                    [_row_dom_id(wrapper_id, value) for value in key_values]
+                    if row_key is not None
+                    else None
+                ),
             )
         )
-    else:
-        body_rows: list[Any] = []
-        for idx, row in enumerate(records):
-            row_cells: list[Any] = []
-            if include_index and index_values is not None:
-                row_cells.append(TCell(index_values[idx], header=True, scope="row"))
-
-            for col in resolved_columns:
-                value = row.get(col)
-                rendered = c_none_as if value is None else str(value)
-                row_cells.append(TCell(rendered))
 
-            body_rows.append(TRow(*row_cells))
-
-        tbody = TBody(*body_rows)
+    if virtual:
+        colspan = max(1, len(visible_columns))
+        bottom_rows = max(0, total_count - window_start - row_count)
+        tbody = TBody(
+            _spacer_row(window_start * row_height, colspan=colspan, position="top"),
+            *body_rows,
+            _spacer_row(bottom_rows * row_height, colspan=colspan, position="bottom"),
+            id=f"{wrapper_id}-body",
+            data_fs_virtual_page=str(page),
+        )
+    else:
+        tbody = TBody(*body_rows, id=f"{wrapper_id}-body" if row_key is not None else None)
 
     table_kwargs = table_attrs.copy() if table_attrs else {}
     table_kwargs["cls"] = merge_classes(table_kwargs.get("cls"), table_cls)
@@ -429,7 +741,9 @@ def DataTable(
         striped=c_striped,
         hover=c_hover,
         bordered=c_bordered,
-        responsive=c_responsive,
+        # The virtual viewport is the scroll container; nesting another one would
+        # break the sticky header.
+        responsive=False if virtual else c_responsive,
         **table_kwargs,
     )
 
@@ -457,10 +771,8 @@ def DataTable(
                 input_attrs["hx_push_url"] = "true"
         hidden_inputs: list[Any] = []
         preserved_params = filters.copy() if filters else {}
-        if sort:
-            preserved_params["sort"] = sort
-            preserved_params["direction"] = c_direction
-        if c_pagination:
+        preserved_params.update(_sort_params(sort_specs))
+        if c_pagination or virtual:
             preserved_params["per_page"] = c_per_page
             preserved_params["page"] = 1
 
@@ -487,9 +799,25 @@ def DataTable(
         )
         parts.append(search_form)
 
-    parts.append(table)
+    if virtual:
+        window_params = {key: value for key, value in base_params.items() if key != "page"}
+        parts.append(
+            Div(
+                table,
+                cls="faststrap-data-table-viewport",
+                style=f"height: {viewport_height}px; overflow: auto;",
+                data_fs_virtual="true",
+                data_fs_virtual_url=_build_url(endpoint or "", window_params),
+                data_fs_virtual_target=f"#{wrapper_id}-body",
+                data_fs_virtual_row_height=str(row_height),
+                data_fs_virtual_per_page=str(c_per_page),
+                data_fs_virtual_total=str(total_count),
+            )
+        )
+    else:
+        parts.append(table)
 
-    if c_pagination and total_pages > 1:
+    if c_pagination and not virtual and total_pages > 1:
         pager_links: list[Any] = []
         for page_num in range(1, total_pages + 1):
             active = page_num == page
@@ -535,3 +863,4 @@ def DataTable(
 
 
 DataTable.export_params = datatable_export_params  # type: ignore[attr-defined]
+DataTable.diff = datatable_diff  # type: ignore[attr-defined]
@@ -0,0 +1,374 @@
+"""Reusable in-memory index for DataTable search and sort."""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from datetime import date, datetime
+from typing import Any, Literal
+
+from .table import _normalize_table_data
+
+ColumnType = Literal["bool", "numeric", "date", "text", "mixed"]
+SortSpec = tuple[str, Literal["asc", "desc"]]
+
+# Cells are joined with NUL so a needle without NUL can only ever match inside
+# a single cell, which keeps blob matching identical to per-cell matching.
+_CELL_SEP = "\x00"
+_SHARED_MAX_KEYS = 32
+_SHARED_LOCK = threading.Lock()
+_SHARED: OrderedDict[str, DataTableIndex] = OrderedDict()
+# Per-key build locks, so one slow loader never blocks lookups of other keys.
+_BUILD_LOCKS: dict[str, threading.Lock] = {}
+_SORT_CACHE_SIZE = 16
+
+
+def _cell_text(value: Any) -> str:
+    return ("" if value is None else str(value)).casefold()
+
+
+def _sort_key(value: Any) -> tuple[int, int, Any]:
+    if value is None:
+        return (1, 1, "")
+    if isinstance(value, bool):
+        return (0, 0, int(value))
+    if isinstance(value, (int, float)):
+        return (0, 0, value)
+    return (0, 1, str(value).casefold())
+
+
+def _infer_column_type(values: Sequence[Any]) -> ColumnType:
+    """Infer a sort type for a column from its non-null values."""
+    kinds: set[str] = set()
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            kinds.add("bool")
+        elif isinstance(value, (int, float)):
+            kinds.add("numeric")
+        elif isinstance(value, datetime):
+            kinds.add("aware" if value.tzinfo is not None else "naive")
+        elif isinstance(value, date):
+            kinds.add("date")
+        elif isinstance(value, str):
+            kinds.add("text")
+        else:
+            kinds.add("other")
+
+    if not kinds or kinds == {"text"}:
+        return "text"
+    if kinds == {"bool"}:
+        return "bool"
+    if kinds <= {"bool", "numeric"}:
+        return "numeric"
+    if kinds in ({"date"}, {"naive"}, {"aware"}):
+        return "date"
+    if "bool" not in kinds and "numeric" not in kinds:
+        # Mixed non-numeric values all sort as casefolded text.
+        return "text"
+    return "mixed"
+
+
+def _typed_key(column_type: ColumnType) -> Callable[[Any], Any]:
+    if column_type in ("bool", "numeric", "date"):
+        return _identity
+    if column_type == "text":
+        return _casefold_key
+    return _sort_key
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _casefold_key(value: Any) -> str:
+    return str(value).casefold()
+
+
+def _column_ranks(values: Sequence[Any]) -> tuple[ColumnType, list[int]]:
+    """Return the column type and a dense rank per row (nulls rank last).
+
+    Equal values share a rank, so sorting positions by rank is stable and
+    matches sorting the rows by ``_sort_key`` directly.
+    """
+    column_type = _infer_column_type(values)
+    key = _typed_key(column_type)
+    present = [pos for pos, value in enumerate(values) if value is not None]
+    present.sort(key=lambda pos: key(values[pos]))
+
+    ranks = [0] * len(values)
+    rank = 0
+    previous: Any = None
+    for pos in present:
+        current = key(values[pos])
+        if rank == 0 or current != previous:
+            rank += 1
+            previous = current
+        ranks[pos] = rank
+
+    null_rank = rank + 1
+    for pos, value in enumerate(values):
+        if value is None:
+            ranks[pos] = null_rank
+    return column_type, ranks
+
+
+def _order_by_ranks(
+    positions: Sequence[int],
+    ranked: Sequence[tuple[list[int], bool]],
+) -> list[int]:
+    """Stable-sort ``positions`` by ``(ranks, descending)`` pairs, primary first."""
+    if len(ranked) == 1:
+        ranks, descending = ranked[0]
+        if descending:
+            return sorted(positions, key=lambda pos: -ranks[pos])
+        return sorted(positions, key=ranks.__getitem__)
+    return sorted(
+        positions,
+        key=lambda pos: tuple(-ranks[pos] if desc else ranks[pos] for ranks, desc in ranked),
+    )
+
+
+def _sort_records(records: Sequence[dict[str, Any]], specs: Sequence[SortSpec]) -> list[int]:
+    """Return row positions of ``records`` ordered by ``specs`` (one-off sort)."""
+    ranked = [
+        (_column_ranks([row.get(col) for row in records])[1], direction == "desc")
+        for col, direction in specs
+    ]
+    return _order_by_ranks(range(len(records)), ranked)
+
+
+class DataTableIndex:
+    """Precomputed search index for an in-memory DataTable dataset.
+
+    The dataset is normalized once and every row is casefolded into a single
+    text blob. Queries of at least ``ngram`` characters are answered from an
+    n-gram inverted index, so only candidate rows are checked. Pass the index
+    as ``DataTable(data=...)`` to reuse it across requests.
+
+    Args:
+        data: List of dicts or pandas/polars DataFrame.
+        columns: Optional column order (also the searchable columns).
+        max_rows: Optional max rows to index.
+        include_index: Include the row index in rendering and search.
+        key: Optional dataset key used by ``DataTableIndex.shared``.
+        version: Optional dataset version used by ``DataTableIndex.shared``.
+        ngram: Gram size for the inverted index, or None to scan row blobs.
+
+    Example:
+        >>> index = DataTableIndex.shared("orders", load_orders, version=etag)
+        >>> DataTable(index, searchable=True, search=q, endpoint="/orders")
+    """
+
+    def __init__(
+        self,
+        data: Any,
+        *,
+        columns: list[str] | None = None,
+        max_rows: int | None = None,
+        include_index: bool = False,
+        key: str | None = None,
+        version: Any = None,
+        ngram: int | None = 3,
+    ) -> None:
+        if ngram is not None and ngram < 1:
+            msg = f"ngram must be >= 1, got {ngram}"
+            raise ValueError(msg)
+
+        self.columns, self.records, self.index_values = _normalize_table_data(
+            data,
+            columns=columns,
+            max_rows=max_rows,
+            include_index=include_index,
+        )
+        self.include_index = include_index
+        self.key = key
+        self.version = version
+        self.ngram = ngram
+        self._lock = threading.Lock()
+        self._blobs: list[str] | None = None
+        self._grams: dict[str, array[int]] | None = None
+        self._ranks: dict[str, tuple[ColumnType, list[int]]] = {}
+        self._orders: OrderedDict[tuple[SortSpec, ...], list[int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @classmethod
+    def shared(
+        cls,
+        key: str,
+        data: Any | Callable[[], Any],
+        *,
+        version: Any = None,
+        **options: Any,
+    ) -> DataTableIndex:
+        """Return the process-wide index for ``key``, rebuilding on version change.
+
+        ``data`` may be a zero-argument loader, which is only called when the
+        index has to be (re)built. Every worker process keeps its own copy under
+        the same key, so each one builds the index once per dataset version.
+        Concurrent callers for the same key wait for a single build; other keys
+        are not blocked while it runs.
+        """
+
+        def cached() -> DataTableIndex | None:
+            existing = _SHARED.get(key)
+            if existing is None or existing.version != version:
+                return None
+            _SHARED.move_to_end(key)
+            return existing
+
+        with _SHARED_LOCK:
+            existing = cached()
+            if existing is not None:
+                return existing
+            build_lock = _BUILD_LOCKS.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with _SHARED_LOCK:
+                existing = cached()
+            if existing is not None:
+                return existing
+
+            source = data() if callable(data) else data
+            index = cls(source, key=key, version=version, **options)
+            with _SHARED_LOCK:
+                _SHARED[key] = index
+                _SHARED.move_to_end(key)
+                while len(_SHARED) > _SHARED_MAX_KEYS:
+                    evicted, _ = _SHARED.popitem(last=False)
+                    _BUILD_LOCKS.pop(evicted, None)
+            return index
+
+    @classmethod
+    def invalidate(cls, key: str | None = None) -> None:
+        """Drop the shared index for ``key`` (or every shared index)."""
+        with _SHARED_LOCK:
+            if key is None:
+                _SHARED.clear()
+                _BUILD_LOCKS.clear()
+            else:
+                _SHARED.pop(key, None)
+                _BUILD_LOCKS.pop(key, None)
+
+    def _row_blobs(self) -> list[str]:
+        if self._blobs is None:
+            with self._lock:
+                if self._blobs is None:
+                    blobs: list[str] = []
+                    for idx, row in enumerate(self.records):
+                        cells = [_cell_text(row.get(col)) for col in self.columns]
+                        if self.include_index and self.index_values is not None:
+                            cells.insert(0, _cell_text(self.index_values[idx]))
+                        blobs.append(_CELL_SEP.join(cells))
+                    self._blobs = blobs
+        return self._blobs
+
+    def _gram_index(self, size: int) -> dict[str, array[int]]:
+        if self._grams is None:
+            blobs = self._row_blobs()
+            with self._lock:
+                if self._grams is None:
+                    grams: dict[str, array[int]] = {}
+                    for row_id, blob in enumerate(blobs):
+                        row_grams = {blob[i : i + size] for i in range(len(blob) - size + 1)}
+                        for gram in row_grams:
+                            if _CELL_SEP in gram:
+                                continue
+                            postings = grams.get(gram)
+                            if postings is None:
+                                postings = grams[gram] = array("i")
+                            postings.append(row_id)
+                    self._grams = grams
+        return self._grams
+
+    def _row_matches(self, row_id: int, needle: str) -> bool:
+        row = self.records[row_id]
+        if self.include_index and self.index_values is not None:
+            if needle in _cell_text(self.index_values[row_id]):
+                return True
+        return any(needle in _cell_text(row.get(col)) for col in self.columns)
+
+    def search(self, query: str) -> list[int]:
+        """Return ascending row positions whose cells contain ``query``.
+
+        Matching is identical to DataTable's per-cell search: a casefolded
+        substring test against each column value (and the index when enabled).
+        """
+        if not query:
+            return list(range(len(self.records)))
+
+        needle = query.casefold()
+        if _CELL_SEP in needle:
+            return [
+                row_id for row_id in range(len(self.records)) if self._row_matches(row_id, needle)
+            ]
+
+        blobs = self._row_blobs()
+        size = self.ngram
+        if size is None or len(needle) < size:
+            return [row_id for row_id, blob in enumerate(blobs) if needle in blob]
+
+        grams = self._gram_index(size)
+        postings: list[array[int]] = []
+        for gram in {needle[i : i + size] for i in range(len(needle) - size + 1)}:
+            found = grams.get(gram)
+            if found is None:
+                return []
+            postings.append(found)
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates.intersection_update(other)
+            if not candidates:
+                return []
+        return [row_id for row_id in sorted(candidates) if needle in blobs[row_id]]
+
+    def _column(self, column: str) -> tuple[ColumnType, list[int]]:
+        cached = self._ranks.get(column)
+        if cached is None:
+            with self._lock:
+                cached = self._ranks.get(column)
+                if cached is None:
+                    cached = _column_ranks([row.get(column) for row in self.records])
+                    self._ranks[column] = cached
+        return cached
+
+    def column_type(self, column: str) -> ColumnType:
+        """Return the inferred sort type for ``column`` (computed once)."""
+        return self._column(column)[0]
+
+    def sort(self, specs: Sequence[SortSpec], positions: Sequence[int] | None = None) -> list[int]:
+        """Order row positions by ``specs``, e.g. ``[("region", "asc"), ("revenue", "desc")]``.
+
+        Full-dataset orders are cached per spec, so repeated requests for the
+        same sort only pay for a list copy. Ties keep their original row order.
+        """
+        if not specs:
+            return list(range(len(self.records)) if positions is None else positions)
+
+        ranked = [(self._column(col)[1], direction == "desc") for col, direction in specs]
+        if positions is not None and len(positions) * 8 < len(self.records):
+            return _order_by_ranks(positions, ranked)
+
+        spec_key = tuple(specs)
+        with self._lock:
+            order = self._orders.get(spec_key)
+            if order is not None:
+                self._orders.move_to_end(spec_key)
+        if order is None:
+            order = _order_by_ranks(range(len(self.records)), ranked)
+            with self._lock:
+                self._orders[spec_key] = order
+                while len(self._orders) > _SORT_CACHE_SIZE:
+                    self._orders.popitem(last=False)
+
+        if positions is None:
+            return list(order)
+        keep = set(positions)
+        return [pos for pos in order if pos in keep]
@@ -2,21 +2,29 @@
 
 from __future__ import annotations
 
+import html
+from collections.abc import Callable, Iterator, Sequence
+from datetime import date, time
+from itertools import islice
 from typing import Any, Literal
 
-from fasthtml.common import Div, Tbody, Td, Th, Thead, Tr
+from fasthtml.common import Div, NotStr, Tbody, Td, Th, Thead, Tr, to_xml
 from fasthtml.common import Table as FTTable
 
 from ...core._stability import beta, stable
 from ...core.base import merge_classes
 from ...core.registry import register
 from ...utils.attrs import convert_attrs
+from ._arrow import _arrow_table, _format_arrow_columns, _is_arrow
 
 # Table-specific types
 TableVariantType = Literal[
     "primary", "secondary", "success", "danger", "warning", "info", "light", "dark"
 ]
 
+# A "{...}" str.format pattern, a "%..." strftime pattern, or a callable.
+CellFormatter = str | Callable[[Any], Any]
+
 
 @register(category="display")
 @stable
@@ -317,6 +325,35 @@ def TCell(
     return Td(*children, **attrs)
 
 
+def _frame_kind(data: Any) -> Literal["pandas", "polars"] | None:
+    if data.__class__.__name__ != "DataFrame":
+        return None
+    module_name = data.__class__.__module__
+    if module_name.startswith("pandas"):
+        return "pandas"
+    if module_name.startswith("polars"):
+        return "polars"
+    return None
+
+
+def _select_frame(
+    df: Any,
+    kind: Literal["pandas", "polars"],
+    *,
+    columns: list[str] | None,
+    max_rows: int | None,
+) -> Any:
+    if columns is not None:
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            msg = f"Requested columns not found in DataFrame: {missing}"
+            raise ValueError(msg)
+        df = df[columns] if kind == "pandas" else df.select(columns)
+    if max_rows is not None:
+        df = df.head(max_rows)
+    return df
+
+
 def _normalize_table_data(
     data: Any,
     *,
@@ -349,19 +386,10 @@ def _normalize_table_data(
         if max_rows is not None:
             records = records[:max_rows]
     else:
-        cls_name = data.__class__.__name__
-        module_name = data.__class__.__module__
-
-        if cls_name == "DataFrame" and module_name.startswith("pandas"):
-            df = data
-            if columns is not None:
-                missing = [col for col in columns if col not in df.columns]
-                if missing:
-                    msg = f"Requested columns not found in DataFrame: {missing}"
-                    raise ValueError(msg)
-                df = df[columns]
-            if max_rows is not None:
-                df = df.head(max_rows)
+        kind = _frame_kind(data)
+
+        if kind == "pandas":
+            df = _select_frame(data, kind, columns=columns, max_rows=max_rows)
             resolved_columns = [str(col) for col in df.columns]
             records = [
                 {str(key): value for key, value in row.items()}
@@ -369,21 +397,18 @@ def _normalize_table_data(
             ]
             if include_index:
                 index_values = [str(i) for i in df.index.tolist()]
-        elif cls_name == "DataFrame" and module_name.startswith("polars"):
-            df = data
-            if columns is not None:
-                missing = [col for col in columns if col not in df.columns]
-                if missing:
-                    msg = f"Requested columns not found in DataFrame: {missing}"
-                    raise ValueError(msg)
-                df = df.select(columns)
-            if max_rows is not None:
-                df = df.head(max_rows)
+        elif kind == "polars":
+            df = _select_frame(data, kind, columns=columns, max_rows=max_rows)
             resolved_columns = [str(col) for col in df.columns]
             records = [{str(key): value for key, value in row.items()} for row in df.to_dicts()]
+        elif _is_arrow(data):
+            table = _arrow_table(data, columns=columns, max_rows=max_rows)
+            resolved_columns = [str(col) for col in table.column_names]
+            records = table.to_pylist()
         else:
             msg = (
-                "Table.from_df() expects pandas/polars DataFrame or list[dict]. "
+                "Table.from_df() expects pandas/polars DataFrame or list[dict] "
+                "(or a pyarrow Table, RecordBatch or RecordBatchReader). "
                 f"Received: {data.__class__.__name__}"
             )
             raise TypeError(msg)
@@ -394,6 +419,166 @@ def _normalize_table_data(
     return resolved_columns, records, index_values
 
 
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _apply_formatter(value: Any, formatter: CellFormatter) -> str:
+    if callable(formatter):
+        return str(formatter(value))
+    if "{" in formatter:
+        return formatter.format(value)
+    # strftime patterns only apply to dates and times; other cells render as text.
+    if isinstance(value, (date, time)):
+        return value.strftime(formatter)
+    return str(value)
+
+
+def _format_values(values: list[Any], formatter: CellFormatter) -> list[str]:
+    """Apply ``formatter`` to a column of present values.
+
+    The formatter is resolved once per column, but format strings and callables
+    still run once per cell in Python, so they cost roughly 0.5µs per cell.
+    """
+    if callable(formatter):
+        return [str(text) for text in map(formatter, values)]
+    if "{" in formatter:
+        return list(map(formatter.format, values))
+    return [_apply_formatter(value, formatter) for value in values]
+
+
+def _escape_column(values: Sequence[str]) -> list[str]:
+    escape = html.escape
+    return [escape(value, quote=False) for value in values]
+
+
+def _format_record_columns(
+    records: Sequence[dict[str, Any]],
+    columns: Sequence[str],
+    *,
+    formatters: dict[str, CellFormatter] | None,
+    none_as: str,
+) -> list[list[str]]:
+    """Format list-of-dict rows into a column-major block of escaped strings."""
+    block: list[list[str]] = []
+    for col in columns:
+        formatter = (formatters or {}).get(col)
+        values = [row.get(col) for row in records]
+        if formatter is None:
+            texts = [none_as if _is_missing(value) else str(value) for value in values]
+        else:
+            texts = [
+                none_as if _is_missing(value) else _apply_formatter(value, formatter)
+                for value in values
+            ]
+        block.append(_escape_column(texts))
+    return block
+
+
+def _format_pandas_column(series: Any, formatter: CellFormatter | None, none_as: str) -> list[str]:
+    import numpy as np
+
+    missing = series.isna().to_numpy()
+    present = series[~missing]
+    kind = series.dtype.kind
+
+    if formatter is None and kind in "biuf":
+        texts = present.to_numpy().astype(str)
+    elif formatter is None:
+        texts = present.map(str).to_numpy()
+    elif isinstance(formatter, str) and "{" not in formatter and kind == "M":
+        texts = present.dt.strftime(formatter).to_numpy()
+    else:
+        texts = _format_values(present.tolist(), formatter)
+
+    # Unformatted numbers and dates cannot contain markup-sensitive characters.
+    if formatter is not None or kind not in "biufM":
+        texts = _escape_column(texts)
+
+    column = np.full(len(missing), none_as, dtype=object)
+    column[~missing] = texts
+    return [str(text) for text in column]
+
+
+def _format_polars_column(series: Any, formatter: CellFormatter | None, none_as: str) -> list[str]:
+    import polars as pl
+
+    dtype = series.dtype
+    missing = series.is_null()
+    if dtype.is_float():
+        missing = missing | series.is_nan().fill_null(True)
+    present = series.filter(~missing)
+
+    if formatter is None and dtype.is_integer():
+        texts = present.cast(pl.String).to_list()
+    elif formatter is None:
+        texts = [str(value) for value in present.to_list()]
+    elif isinstance(formatter, str) and "{" not in formatter and dtype.is_temporal():
+        texts = present.dt.to_string(formatter).to_list()
+    else:
+        texts = _format_values(present.to_list(), formatter)
+
+    if formatter is not None or not (dtype.is_numeric() or dtype.is_temporal()):
+        texts = _escape_column(texts)
+
+    column = [none_as] * len(series)
+    for pos, text in zip(missing.not_().arg_true().to_list(), texts, strict=True):
+        column[pos] = text
+    return column
+
+
+def _format_frame_columns(
+    df: Any,
+    kind: Literal["pandas", "polars"],
+    *,
+    formatters: dict[str, CellFormatter] | None,
+    none_as: str,
+) -> list[list[str]]:
+    """Format a DataFrame column by column.
+
+    Missing-value masks, unformatted numbers and strftime patterns use the
+    library's vectorized ops; format strings and callables run per cell.
+    """
+    format_column = _format_pandas_column if kind == "pandas" else _format_polars_column
+    return [format_column(df[col], (formatters or {}).get(str(col)), none_as) for col in df.columns]
+
+
+def _render_attrs(attrs: dict[str, Any] | None) -> str:
+    if not attrs:
+        return ""
+    return "".join(
+        f' {key.replace("_", "-")}="{html.escape(str(value), quote=True)}"'
+        for key, value in attrs.items()
+        if value is not None
+    )
+
+
+def _render_body_rows(
+    block: Sequence[Sequence[str]],
+    *,
+    row_count: int,
+    index_values: Sequence[str] | None = None,
+    row_attrs: dict[str, Any] | None = None,
+    row_ids: Sequence[str] | None = None,
+) -> NotStr:
+    """Render a column-major block of escaped strings into ``<tr>`` markup.
+
+    Body cells carry no attributes, so rows are joined as strings instead of
+    building an FT node per cell, which dominates render time on large tables.
+    """
+    attrs = _render_attrs(row_attrs)
+    escape = html.escape
+    rows: list[str] = []
+    for pos in range(row_count):
+        cells = "".join(f"<td>{column[pos]}</td>" for column in block)
+        if index_values is not None:
+            header = escape(str(index_values[pos]), quote=False)
+            cells = f'<th scope="row">{header}</th>{cells}'
+        row_id = f' id="{escape(row_ids[pos], quote=True)}"' if row_ids is not None else ""
+        rows.append(f"<tr{row_id}{attrs}>{cells}</tr>")
+    return NotStr("\n".join(rows))
+
+
 @beta
 def _table_from_df(
     data: Any,
@@ -404,15 +589,53 @@ def _table_from_df(
     empty_text: str = "No data available",
     none_as: str = "",
     header_map: dict[str, str] | None = None,
+    formatters: dict[str, CellFormatter] | None = None,
     **table_kwargs: Any,
 ) -> FTTable | Div:
-    """Build a table from pandas/polars data or list-of-dict records."""
-    resolved_columns, records, index_values = _normalize_table_data(
-        data,
-        columns=columns,
-        max_rows=max_rows,
-        include_index=include_index,
-    )
+    """Build a table from pandas/polars/pyarrow data or list-of-dict records.
+
+    ``formatters`` maps column names to a ``"{:,.2f}"`` format string, a
+    ``"%Y-%m-%d"`` strftime pattern, or a callable. DataFrame columns are
+    formatted column by column: strftime patterns on date columns use
+    pandas/polars/pyarrow ops, while format strings and callables run once per
+    cell in Python. Missing values (None, NaN, NaT) render as ``none_as``.
+    """
+    kind = _frame_kind(data)
+    if kind is not None:
+        if max_rows is not None and max_rows < 0:
+            msg = f"max_rows must be >= 0, got {max_rows}"
+            raise ValueError(msg)
+        df = _select_frame(data, kind, columns=columns, max_rows=max_rows)
+        resolved_columns = [str(col) for col in df.columns]
+        row_count = len(df)
+        block = _format_frame_columns(df, kind, formatters=formatters, none_as=none_as)
+        index_values: list[str] | None = None
+        if include_index:
+            index_values = (
+                [str(i) for i in df.index.tolist()]
+                if kind == "pandas"
+                else [str(i) for i in range(row_count)]
+            )
+    elif _is_arrow(data):
+        if max_rows is not None and max_rows < 0:
+            msg = f"max_rows must be >= 0, got {max_rows}"
+            raise ValueError(msg)
+        table = _arrow_table(data, columns=columns, max_rows=max_rows)
+        resolved_columns = [str(col) for col in table.column_names]
+        row_count = table.num_rows
+        block = _format_arrow_columns(table, formatters=formatters, none_as=none_as)
+        index_values = [str(i) for i in range(row_count)] if include_index else None
+    else:
+        resolved_columns, records, index_values = _normalize_table_data(
+            data,
+            columns=columns,
+            max_rows=max_rows,
+            include_index=include_index,
+        )
+        row_count = len(records)
+        block = _format_record_columns(
+            records, resolved_columns, formatters=formatters, none_as=none_as
+        )
 
     visible_columns = list(resolved_columns)
     if include_index:
@@ -423,7 +646,7 @@ def _table_from_df(
     ]
     thead = THead(TRow(*head_cells))
 
-    if not records:
+    if not row_count:
         tbody = TBody(
             TRow(
                 TCell(
@@ -435,27 +658,154 @@ def _table_from_df(
         )
         return Table(thead, tbody, **table_kwargs)
 
-    body_rows: list[Tr] = []
-    for idx, row in enumerate(records):
-        row_cells: list[Td | Th] = []
-        if include_index and index_values is not None:
-            row_cells.append(TCell(index_values[idx], header=True, scope="row"))
+    body_rows = _render_body_rows(
+        block,
+        row_count=row_count,
+        index_values=index_values if include_index else None,
+    )
+    tbody = TBody(body_rows)
+    return Table(thead, tbody, **table_kwargs)
+
 
-        for col in resolved_columns:
-            value = row.get(col)
-            if value is None:
-                rendered = none_as
-            else:
-                rendered = str(value)
-            row_cells.append(TCell(rendered))
+_ROWS_MARKER = "\x00faststrap-table-rows\x00"
 
-        body_rows.append(TRow(*row_cells))
 
-    tbody = TBody(*body_rows)
-    return Table(thead, tbody, **table_kwargs)
+def _stream_chunks(
+    data: Any,
+    *,
+    columns: list[str] | None,
+    chunk_rows: int,
+    include_index: bool,
+    formatters: dict[str, CellFormatter] | None,
+    none_as: str,
+) -> tuple[list[str], Iterator[tuple[list[list[str]], int, list[str] | None]]]:
+    """Resolve columns and lazily yield ``(block, row_count, index_values)`` chunks."""
+    kind = _frame_kind(data)
+    if kind is not None or _is_arrow(data):
+        if kind is not None:
+            frame = _select_frame(data, kind, columns=columns, max_rows=None)
+            frame_columns = [str(col) for col in frame.columns]
+        else:
+            frame = _arrow_table(data, columns=columns, max_rows=None)
+            frame_columns = [str(col) for col in frame.column_names]
+
+        def frame_chunks() -> Iterator[tuple[list[list[str]], int, list[str] | None]]:
+            for start in range(0, len(frame), chunk_rows):
+                if kind == "pandas":
+                    window = frame.iloc[start : start + chunk_rows]
+                    block = _format_frame_columns(
+                        window, kind, formatters=formatters, none_as=none_as
+                    )
+                    labels = [str(i) for i in window.index.tolist()]
+                elif kind == "polars":
+                    window = frame.slice(start, chunk_rows)
+                    block = _format_frame_columns(
+                        window, kind, formatters=formatters, none_as=none_as
+                    )
+                    labels = [str(i) for i in range(start, start + len(window))]
+                else:
+                    window = frame.slice(start, chunk_rows)
+                    block = _format_arrow_columns(window, formatters=formatters, none_as=none_as)
+                    labels = [str(i) for i in range(start, start + len(window))]
+                yield block, len(window), labels if include_index else None
+
+        return frame_columns, frame_chunks()
+
+    rows = iter(data)
+    first = list(islice(rows, chunk_rows))
+    resolved_columns, _, _ = _normalize_table_data(
+        first, columns=columns, max_rows=None, include_index=False
+    )
+
+    def record_chunks() -> Iterator[tuple[list[list[str]], int, list[str] | None]]:
+        chunk, offset = first, 0
+        while chunk:
+            _, records, _ = _normalize_table_data(
+                chunk, columns=resolved_columns, max_rows=None, include_index=False
+            )
+            block = _format_record_columns(
+                records, resolved_columns, formatters=formatters, none_as=none_as
+            )
+            labels = [str(i) for i in range(offset, offset + len(records))]
+            yield block, len(records), labels if include_index else None
+            offset += len(records)
+            chunk = list(islice(rows, chunk_rows))
+
+    return resolved_columns, record_chunks()
+
+
+@beta
+def _table_stream(
+    data: Any,
+    *,
+    columns: list[str] | None = None,
+    chunk_rows: int = 500,
+    include_index: bool = False,
+    empty_text: str = "No data available",
+    none_as: str = "",
+    header_map: dict[str, str] | None = None,
+    formatters: dict[str, CellFormatter] | None = None,
+    **table_kwargs: Any,
+) -> Iterator[str]:
+    """Render a table progressively as markup chunks for ``StreamingResponse``.
+
+    Yields the opening ``<table>``/``<thead>`` markup, then ``chunk_rows`` body
+    rows at a time, then the closing tags. ``data`` may be anything
+    ``Table.from_df`` accepts, or an iterator/generator of dict rows; rows are
+    pulled one chunk at a time, so the full dataset is never held in memory.
+    Without ``columns``, the header comes from the keys in the first chunk.
+
+    Example:
+        >>> return StreamingResponse(
+        ...     Table.stream(fetch_rows(), chunk_rows=500, striped=True),
+        ...     media_type="text/html",
+        ... )
+    """
+    if chunk_rows < 1:
+        msg = f"chunk_rows must be >= 1, got {chunk_rows}"
+        raise ValueError(msg)
+
+    resolved_columns, chunks = _stream_chunks(
+        data,
+        columns=columns,
+        chunk_rows=chunk_rows,
+        include_index=include_index,
+        formatters=formatters,
+        none_as=none_as,
+    )
+    visible_columns = ["index", *resolved_columns] if include_index else list(resolved_columns)
+    head_cells = [
+        TCell((header_map or {}).get(col, col), header=True, scope="col") for col in visible_columns
+    ]
+    shell = to_xml(Table(THead(TRow(*head_cells)), TBody(NotStr(_ROWS_MARKER)), **table_kwargs))
+    opening, closing = shell.split(_ROWS_MARKER)
+
+    def render() -> Iterator[str]:
+        yield opening
+        empty = True
+        for block, row_count, index_values in chunks:
+            if not row_count:
+                continue
+            rows = str(_render_body_rows(block, row_count=row_count, index_values=index_values))
+            yield rows if empty else "\n" + rows
+            empty = False
+        if empty:
+            yield to_xml(
+                TRow(
+                    TCell(
+                        empty_text,
+                        colspan=max(1, len(visible_columns)),
+                        cls="text-center text-muted",
+                    )
+                )
+            )
+        yield closing
+
+    return render()
 
 
 Table.from_df = _table_from_df  # type: ignore[attr-defined]
+Table.stream = _table_stream  # type: ignore[attr-defined]
 
 # Optional aliases for projects that mix Faststrap and FastHTML table primitives.
 BsTable = Table
@@ -0,0 +1,91 @@
+"""WSTarget component for client-side WebSocket updates."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fasthtml.common import Div
+
+from ...core._stability import beta
+from ...core.base import merge_classes
+from ...core.registry import register
+from ...core.theme import resolve_defaults
+from ...utils.attrs import convert_attrs
+from .sse_target import SSESwapType
+
+
+@register(category="display", requires_js=True)
+@beta
+def WSTarget(
+    *children: Any,
+    endpoint: str,
+    event: str = "message",
+    swap: SSESwapType = "inner",
+    target: str | None = None,
+    reconnect: bool = True,
+    retry: int | None = None,
+    aria_live: str | None = "polite",
+    content: Any | None = None,
+    **kwargs: Any,
+) -> Div:
+    """Client-side WebSocket target that updates when new events arrive.
+
+    The WebSocket twin of ``SSETarget``: the server sends SSE-formatted
+    frames over the socket (see ``SSEBroker.websocket``), and targets sharing
+    an endpoint share one connection. Forms inside the target marked with
+    ``data_fs_ws_send="<event>"`` are sent over the socket as JSON instead of
+    being submitted, which makes the region bidirectional.
+
+    Args:
+        *children: Initial content to render inside the target.
+        endpoint: WebSocket URL (absolute ``ws(s)://`` or a path on this host).
+        event: Event name to listen for (default: "message").
+        swap: How to apply incoming data ("inner", "outer", "append", "text", etc.).
+        target: Optional CSS selector for a separate element to update.
+        reconnect: Whether to reconnect after the socket closes (default: True).
+        retry: Reconnect delay in milliseconds (default: 3000 in the browser).
+        aria_live: ARIA live region value (default: "polite").
+        content: Optional alternative to *children for initial content.
+        **kwargs: Additional HTML attributes.
+    """
+    cfg = resolve_defaults(
+        "WSTarget",
+        event=event,
+        swap=swap,
+        reconnect=reconnect,
+        retry=retry,
+        aria_live=aria_live,
+    )
+
+    c_event = cfg.get("event", event)
+    c_swap = cfg.get("swap", swap)
+    c_reconnect = cfg.get("reconnect", reconnect)
+    c_retry = cfg.get("retry", retry)
+    c_aria_live = cfg.get("aria_live", aria_live)
+
+    if content is not None and not children:
+        children = (content,)
+
+    user_cls = kwargs.pop("cls", "")
+    cls = merge_classes("faststrap-ws-target", user_cls)
+
+    attrs: dict[str, Any] = {
+        "cls": cls,
+        "data_fs_ws": "true",
+        "data_fs_ws_endpoint": endpoint,
+        "data_fs_ws_event": c_event,
+        "data_fs_ws_swap": c_swap,
+    }
+
+    if target:
+        attrs["data_fs_ws_target"] = target
+    if not c_reconnect:
+        attrs["data_fs_ws_reconnect"] = "false"
+    if c_retry is not None:
+        attrs["data_fs_ws_retry"] = str(c_retry)
+    if c_aria_live:
+        attrs["aria_live"] = c_aria_live
+
+    attrs.update(convert_attrs(kwargs))
+
+    return Div(*children, **attrs)
@@ -421,7 +421,11 @@ INIT_SCRIPT_JS = """
         };
 
         const initInfiniteScroll = (scope) => {
-            scope.querySelectorAll('[data-fs-infinite-scroll="true"]').forEach(el => {
+            const selector = '[data-fs-infinite-scroll="true"]';
+            const sentinels = Array.from(scope.querySelectorAll(selector));
+            // A sentinel swapped in with outerHTML is the swap scope itself.
+            if (scope.matches && scope.matches(selector)) sentinels.unshift(scope);
+            sentinels.forEach(el => {
                 if (el.dataset.fsInfiniteInit === 'true') return;
                 el.dataset.fsInfiniteInit = 'true';
 
@@ -454,142 +458,559 @@ INIT_SCRIPT_JS = """
             });
         };
 
-        const initSseTargets = (scope) => {
-            scope.querySelectorAll('[data-fs-sse="true"]').forEach(el => {
-                if (el.dataset.fsSseInit === 'true') return;
-                el.dataset.fsSseInit = 'true';
+        const initAutoRefresh = (scope) => {
+            const selector = '[data-fs-refresh="true"]';
+            const pollers = Array.from(scope.querySelectorAll(selector));
+            if (scope.matches && scope.matches(selector)) pollers.unshift(scope);
+            pollers.forEach(el => {
+                if (el.dataset.fsRefreshInit === 'true') return;
+                el.dataset.fsRefreshInit = 'true';
+                if (!window.htmx) return;
+
+                const base = parseInt(el.dataset.fsRefreshInterval, 10) || 5000;
+                const max = Math.max(base, parseInt(el.dataset.fsRefreshMax, 10) || base);
+                const factor = Math.max(1, parseFloat(el.dataset.fsRefreshBackoff) || 2);
+                const pauseHidden = el.dataset.fsRefreshHidden !== 'run';
+                let delay = base;
+                let etag = null;
+                let timer = null;
+                let stopped = false;
+
+                const stop = () => {
+                    stopped = true;
+                    clearTimeout(timer);
+                    document.removeEventListener('visibilitychange', onVisibility);
+                };
+                const poll = () => {
+                    if (!document.body.contains(el)) {
+                        stop();
+                        return;
+                    }
+                    // A hidden tab waits for visibilitychange instead of polling.
+                    if (pauseHidden && document.hidden) return;
+                    window.htmx.trigger(el, 'faststrap:refresh');
+                };
+                const schedule = () => {
+                    clearTimeout(timer);
+                    if (!stopped) timer = setTimeout(poll, delay);
+                };
+                function onVisibility() {
+                    if (document.hidden || stopped) return;
+                    clearTimeout(timer);
+                    delay = base;
+                    poll();
+                }
+                if (pauseHidden) document.addEventListener('visibilitychange', onVisibility);
 
-                if (!window.EventSource) return;
+                el.addEventListener('htmx:configRequest', (evt) => {
+                    if (evt.detail.elt === el && etag) evt.detail.headers['If-None-Match'] = etag;
+                });
+                el.addEventListener('htmx:beforeSwap', (evt) => {
+                    if (evt.detail.elt !== el || evt.detail.xhr.status !== 304) return;
+                    evt.detail.shouldSwap = false;
+                    evt.detail.isError = false;
+                });
+                el.addEventListener('htmx:afterRequest', (evt) => {
+                    if (evt.detail.elt !== el) return;
+                    const xhr = evt.detail.xhr;
+                    const status = xhr ? xhr.status : 0;
+                    if (status === 286) {
+                        stop();
+                        return;
+                    }
+                    if (status >= 200 && status < 300) {
+                        etag = xhr.getResponseHeader('ETag') || null;
+                        delay = base;
+                    } else {
+                        // Unchanged (304) or failed: wait longer before the next poll.
+                        delay = Math.min(max, Math.round(delay * factor));
+                    }
+                    schedule();
+                });
+                schedule();
+            });
+        };
 
-                const endpoint = el.dataset.fsSseEndpoint;
-                if (!endpoint) return;
+        // Fixed-interval pollers with pause_hidden skip their polls in hidden tabs.
+        document.body.addEventListener('htmx:confirm', (evt) => {
+            const el = evt.detail.elt;
+            if (!document.hidden || !el || !el.dataset) return;
+            if (el.dataset.fsRefreshHidden === 'pause' && el.dataset.fsRefresh !== 'true') {
+                evt.preventDefault();
+            }
+        });
 
-                const eventName = el.dataset.fsSseEvent || 'message';
-                const swap = el.dataset.fsSseSwap || 'inner';
-                const targetSelector = el.dataset.fsSseTarget;
-                const withCredentials = el.dataset.fsSseCredentials === 'true';
-                const reconnect = el.dataset.fsSseReconnect !== 'false';
-                const retryRaw = el.dataset.fsSseRetry;
-                const retry = retryRaw ? parseInt(retryRaw, 10) : null;
+        const lazyBatches = new Map();
+        let lazyObserver = null;
+
+        const queueLazy = (el) => {
+            if (el.dataset.fsLazyState) return;
+            el.dataset.fsLazyState = 'pending';
+            const endpoint = el.dataset.fsLazyEndpoint;
+            const batch = el.dataset.fsLazyBatch;
+            const id = `${batch} ${endpoint}`;
+            let pending = lazyBatches.get(id);
+            if (!pending) {
+                pending = { keys: [], source: el };
+                lazyBatches.set(id, pending);
+                // Collect every block revealed within the window into one request.
+                setTimeout(() => {
+                    lazyBatches.delete(id);
+                    const params = new URLSearchParams({ batch });
+                    pending.keys.forEach(key => params.append('keys', key));
+                    const url = `${endpoint}${endpoint.includes('?') ? '&' : '?'}${params}`;
+                    window.htmx.ajax('GET', url, { source: pending.source, swap: 'none' });
+                }, parseInt(el.dataset.fsLazyWindow, 10) || 50);
+            }
+            if (!pending.keys.includes(el.dataset.fsLazyKey)) pending.keys.push(el.dataset.fsLazyKey);
+        };
 
-                let connectionRoot = el;
-                let target = el;
-                if (targetSelector) {
-                    const candidate = document.querySelector(targetSelector);
-                    if (candidate) target = candidate;
+        const initLazyBatches = (scope) => {
+            const selector = '[data-fs-lazy-batch]';
+            const blocks = Array.from(scope.querySelectorAll(selector));
+            if (scope.matches && scope.matches(selector)) blocks.unshift(scope);
+            blocks.forEach(el => {
+                if (el.dataset.fsLazyInit === 'true') return;
+                el.dataset.fsLazyInit = 'true';
+                if (!window.htmx) return;
+                if (el.dataset.fsLazyTrigger === 'load' || !('IntersectionObserver' in window)) {
+                    queueLazy(el);
+                    return;
+                }
+                if (!lazyObserver) {
+                    lazyObserver = new IntersectionObserver((entries) => {
+                        entries.forEach((entry) => {
+                            if (!entry.isIntersecting) return;
+                            lazyObserver.unobserve(entry.target);
+                            queueLazy(entry.target);
+                        });
+                    });
                 }
+                lazyObserver.observe(el);
+            });
+        };
+
+        const initVirtualTables = (scope) => {
+            scope.querySelectorAll('[data-fs-virtual="true"]').forEach(viewport => {
+                if (viewport.dataset.fsVirtualInit === 'true') return;
+                viewport.dataset.fsVirtualInit = 'true';
+
+                if (!window.htmx) return;
 
-                const toFragment = (html) => {
-                    const template = document.createElement('template');
-                    template.innerHTML = html;
-                    return template.content;
+                const targetSelector = viewport.dataset.fsVirtualTarget;
+                const baseUrl = viewport.dataset.fsVirtualUrl;
+                if (!targetSelector || !baseUrl) return;
+
+                const rowHeight = parseInt(viewport.dataset.fsVirtualRowHeight, 10) || 40;
+                const perPage = parseInt(viewport.dataset.fsVirtualPerPage, 10) || 25;
+                const total = parseInt(viewport.dataset.fsVirtualTotal, 10) || 0;
+                const lastPage = Math.max(1, Math.ceil(total / perPage));
+
+                let pending = false;
+                let frame = null;
+
+                const currentPage = () => {
+                    const body = viewport.querySelector(targetSelector);
+                    return body ? parseInt(body.dataset.fsVirtualPage, 10) || 1 : 1;
                 };
 
-                const applySwap = (html) => {
-                    if (targetSelector && !document.body.contains(target)) {
-                        const candidate = document.querySelector(targetSelector);
-                        if (candidate) target = candidate;
-                    }
+                const sync = () => {
+                    frame = null;
+                    if (pending || !document.body.contains(viewport)) return;
+
+                    const firstRow = Math.floor(viewport.scrollTop / rowHeight);
+                    const page = Math.min(lastPage, Math.floor(firstRow / perPage) + 1);
+                    if (page === currentPage()) return;
+
+                    const url = new URL(baseUrl, window.location.href);
+                    url.searchParams.set('page', String(page));
+                    pending = true;
+                    window.htmx.ajax('GET', url.toString(), {
+                        target: targetSelector,
+                        select: targetSelector,
+                        swap: 'outerHTML',
+                    }).finally(() => {
+                        pending = false;
+                        // Catch up with any scrolling that happened mid-request.
+                        sync();
+                    });
+                };
 
-                    switch (swap) {
-                        case 'outer':
-                        case 'replace':
-                            {
-                                const parent = target.parentNode;
-                                if (!parent) return;
-
-                                const marker = document.createElement('span');
-                                marker.hidden = true;
-                                marker.setAttribute('data-fs-sse-marker', 'true');
-                                parent.insertBefore(marker, target);
-                                target.remove();
-                                marker.insertAdjacentHTML('afterend', html);
-                                const replacement = marker.nextElementSibling;
-                                marker.remove();
-
-                                if (!replacement) {
-                                    if (source) source.close();
-                                    if (observer) observer.disconnect();
-                                    return;
-                                }
-
-                                const replacedConnectionRoot = target === connectionRoot;
-                                target = replacement;
-                                if (replacedConnectionRoot) {
-                                    connectionRoot = replacement;
-                                }
-                            }
-                            break;
-                        case 'before':
-                            target.insertAdjacentHTML('beforebegin', html);
-                            break;
-                        case 'after':
-                            target.insertAdjacentHTML('afterend', html);
-                            break;
-                        case 'append':
-                            target.insertAdjacentHTML('beforeend', html);
-                            break;
-                        case 'prepend':
-                            target.insertAdjacentHTML('afterbegin', html);
-                            break;
-                        default:
-                            target.innerHTML = html;
+                viewport.addEventListener('scroll', () => {
+                    if (frame === null) frame = window.requestAnimationFrame(sync);
+                }, { passive: true });
+            });
+        };
+
+        // One EventSource per endpoint, shared by every SSETarget that uses it.
+        const sseConnections = new Map();
+        let sseObserver = null;
+
+        const openSse = (conn) => {
+            // A fresh EventSource does not send Last-Event-ID, so pass it along.
+            const url = conn.lastEventId
+                ? `${conn.endpoint}${conn.endpoint.includes('?') ? '&' : '?'}last_event_id=${encodeURIComponent(conn.lastEventId)}`
+                : conn.endpoint;
+            const source = new EventSource(url, { withCredentials: conn.withCredentials });
+            conn.source = source;
+            conn.handlers.forEach((_, name) => source.addEventListener(name, conn.dispatch));
+            source.addEventListener('resync', (evt) => {
+                if (evt.lastEventId) conn.lastEventId = evt.lastEventId;
+                conn.subscribers.forEach(sub => sub.root().dispatchEvent(new CustomEvent('fs:sse-resync', {
+                    bubbles: true,
+                    detail: { lastEventId: conn.lastEventId },
+                })));
+            });
+            source.onerror = () => {
+                const subs = Array.from(conn.subscribers);
+                if (!subs.some(sub => sub.reconnect)) {
+                    source.close();
+                    conn.source = null;
+                    return;
+                }
+
+                const retries = subs.map(sub => sub.retry).filter(retry => retry !== null && Number.isFinite(retry));
+                if (retries.length) {
+                    source.close();
+                    conn.source = null;
+                    if (conn.reconnectTimer) {
+                        window.clearTimeout(conn.reconnectTimer);
                     }
+                    conn.reconnectTimer = window.setTimeout(() => {
+                        conn.reconnectTimer = null;
+                        if (conn.subscribers.size) openSse(conn);
+                    }, Math.min(...retries));
+                }
+            };
+        };
+
+        const unsubscribeSse = (sub) => {
+            const conn = sub.conn;
+            if (!conn.subscribers.delete(sub)) return;
+            const handlers = conn.handlers.get(sub.event);
+            handlers.delete(sub.handler);
+            if (!handlers.size) {
+                conn.handlers.delete(sub.event);
+                if (conn.source) conn.source.removeEventListener(sub.event, conn.dispatch);
+            }
+            if (conn.subscribers.size) return;
+            if (conn.source) conn.source.close();
+            if (conn.reconnectTimer) window.clearTimeout(conn.reconnectTimer);
+            sseConnections.delete(conn.key);
+            if (!sseConnections.size && sseObserver) {
+                sseObserver.disconnect();
+                sseObserver = null;
+            }
+        };
+
+        const subscribeSse = (sub) => {
+            const key = `${sub.withCredentials ? 'cred' : 'anon'} ${sub.endpoint}`;
+            let conn = sseConnections.get(key);
+            if (!conn) {
+                conn = {
+                    key,
+                    endpoint: sub.endpoint,
+                    withCredentials: sub.withCredentials,
+                    source: null,
+                    reconnectTimer: null,
+                    lastEventId: '',
+                    handlers: new Map(),
+                    subscribers: new Set(),
                 };
-                const handler = (evt) => {
-                    const data = evt.data ?? '';
-                    if (swap === 'text') {
-                        target.textContent = data;
-                        return;
-                    }
-                    applySwap(data);
+                conn.dispatch = (evt) => {
+                    if (evt.lastEventId) conn.lastEventId = evt.lastEventId;
+                    const handlers = conn.handlers.get(evt.type);
+                    if (handlers) Array.from(handlers).forEach(handler => handler(evt));
                 };
+                sseConnections.set(key, conn);
+            }
+            sub.conn = conn;
+            conn.subscribers.add(sub);
+            if (!conn.handlers.has(sub.event)) {
+                conn.handlers.set(sub.event, new Set());
+                if (conn.source) conn.source.addEventListener(sub.event, conn.dispatch);
+            }
+            conn.handlers.get(sub.event).add(sub.handler);
+            if (!conn.source && !conn.reconnectTimer) openSse(conn);
+
+            if (!sseObserver) {
+                // One observer releases subscriptions whose element left the page.
+                sseObserver = new MutationObserver(() => {
+                    sseConnections.forEach(c => c.subscribers.forEach(s => {
+                        if (!document.body.contains(s.root())) unsubscribeSse(s);
+                    }));
+                });
+                sseObserver.observe(document.body, { childList: true, subtree: true });
+            }
+        };
 
-                let source = null;
-                let reconnectTimer = null;
-                let observer = null;
-
-                const connect = () => {
-                    if (!document.body.contains(connectionRoot)) return;
-                    source = new EventSource(endpoint, { withCredentials });
-                    source.addEventListener(eventName, handler);
-                    source.onerror = () => {
-                        if (!reconnect) {
-                            source.close();
-                            source = null;
-                            return;
-                        }
+        // Swap behaviour shared by SSETarget and WSTarget (``prefix`` is the dataset key prefix).
+        const liveRegion = (el, prefix) => {
+            const swap = el.dataset[`${prefix}Swap`] || 'inner';
+            const targetSelector = el.dataset[`${prefix}Target`];
+            const region = { onDetach: null };
+
+            let connectionRoot = el;
+            let target = el;
+            if (targetSelector) {
+                const candidate = document.querySelector(targetSelector);
+                if (candidate) target = candidate;
+            }
+
+            const applySwap = (html) => {
+                if (targetSelector && !document.body.contains(target)) {
+                    const candidate = document.querySelector(targetSelector);
+                    if (candidate) target = candidate;
+                }
 
-                        if (retry !== null && Number.isFinite(retry)) {
-                            source.close();
-                            source = null;
-                            if (reconnectTimer) {
-                                window.clearTimeout(reconnectTimer);
+                switch (swap) {
+                    case 'outer':
+                    case 'replace':
+                        {
+                            const parent = target.parentNode;
+                            if (!parent) return;
+
+                            const marker = document.createElement('span');
+                            marker.hidden = true;
+                            marker.setAttribute('data-fs-sse-marker', 'true');
+                            parent.insertBefore(marker, target);
+                            target.remove();
+                            marker.insertAdjacentHTML('afterend', html);
+                            const replacement = marker.nextElementSibling;
+                            marker.remove();
+
+                            if (!replacement) {
+                                if (region.onDetach) region.onDetach();
+                                return;
+                            }
+
+                            const replacedConnectionRoot = target === connectionRoot;
+                            target = replacement;
+                            if (replacedConnectionRoot) {
+                                connectionRoot = replacement;
                             }
-                            reconnectTimer = window.setTimeout(() => {
-                                reconnectTimer = null;
-                                connect();
-                            }, retry);
                         }
-                    };
+                        break;
+                    case 'before':
+                        target.insertAdjacentHTML('beforebegin', html);
+                        break;
+                    case 'after':
+                        target.insertAdjacentHTML('afterend', html);
+                        break;
+                    case 'append':
+                        target.insertAdjacentHTML('beforeend', html);
+                        break;
+                    case 'prepend':
+                        target.insertAdjacentHTML('afterbegin', html);
+                        break;
+                    default:
+                        target.innerHTML = html;
+                }
+            };
+
+            region.handler = (evt) => {
+                const data = evt.data ?? '';
+                if (swap === 'text') {
+                    target.textContent = data;
+                    return;
+                }
+                applySwap(data);
+            };
+            region.root = () => connectionRoot;
+            return region;
+        };
+
+        const initSseTargets = (scope) => {
+            scope.querySelectorAll('[data-fs-sse="true"]').forEach(el => {
+                if (el.dataset.fsSseInit === 'true') return;
+                el.dataset.fsSseInit = 'true';
+
+                if (!window.EventSource) return;
+
+                const endpoint = el.dataset.fsSseEndpoint;
+                if (!endpoint) return;
+                if (!document.body.contains(el)) return;
+
+                const retryRaw = el.dataset.fsSseRetry;
+                const region = liveRegion(el, 'fsSse');
+                const subscription = {
+                    endpoint,
+                    withCredentials: el.dataset.fsSseCredentials === 'true',
+                    event: el.dataset.fsSseEvent || 'message',
+                    handler: region.handler,
+                    reconnect: el.dataset.fsSseReconnect !== 'false',
+                    retry: retryRaw ? parseInt(retryRaw, 10) : null,
+                    root: region.root,
                 };
+                region.onDetach = () => unsubscribeSse(subscription);
+                subscribeSse(subscription);
+            });
+        };
 
-                connect();
+        // One WebSocket per endpoint, shared by every WSTarget that uses it.
+        // The server sends SSE-formatted frames, so both transports share semantics.
+        const wsConnections = new Map();
+        const wsDecoder = window.TextDecoder ? new TextDecoder() : null;
+        let wsObserver = null;
+        let wsSendBound = false;
+
+        const parseSseFrame = (text) => {
+            const evt = { type: 'message', data: [], lastEventId: '' };
+            text.split(/\\r\\n|\\r|\\n/).forEach(line => {
+                if (!line || line.startsWith(':')) return;
+                const idx = line.indexOf(':');
+                const field = idx === -1 ? line : line.slice(0, idx);
+                let value = idx === -1 ? '' : line.slice(idx + 1);
+                if (value.startsWith(' ')) value = value.slice(1);
+                if (field === 'event') evt.type = value;
+                else if (field === 'data') evt.data.push(value);
+                else if (field === 'id') evt.lastEventId = value;
+            });
+            if (!evt.data.length) return null;
+            evt.data = evt.data.join('\\n');
+            return evt;
+        };
 
-                observer = new MutationObserver(() => {
-                    if (!document.body.contains(connectionRoot)) {
-                        if (source) {
-                            source.close();
-                            source = null;
-                        }
-                        if (reconnectTimer) {
-                            window.clearTimeout(reconnectTimer);
-                            reconnectTimer = null;
-                        }
-                        observer.disconnect();
+        const sendWs = (conn, payload) => {
+            const message = typeof payload === 'string' ? payload : JSON.stringify(payload);
+            if (conn.socket && conn.socket.readyState === WebSocket.OPEN) {
+                conn.socket.send(message);
+            } else {
+                conn.outbox.push(message);
+            }
+        };
+
+        const openWs = (conn) => {
+            const url = new URL(conn.endpoint, window.location.href);
+            if (url.protocol === 'http:') url.protocol = 'ws:';
+            if (url.protocol === 'https:') url.protocol = 'wss:';
+            if (conn.lastEventId) url.searchParams.set('last_event_id', conn.lastEventId);
+
+            const socket = new WebSocket(url.toString());
+            socket.binaryType = 'arraybuffer';
+            conn.socket = socket;
+            socket.onopen = () => {
+                conn.outbox.splice(0).forEach(message => socket.send(message));
+            };
+            socket.onmessage = (msg) => {
+                const text = typeof msg.data === 'string' ? msg.data : wsDecoder.decode(msg.data);
+                text.split(/\\n\\n/).forEach(chunk => {
+                    const evt = parseSseFrame(chunk);
+                    if (!evt) return;
+                    if (evt.lastEventId) conn.lastEventId = evt.lastEventId;
+                    if (evt.type === 'resync') {
+                        conn.subscribers.forEach(sub => sub.root().dispatchEvent(new CustomEvent('fs:ws-resync', {
+                            bubbles: true,
+                            detail: { lastEventId: conn.lastEventId },
+                        })));
                     }
+                    const handlers = conn.handlers.get(evt.type);
+                    if (handlers) Array.from(handlers).forEach(handler => handler(evt));
                 });
-                observer.observe(document.body, { childList: true, subtree: true });
+            };
+            socket.onclose = () => {
+                if (conn.socket === socket) conn.socket = null;
+                const subs = Array.from(conn.subscribers);
+                if (!subs.some(sub => sub.reconnect)) return;
+                const retries = subs.map(sub => sub.retry).filter(Number.isFinite);
+                conn.reconnectTimer = window.setTimeout(() => {
+                    conn.reconnectTimer = null;
+                    if (conn.subscribers.size) openWs(conn);
+                }, retries.length ? Math.min(...retries) : 3000);
+            };
+        };
+
+        const unsubscribeWs = (sub) => {
+            const conn = sub.conn;
+            if (!conn.subscribers.delete(sub)) return;
+            const handlers = conn.handlers.get(sub.event);
+            handlers.delete(sub.handler);
+            if (!handlers.size) conn.handlers.delete(sub.event);
+            if (conn.subscribers.size) return;
+            if (conn.reconnectTimer) window.clearTimeout(conn.reconnectTimer);
+            if (conn.socket) conn.socket.close();
+            wsConnections.delete(conn.endpoint);
+            if (!wsConnections.size && wsObserver) {
+                wsObserver.disconnect();
+                wsObserver = null;
+            }
+        };
+
+        const subscribeWs = (sub) => {
+            let conn = wsConnections.get(sub.endpoint);
+            if (!conn) {
+                conn = {
+                    endpoint: sub.endpoint,
+                    socket: null,
+                    reconnectTimer: null,
+                    lastEventId: '',
+                    outbox: [],
+                    handlers: new Map(),
+                    subscribers: new Set(),
+                };
+                wsConnections.set(sub.endpoint, conn);
+            }
+            sub.conn = conn;
+            conn.subscribers.add(sub);
+            if (!conn.handlers.has(sub.event)) conn.handlers.set(sub.event, new Set());
+            conn.handlers.get(sub.event).add(sub.handler);
+            if (!conn.socket && !conn.reconnectTimer) openWs(conn);
+
+            if (!wsObserver) {
+                wsObserver = new MutationObserver(() => {
+                    wsConnections.forEach(c => c.subscribers.forEach(s => {
+                        if (!document.body.contains(s.root())) unsubscribeWs(s);
+                    }));
+                });
+                wsObserver.observe(document.body, { childList: true, subtree: true });
+            }
+        };
+
+        const bindWsSend = () => {
+            if (wsSendBound) return;
+            wsSendBound = true;
+            const connectionFor = (node) => {
+                const root = node.closest('[data-fs-ws="true"]');
+                return root ? wsConnections.get(root.dataset.fsWsEndpoint) : null;
+            };
+            // Forms marked data-fs-ws-send="<event>" inside a WSTarget go over the socket.
+            document.addEventListener('submit', (evt) => {
+                const form = evt.target.closest ? evt.target.closest('form[data-fs-ws-send]') : null;
+                const conn = form ? connectionFor(form) : null;
+                if (!conn) return;
+                evt.preventDefault();
+                sendWs(conn, { event: form.dataset.fsWsSend, data: Object.fromEntries(new FormData(form)) });
+            });
+            document.addEventListener('fs:ws-send', (evt) => {
+                const conn = evt.target.closest ? connectionFor(evt.target) : null;
+                if (conn) sendWs(conn, evt.detail);
+            });
+        };
+
+        const initWsTargets = (scope) => {
+            scope.querySelectorAll('[data-fs-ws="true"]').forEach(el => {
+                if (el.dataset.fsWsInit === 'true') return;
+                el.dataset.fsWsInit = 'true';
+
+                if (!window.WebSocket) return;
+
+                const endpoint = el.dataset.fsWsEndpoint;
+                if (!endpoint) return;
+                if (!document.body.contains(el)) return;
+
+                bindWsSend();
+                const retryRaw = el.dataset.fsWsRetry;
+                const region = liveRegion(el, 'fsWs');
+                const subscription = {
+                    endpoint,
+                    event: el.dataset.fsWsEvent || 'message',
+                    handler: region.handler,
+                    reconnect: el.dataset.fsWsReconnect !== 'false',
+                    retry: retryRaw ? parseInt(retryRaw, 10) : null,
+                    root: region.root,
+                };
+                region.onDetach = () => unsubscribeWs(subscription);
+                subscribeWs(subscription);
             });
         };
 
@@ -637,7 +1058,11 @@ INIT_SCRIPT_JS = """
         initSearchableSelect(document);
         initDateRangePresets(document);
         initInfiniteScroll(document);
+        initAutoRefresh(document);
+        initLazyBatches(document);
+        initVirtualTables(document);
         initSseTargets(document);
+        initWsTargets(document);
         initMermaid(document);
 
         // HTMX support: Re-initialize on content swap
@@ -649,7 +1074,11 @@ INIT_SCRIPT_JS = """
             initSearchableSelect(evt.detail.elt);
             initDateRangePresets(evt.detail.elt);
             initInfiniteScroll(evt.detail.elt);
+            initAutoRefresh(evt.detail.elt);
+            initLazyBatches(evt.detail.elt);
+            initVirtualTables(evt.detail.elt);
             initSseTargets(evt.detail.elt);
+            initWsTargets(evt.detail.elt);
             initMermaid(evt.detail.elt);
         });
     });
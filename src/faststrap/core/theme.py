@@ -575,6 +575,13 @@ _DEFAULT_COMPONENT_DEFAULTS: dict[str, dict[str, Any]] = {
         "retry": None,
         "aria_live": "polite",
     },
+    "WSTarget": {
+        "event": "message",
+        "swap": "inner",
+        "reconnect": True,
+        "retry": None,
+        "aria_live": "polite",
+    },
 }
 
 # Mutable working copy of defaults (can be modified via set_component_defaults)
@@ -7,9 +7,16 @@ Includes:
 - Interaction presets (ActiveSearch, InfiniteScroll, AutoRefresh, etc.)
 - Response helpers (hx_redirect, hx_refresh, toast_response, etc.)
 - Route protection (@require_auth decorator)
+- Response caching (@cached_datatable, @search_cache, versioned_response)
+- Streaming exports (export_response)
+- Idempotent write routes (@idempotent decorator)
+- HTMX-aware page layouts (@page decorator)
 """
 
 from .auth import require_auth
+from .caching import cached_datatable, search_cache, versioned_response
+from .exports import export_response
+from .idempotency import IdempotencyStore, StoredResponse, idempotent
 from .interactions import (
     ActiveSearch,
     AutoRefresh,
@@ -18,16 +25,23 @@ from .interactions import (
     LoadingButton,
     LocationAction,
     OptimisticAction,
+    infinite_cursor,
+    infinite_page,
+    lazy_batch,
 )
+from .pages import page
 from .responses import (
+    ToastBatch,
     hx_redirect,
     hx_refresh,
     hx_reswap,
     hx_retarget,
     hx_trigger,
+    notify,
+    toast_batch,
     toast_response,
 )
-from .streams import SSEStream, sse_comment, sse_event
+from .streams import SSEBroker, SSEEventLog, SSEStream, sse_comment, sse_event, sse_throttle
 
 __all__ = [
     # Interactions
@@ -38,6 +52,9 @@ __all__ = [
     "LocationAction",
     "LoadingButton",
     "OptimisticAction",
+    "infinite_cursor",
+    "infinite_page",
+    "lazy_batch",
     # Responses
     "hx_redirect",
     "hx_refresh",
@@ -45,10 +62,28 @@ __all__ = [
     "hx_retarget",
     "hx_trigger",
     "toast_response",
+    "ToastBatch",
+    "toast_batch",
+    "notify",
     # Streams
+    "SSEBroker",
+    "SSEEventLog",
     "SSEStream",
     "sse_event",
     "sse_comment",
+    "sse_throttle",
     # Auth
     "require_auth",
+    # Caching
+    "cached_datatable",
+    "search_cache",
+    "versioned_response",
+    # Exports
+    "export_response",
+    # Idempotency
+    "idempotent",
+    "IdempotencyStore",
+    "StoredResponse",
+    # Pages
+    "page",
 ]
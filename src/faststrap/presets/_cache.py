@@ -0,0 +1,203 @@
+"""Bounded in-process caches shared by the server-side presets."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar, cast
+
+from starlette.requests import HTTPConnection, Request
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Args:
+        max_entries: Maximum number of entries; the least recently used entry
+            is evicted first.
+        ttl: Seconds an entry stays valid, or None to keep entries until evicted.
+        clock: Monotonic clock, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float | None = 60.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            msg = f"max_entries must be >= 1, got {max_entries}"
+            raise ValueError(msg)
+        if ttl is not None and ttl <= 0:
+            msg = f"ttl must be > 0, got {ttl}"
+            raise ValueError(msg)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float | None, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the live value for ``key`` (marking it recently used), else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V, *, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, evicting least recently used entries."""
+        lifetime = self.ttl if ttl is None else ttl
+        expires = None if lifetime is None else self._clock() + lifetime
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> V | None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def discard(self, predicate: Callable[[Hashable, V], bool]) -> int:
+        """Remove every entry for which ``predicate(key, value)`` is true."""
+        with self._lock:
+            stale = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _Call:
+    __slots__ = ("done", "error", "value")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.error: BaseException | None = None
+        self.value: Any = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one call.
+
+    Callers that arrive while a call for their key is running wait for it and
+    share its result (or exception) instead of starting their own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def run(self, key: Hashable, func: Callable[[], V]) -> V:
+        """Call ``func`` unless another thread is already running it for ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return cast(V, call.value)
+        try:
+            value = call.value = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return value
+
+    async def run_async(self, key: Hashable, func: Callable[[], Awaitable[V]]) -> V:
+        """Await ``func()`` unless a task for ``key`` is already running on this loop.
+
+        The call runs as its own task, so a cancelled caller does not cancel
+        it for the others.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+
+def _find_request(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    """Return the Starlette request passed to a route handler, if any."""
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, Request):
+            return value
+    return None
+
+
+def _is_request_param(param: inspect.Parameter) -> bool:
+    """Return True when FastHTML would pass the request to ``param``."""
+    annotation = param.annotation
+    if annotation is inspect.Parameter.empty:
+        # FastHTML injects the request into unannotated ``req``/``request`` params.
+        return bool(param.name) and "request".startswith(param.name.lower())
+    if isinstance(annotation, str):
+        return annotation.rsplit(".", 1)[-1] in ("Request", "HTTPConnection")
+    return isinstance(annotation, type) and issubclass(annotation, HTTPConnection)
+
+
+def _require_request_param(func: Callable[..., Any], decorator: str) -> None:
+    """Raise if ``func`` has no parameter that receives the request."""
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return
+    if not any(_is_request_param(param) for param in params):
+        name = getattr(func, "__name__", repr(func))
+        msg = f"@{decorator} needs the route to take the request, e.g. {name}(req: Request, ...)"
+        raise TypeError(msg)
+
+
+def _etag(*parts: Any) -> str:
+    """Return a weak ETag derived from ``parts``."""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Return True when the request's ``If-None-Match`` covers ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    wanted = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == wanted:
+            return True
+    return False
+
+
+def _is_htmx_partial(request: Request) -> bool:
+    headers = request.headers
+    return "hx-request" in headers and "hx-history-restore-request" not in headers
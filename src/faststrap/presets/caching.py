@@ -0,0 +1,433 @@
+"""Response caching for DataTable and search routes.
+
+Caches rendered fragments per query and dataset version, and answers
+conditional requests with ``304 Not Modified``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import warnings
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from functools import wraps
+from typing import Any, cast
+from urllib.parse import urlencode
+
+from fasthtml.common import HttpHeader, to_xml
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, Response
+
+from ..components.display.data_table import datatable_export_params
+from ._cache import (
+    SingleFlight,
+    TTLCache,
+    _etag,
+    _etag_matches,
+    _find_request,
+    _is_htmx_partial,
+    _require_request_param,
+)
+
+_RESERVED_PARAMS = ("sort", "direction", "page", "per_page")
+
+
+@dataclass(frozen=True)
+class _CachedResult:
+    version: Any
+    content: Any
+    markup: str | None
+    media_type: str | None = None
+    headers: tuple[tuple[str, str], ...] = ()
+    etag: str = ""
+
+
+def _cache_entry(version: Any, result: Any) -> _CachedResult | None:
+    """Return a cacheable copy of a handler result, or None for non-200 responses."""
+    if isinstance(result, Response):
+        body = getattr(result, "body", None)
+        if result.status_code != 200 or not isinstance(body, bytes):
+            return None
+        headers = tuple(
+            (name, value)
+            for name, value in result.headers.items()
+            if name.lower() not in ("content-length", "etag", "cache-control", "vary")
+        )
+        return _CachedResult(version, body, None, result.media_type, headers)
+    return _CachedResult(version, result, to_xml(result))
+
+
+def _cached_response(entry: _CachedResult, headers: dict[str, str], partial: bool) -> Any:
+    if entry.markup is None:
+        return Response(
+            entry.content,
+            media_type=entry.media_type,
+            headers={**dict(entry.headers), **headers},
+        )
+    if partial:
+        return HTMLResponse(entry.markup, headers=headers)
+    # Let FastHTML wrap full-page loads in the app's page shell.
+    return (entry.content, *(HttpHeader(name, value) for name, value in headers.items()))
+
+
+def versioned_response(
+    request: Request,
+    version: Any,
+    render: Callable[[], Any],
+    *,
+    cache_control: str | None = "no-cache",
+) -> Any:
+    """Answer a polling request with ``304`` unless ``version`` has changed.
+
+    The ETag is derived from the request URL and the caller-supplied
+    ``version`` (a row count, ``max(updated_at)``, a counter...), so an
+    unchanged fragment is never rendered. ``render`` is only called when the
+    client's ``If-None-Match`` does not match.
+
+    Args:
+        request: Current request.
+        version: Value that changes whenever the fragment would change.
+        render: Zero-argument callable returning the fragment (or a Response).
+        cache_control: ``Cache-Control`` header sent with the response.
+
+    Returns:
+        ``304`` response, or the rendered fragment with an ``ETag`` header
+
+    Example:
+        >>> @app.get("/api/stats")
+        >>> def stats(req: Request):
+        >>>     return versioned_response(req, stats_version(), lambda: StatsPanel())
+        >>>
+        >>> AutoRefresh(endpoint="/api/stats", target="this", max_interval=60000)
+    """
+    partial = _is_htmx_partial(request)
+    etag = _etag(request.url.path, request.url.query, version, partial)
+    headers = {"ETag": etag, "Vary": "HX-Request, HX-History-Restore-Request"}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    result = render()
+    entry = _cache_entry(version, result)
+    return result if entry is None else _cached_response(entry, headers, partial)
+
+
+def datatable_cache_key(request: Request, *, search_param: str = "q") -> str:
+    """Return the canonical DataTable query for ``request``.
+
+    The query is rebuilt through ``datatable_export_params``, so equivalent
+    requests share a key: ``sort=-revenue`` and ``sort=revenue&direction=desc``
+    match, filter order does not matter, and a missing ``page`` means page 1.
+    """
+    query = request.query_params
+    sort = query.getlist("sort")
+    direction = query.get("direction", "asc")
+    filters: dict[str, Any] = {}
+    for key in sorted(set(query.keys()) - {*_RESERVED_PARAMS, search_param}):
+        values = query.getlist(key)
+        filters[key] = values if len(values) > 1 else values[0]
+
+    params = datatable_export_params(
+        sort=sort if len(sort) > 1 else (sort[0] if sort else None),
+        direction="desc" if direction == "desc" else "asc",
+        search=query.get(search_param) or None,
+        search_param=search_param,
+        filters=filters,
+        include_pagination=True,
+        page=_canonical_int(query.get("page"), default="1"),
+        per_page=_canonical_int(query.get("per_page")),
+    )
+    return f"{request.url.path}?{urlencode(params, doseq=True)}"
+
+
+def _canonical_int(value: str | None, *, default: str | None = None) -> Any:
+    if value is None or value == "":
+        return default
+    try:
+        return str(int(value))
+    except ValueError:
+        return value
+
+
+def cached_datatable(
+    version: Any | Callable[[], Any] = None,
+    *,
+    ttl: float | None = 60.0,
+    max_entries: int = 256,
+    search_param: str = "q",
+    cache_control: str | None = "private, no-cache",
+) -> Callable:
+    """Decorator that caches DataTable route responses per query and dataset version.
+
+    Requests are keyed by path, the canonical DataTable query contract (see
+    ``datatable_cache_key``) and the dataset ``version``. The ETag is derived
+    from the same key plus a per-route generation that ``route.invalidate()``
+    bumps, so a matching ``If-None-Match`` gets a ``304`` before the handler
+    runs. Bump the version whenever the underlying data changes; calling
+    ``route.invalidate()`` instead also works, but only in the process that
+    calls it.
+
+    Args:
+        version: Dataset version, or a zero-argument callable returning it
+            (called on every request, so keep it cheap). Without one, clients
+            keep getting ``304`` until ``route.invalidate()`` is called, so a
+            ``UserWarning`` is emitted.
+        ttl: Seconds a rendered response stays cached (None for no expiry).
+        max_entries: Maximum cached responses (least recently used evicted).
+        search_param: Query param name used for DataTable search.
+        cache_control: ``Cache-Control`` header sent with cached responses.
+
+    Returns:
+        Decorator function. The decorated route gains ``invalidate(version=...)``
+        and ``cache`` attributes.
+
+    Example:
+        >>> @app.get("/reports/sales")
+        >>> @cached_datatable(version=lambda: sales_version(), ttl=300)
+        >>> def sales(req: Request, sort: str = None, q: str = None, page: int = 1):
+        >>>     return DataTable(load_sales(), sort=sort, search=q, page=page, ...)
+
+    Note:
+        Only successful responses are cached. Non-HTMX requests still get a
+        full FastHTML page around the cached fragment. The route must take the
+        request (``req: Request``); decorating one that does not raises
+        ``TypeError``.
+    """
+    if version is None:
+        warnings.warn(
+            "cached_datatable() without a version keeps answering 304 after the data "
+            "changes until route.invalidate() is called; pass version=...",
+            UserWarning,
+            stacklevel=2,
+        )
+    cache: TTLCache[_CachedResult] = TTLCache(max_entries=max_entries, ttl=ttl)
+    # Part of every ETag; invalidate() bumps it so clients revalidate too.
+    generation = 0
+
+    def current_version() -> Any:
+        return version() if callable(version) else version
+
+    def lookup(request: Request) -> tuple[Any, str, str, Any]:
+        dataset_version = current_version()
+        key = datatable_cache_key(request, search_param=search_param)
+        partial = _is_htmx_partial(request)
+        etag = _etag(key, dataset_version, generation, partial)
+        return dataset_version, key, etag, partial
+
+    def headers_for(etag: str) -> dict[str, str]:
+        headers = {"ETag": etag, "Vary": "HX-Request, HX-History-Restore-Request"}
+        if cache_control:
+            headers["Cache-Control"] = cache_control
+        return headers
+
+    def store(key: str, dataset_version: Any, result: Any) -> _CachedResult | None:
+        entry = _cache_entry(dataset_version, result)
+        if entry is not None:
+            cache.set((key, dataset_version), entry)
+        return entry
+
+    def respond(entry: _CachedResult, etag: str, partial: bool) -> Any:
+        return _cached_response(entry, headers_for(etag), partial)
+
+    def before(request: Request | None) -> tuple[Any, tuple[str, Any, str, bool] | None]:
+        """Return ``(response, None)`` on a hit, else ``(None, pending)`` for ``after``."""
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None, None
+        dataset_version, key, etag, partial = lookup(request)
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers_for(etag)), None
+        entry = cache.get((key, dataset_version))
+        if entry is not None:
+            return respond(entry, etag, partial), None
+        return None, (key, dataset_version, etag, partial)
+
+    def after(result: Any, pending: tuple[str, Any, str, bool] | None) -> Any:
+        if pending is None:
+            return result
+        key, dataset_version, etag, partial = pending
+        entry = store(key, dataset_version, result)
+        return result if entry is None else respond(entry, etag, partial)
+
+    def invalidate(*, version: Any = ...) -> int:
+        """Drop cached responses for ``version`` (all responses when omitted).
+
+        Also changes every ETag, so clients holding an old one get a fresh
+        response instead of a ``304``.
+        """
+        nonlocal generation
+        generation += 1
+        if version is ...:
+            count = len(cache)
+            cache.clear()
+            return count
+        return cache.discard(lambda key, entry: entry.version == version)
+
+    def decorator(func: Callable) -> Callable:
+        _require_request_param(func, "cached_datatable")
+
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            hit, pending = before(_find_request(args, kwargs))
+            if hit is not None:
+                return hit
+            return after(await func(*args, **kwargs), pending)
+
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            hit, pending = before(_find_request(args, kwargs))
+            if hit is not None:
+                return hit
+            return after(func(*args, **kwargs), pending)
+
+        wrapper: Any = async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        wrapper.invalidate = invalidate
+        wrapper.cache = cache
+        return cast(Callable, wrapper)
+
+    return decorator
+
+
+def _normalize_query(value: str | None) -> str:
+    """Return the shared cache form of a search query."""
+    return " ".join((value or "").split()).casefold()
+
+
+def search_cache(
+    version: Any | Callable[[], Any] = None,
+    *,
+    param: str = "q",
+    ttl: float | None = 30.0,
+    max_entries: int = 1024,
+    cache_control: str | None = "private, no-cache",
+    scope: Callable[[Request], Any] | None = None,
+) -> Callable:
+    """Decorator that caches search route results per normalized query.
+
+    Pairs with ``ActiveSearch``. The ``param`` query value is trimmed,
+    whitespace-collapsed and casefolded, and the handler receives that
+    normalized value, so ``"Ada "`` and ``"ada"`` share one cache entry.
+    Results are kept in a TTL LRU keyed by path, normalized query, the other
+    query params, ``scope`` and ``version``. Without ``scope`` every user
+    shares the cached results, so the handler must not return per-user data.
+    Concurrent requests for the same key wait
+    for a single handler call (single-flight) instead of each hitting the
+    backend, and repeat requests whose ``If-None-Match`` matches the
+    result's ETag get a ``304``.
+
+    Args:
+        version: Data version, or a zero-argument callable returning it
+            (called on every request, so keep it cheap).
+        param: Query param holding the search text.
+        ttl: Seconds a result stays cached (None for no expiry).
+        max_entries: Maximum cached results (least recently used evicted).
+        cache_control: ``Cache-Control`` header sent with cached results.
+        scope: Function returning a per-user value (e.g. the session user id)
+            for handlers whose results depend on who is asking, so one
+            user's results are never served to another.
+
+    Returns:
+        Decorator function. The decorated route gains ``invalidate()`` and
+        ``cache`` attributes.
+
+    Example:
+        >>> @app.get("/search")
+        >>> @search_cache(ttl=60)
+        >>> def search(req: Request, q: str = ""):
+        >>>     return Ul(*(Li(user.name) for user in find_users(q)))
+        >>>
+        >>> ActiveSearch(endpoint="/search", target="#results")
+
+    Note:
+        Single-flight covers one process: async handlers are collapsed per
+        event loop, sync handlers across threads. The ETag is computed from
+        the rendered result, so it changes whenever the results do. The route
+        must take the request; decorating one that does not raises ``TypeError``.
+    """
+    cache: TTLCache[_CachedResult] = TTLCache(max_entries=max_entries, ttl=ttl)
+    flights = SingleFlight()
+
+    def lookup(request: Request) -> tuple[tuple[Any, ...], str]:
+        data_version = version() if callable(version) else version
+        query = _normalize_query(request.query_params.get(param))
+        others = tuple(
+            sorted(item for item in request.query_params.multi_items() if item[0] != param)
+        )
+        owner = None if scope is None else repr(scope(request))
+        return (request.url.path, query, others, owner, data_version), query
+
+    def store(key: tuple[Any, ...], result: Any) -> Any:
+        """Cache ``result`` and return its entry (or ``result`` itself if uncacheable)."""
+        entry = _cache_entry(key[-1], result)
+        if entry is None:
+            return result
+        body = entry.content if entry.markup is None else entry.markup
+        entry = replace(entry, etag=_etag(body))
+        cache.set(key, entry)
+        return entry
+
+    def respond(request: Request, result: Any) -> Any:
+        if not isinstance(result, _CachedResult):
+            return result
+        partial = _is_htmx_partial(request)
+        etag = result.etag if partial else _etag(result.etag, "page")
+        headers = {"ETag": etag, "Vary": "HX-Request, HX-History-Restore-Request"}
+        if cache_control:
+            headers["Cache-Control"] = cache_control
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return _cached_response(result, headers, partial)
+
+    def prepare(
+        args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> tuple[Request, tuple[Any, ...]] | None:
+        request = _find_request(args, kwargs)
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None
+        key, query = lookup(request)
+        if param in kwargs:
+            kwargs[param] = query
+        return request, key
+
+    def invalidate() -> int:
+        """Drop every cached result."""
+        count = len(cache)
+        cache.clear()
+        return count
+
+    def decorator(func: Callable) -> Callable:
+        _require_request_param(func, "search_cache")
+
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            prepared = prepare(args, kwargs)
+            if prepared is None:
+                return await func(*args, **kwargs)
+            request, key = prepared
+            cached = cache.get(key)
+            if cached is None:
+
+                async def load() -> Any:
+                    return cache.get(key) or store(key, await func(*args, **kwargs))
+
+                cached = await flights.run_async(key, load)
+            return respond(request, cached)
+
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            prepared = prepare(args, kwargs)
+            if prepared is None:
+                return func(*args, **kwargs)
+            request, key = prepared
+            cached = cache.get(key)
+            if cached is None:
+                cached = flights.run(
+                    key, lambda: cache.get(key) or store(key, func(*args, **kwargs))
+                )
+            return respond(request, cached)
+
+        wrapper: Any = async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        wrapper.invalidate = invalidate
+        wrapper.cache = cache
+        return cast(Callable, wrapper)
+
+    return decorator
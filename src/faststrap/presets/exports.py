@@ -0,0 +1,351 @@
+"""Streaming export responses for DataTable data.
+
+Pairs with ``ExportButton`` and ``datatable_export_params``: the export route
+receives the table's query contract and streams matching rows as CSV, NDJSON
+or JSON without building the whole file in memory.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import re
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
+from itertools import chain, islice
+from typing import Any, Literal
+
+from starlette.responses import StreamingResponse
+
+from ..components.display._arrow import _arrow_table, _arrow_window, _is_arrow
+from ..components.display.data_table import SortableDirection, _matches_search, _parse_sort
+from ..components.display.data_table_index import (
+    SortSpec,
+    _column_ranks,
+    _order_by_ranks,
+    _sort_records,
+)
+from ..components.display.table import (
+    _frame_kind,
+    _is_missing,
+    _normalize_table_data,
+    _select_frame,
+)
+
+ExportStreamFormat = Literal["csv", "ndjson", "json"]
+
+_MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+_CONTROL_PARAMS = {"format", "filename", "sort", "direction", "page", "per_page"}
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._ -]+")
+
+
+def _param_values(params: Any, key: str) -> list[str]:
+    if hasattr(params, "getlist"):
+        return [str(value) for value in params.getlist(key)]
+    value = params.get(key)
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def _cell_param(value: Any) -> str:
+    if _is_missing(value):
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class _Query:
+    """The DataTable query contract parsed from request params."""
+
+    def __init__(self, params: Any, *, search_param: str, filters: Collection[str]) -> None:
+        sort = _param_values(params, "sort")
+        direction: SortableDirection = (
+            "desc" if _param_values(params, "direction")[:1] == ["desc"] else "asc"
+        )
+        self.sort: list[SortSpec] = _parse_sort(sort, direction)
+        search = _param_values(params, search_param)
+        self.search = search[0] if search else None
+        # Only allowlisted params filter; anything else in the query is ignored.
+        reserved = {*_CONTROL_PARAMS, search_param}
+        self.filters = {
+            str(key): set(values)
+            for key in dict.fromkeys(filters)
+            if str(key) not in reserved and (values := _param_values(params, str(key)))
+        }
+
+    def bind(self, columns: list[str]) -> None:
+        """Drop filters and sort keys that are not table columns."""
+        self.filters = {key: values for key, values in self.filters.items() if key in columns}
+        self.sort = [spec for spec in self.sort if spec[0] in columns]
+
+    def matches(self, row: Mapping[str, Any], columns: list[str]) -> bool:
+        for key, wanted in self.filters.items():
+            if _cell_param(row.get(key)) not in wanted:
+                return False
+        if self.search:
+            return _matches_search(dict(row), columns=columns, query=self.search)
+        return True
+
+
+class _TabularSource:
+    """Random-access view over in-memory data (list, DataFrame or Arrow)."""
+
+    def __init__(self, data: Any, columns: list[str] | None) -> None:
+        self.kind = "arrow" if _is_arrow(data) else _frame_kind(data) or "records"
+        if self.kind == "arrow":
+            self.data = _arrow_table(data, columns=columns, max_rows=None)
+            self.columns = [str(col) for col in self.data.column_names]
+            self.size = self.data.num_rows
+        elif self.kind == "records":
+            self.columns, self.data, _ = _normalize_table_data(
+                data, columns=columns, max_rows=None, include_index=False
+            )
+            self.size = len(self.data)
+        else:
+            self.data = _select_frame(data, self.kind, columns=columns, max_rows=None)
+            self.columns = [str(col) for col in self.data.columns]
+            self.size = len(self.data)
+
+    def rows(self, positions: Sequence[int]) -> list[dict[str, Any]]:
+        if self.kind == "records":
+            return [self.data[pos] for pos in positions]
+        if self.kind == "arrow":
+            return list(_arrow_window(self.data, positions).to_pylist())
+        contiguous = isinstance(positions, range) and positions.step == 1
+        if self.kind == "pandas":
+            window = self.data.iloc[
+                (
+                    slice(positions[0], positions[-1] + 1)
+                    if contiguous and positions
+                    else list(positions)
+                )
+            ]
+        elif contiguous:
+            window = self.data.slice(positions[0] if positions else 0, len(positions))
+        else:
+            window = self.data[list(positions)]
+        return _normalize_table_data(window, columns=None, max_rows=None, include_index=False)[1]
+
+    def column(self, name: str) -> list[Any]:
+        if self.kind == "records":
+            return [row.get(name) for row in self.data]
+        if self.kind == "arrow":
+            return list(self.data.column(name).to_pylist())
+        if self.kind == "pandas":
+            return [None if _is_missing(value) else value for value in self.data[name].tolist()]
+        return list(self.data[name].to_list())
+
+
+def _tabular_rows(
+    source: _TabularSource, query: _Query, chunk_rows: int
+) -> Iterator[list[dict[str, Any]]]:
+    columns = source.columns
+    positions: Sequence[int] = range(source.size)
+    if query.filters or query.search:
+        # One pass in chunks keeps only matching row positions in memory.
+        kept: list[int] = []
+        for start in range(0, source.size, chunk_rows):
+            window = range(start, min(start + chunk_rows, source.size))
+            kept.extend(
+                pos
+                for pos, row in zip(window, source.rows(window), strict=True)
+                if query.matches(row, columns)
+            )
+        positions = kept
+    if query.sort:
+        ranked = [
+            (_column_ranks(source.column(col))[1], direction == "desc")
+            for col, direction in query.sort
+        ]
+        positions = _order_by_ranks(positions, ranked)
+    for start in range(0, len(positions), chunk_rows):
+        yield source.rows(positions[start : start + chunk_rows])
+
+
+def _is_cursor(source: Any) -> bool:
+    return hasattr(source, "fetchmany") and hasattr(source, "description")
+
+
+def _fetch_rows(cursor: Any, size: int) -> Iterator[Sequence[Any]]:
+    while batch := cursor.fetchmany(size):
+        yield from batch
+
+
+def _streamed_rows(
+    source: Any, query: _Query, columns: list[str] | None, chunk_rows: int
+) -> tuple[list[str], Iterator[list[dict[str, Any]]]]:
+    """Return columns and matching row chunks for an iterator or DB-API cursor."""
+    raw: Iterator[dict[str, Any]]
+    if _is_cursor(source):
+        names = [str(item[0]) for item in source.description or ()]
+        raw = (dict(zip(names, row, strict=True)) for row in _fetch_rows(source, chunk_rows))
+        resolved = columns or names
+    else:
+        iterator = iter(source)
+        first = next(iterator, None)
+        if first is None:
+            return list(columns or []), iter(())
+        if isinstance(first, Mapping):
+            resolved = columns or [str(key) for key in first]
+            raw = (dict(row) for row in chain([first], iterator))
+        elif columns is None:
+            msg = "export_response() needs columns= for rows that are not mappings"
+            raise ValueError(msg)
+        else:
+            resolved = columns
+            raw = (dict(zip(columns, row, strict=True)) for row in chain([first], iterator))
+
+    query.bind(resolved)
+    matching = (row for row in raw if query.matches(row, resolved))
+
+    def chunks() -> Iterator[list[dict[str, Any]]]:
+        if query.sort:
+            # Iterators cannot be revisited, so sorting buffers the matching rows.
+            buffered = list(matching)
+            order = _sort_records(buffered, query.sort)
+            for start in range(0, len(order), chunk_rows):
+                yield [buffered[pos] for pos in order[start : start + chunk_rows]]
+            return
+        while chunk := list(islice(matching, chunk_rows)):
+            yield chunk
+
+    return resolved, chunks()
+
+
+def _json_value(value: Any) -> Any:
+    if _is_missing(value):
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    isoformat = getattr(value, "isoformat", None)
+    return isoformat() if callable(isoformat) else str(value)
+
+
+def _encode_csv(columns: list[str], chunks: Iterable[list[dict[str, Any]]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            ["" if _is_missing(row.get(col)) else row.get(col) for col in columns] for row in chunk
+        )
+        yield buffer.getvalue()
+
+
+def _encode_ndjson(columns: list[str], chunks: Iterable[list[dict[str, Any]]]) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps({col: _json_value(row.get(col)) for col in columns}) + "\n" for row in chunk
+        )
+
+
+def _encode_json(columns: list[str], chunks: Iterable[list[dict[str, Any]]]) -> Iterator[str]:
+    separator = "\n"
+    yield "["
+    for chunk in chunks:
+        for row in chunk:
+            yield separator + json.dumps({col: _json_value(row.get(col)) for col in columns})
+            separator = ",\n"
+    yield "\n]\n"
+
+
+_ENCODERS = {"csv": _encode_csv, "ndjson": _encode_ndjson, "json": _encode_json}
+
+
+def _attachment_name(filename: str | None, export_format: str) -> str:
+    name = _UNSAFE_FILENAME.sub("_", (filename or "").replace("\\", "/").rsplit("/", 1)[-1])
+    name = name.strip(" .") or "export"
+    if not name.lower().endswith(f".{export_format}"):
+        name = f"{name}.{export_format}"
+    return name
+
+
+def export_response(
+    source: Any,
+    params: Mapping[str, Any] | None = None,
+    format: ExportStreamFormat | None = None,
+    *,
+    columns: list[str] | None = None,
+    filters: Collection[str] = (),
+    filename: str | None = None,
+    search_param: str = "q",
+    chunk_rows: int = 1000,
+) -> StreamingResponse:
+    """Stream ``source`` as a CSV, NDJSON or JSON download using DataTable semantics.
+
+    ``params`` is the DataTable query contract (``request.query_params`` or a
+    ``datatable_export_params`` dict): ``q`` searches every column like
+    ``DataTable``, ``sort``/``direction`` sort rows, and each param listed in
+    ``filters`` keeps rows whose column value equals it (repeat it to allow
+    several values). Other params are ignored, so clients cannot filter on
+    columns you did not expose. ``format`` and ``filename`` default to the
+    params sent by ``ExportButton``.
+
+    Args:
+        source: List of dicts, pandas/polars DataFrame, pyarrow Table, an
+            iterator of dicts (or tuples with ``columns``), or a DB-API cursor.
+        params: Query params describing search, sort and filters.
+        format: ``"csv"``, ``"ndjson"`` or ``"json"``.
+        columns: Optional column order (required for tuple rows).
+        filters: Column names the client may filter on by equality.
+        filename: Download file name (extension added when missing).
+        search_param: Query param name used for search.
+        chunk_rows: Rows encoded per streamed chunk.
+
+    Returns:
+        StreamingResponse with a ``Content-Disposition: attachment`` header
+
+    Example:
+        >>> @app.get("/orders/export")
+        >>> def export_orders(req: Request):
+        >>>     cursor = db.execute("SELECT * FROM orders ORDER BY id")
+        >>>     return export_response(cursor, req.query_params, filters=["status"])
+
+    Note:
+        Lists, DataFrames and Arrow tables are filtered and sorted by row
+        position, so only positions and the sort columns are held besides the
+        source. Iterators and cursors stream in constant memory, but sorting
+        them buffers the matching rows; push ``ORDER BY`` into the query for
+        very large cursor exports.
+    """
+    if chunk_rows < 1:
+        msg = f"chunk_rows must be >= 1, got {chunk_rows}"
+        raise ValueError(msg)
+    params = params if params is not None else {}
+    export_format = format or (_param_values(params, "format")[:1] or ["csv"])[0]
+    if export_format not in _ENCODERS:
+        msg = f"export_response() supports csv, ndjson and json, got {export_format!r}"
+        raise ValueError(msg)
+
+    if isinstance(filters, str):
+        filters = (filters,)
+    query = _Query(params, search_param=search_param, filters=filters)
+    in_memory = (
+        isinstance(source, list) and all(isinstance(item, dict) for item in source)
+    ) or bool(_is_arrow(source) or _frame_kind(source))
+    if in_memory:
+        tabular = _TabularSource(source, columns)
+        resolved = tabular.columns
+        query.bind(resolved)
+        chunks = _tabular_rows(tabular, query, chunk_rows)
+    else:
+        resolved, chunks = _streamed_rows(source, query, columns, chunk_rows)
+
+    requested_name = filename or next(iter(_param_values(params, "filename")), None)
+    name = _attachment_name(requested_name, export_format)
+    return StreamingResponse(
+        _ENCODERS[export_format](resolved, chunks),
+        media_type=_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}"'},
+    )
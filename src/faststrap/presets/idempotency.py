@@ -0,0 +1,239 @@
+"""Idempotent write routes.
+
+Pairs with ``OptimisticAction``: the button sends an ``Idempotency-Key``
+header, and ``@idempotent`` answers repeated keys with the first response
+instead of running the handler again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Protocol, cast
+
+from fasthtml.common import HttpHeader, NotStr, to_xml
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ._cache import SingleFlight, TTLCache, _find_request, _require_request_param
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_MAX_KEY_LENGTH = 255
+# Tags FastHTML moves into <head> on full page responses.
+_HEAD_TAGS = frozenset({"title", "meta", "link", "style", "base"})
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A handler response kept for replay (plain data, so shared stores can serialize it).
+
+    ``fragment`` marks rendered FastHTML content (with its ``<head>`` tags
+    kept apart in ``head``), which is replayed through FastHTML so non-HTMX
+    requests still get the page shell.
+    """
+
+    status_code: int
+    body: bytes
+    headers: tuple[tuple[str, str], ...] = ()
+    media_type: str | None = None
+    fragment: bool = False
+    head: bytes = b""
+
+    def to_response(self, *, replayed: bool = False) -> Response:
+        headers = dict(self.headers)
+        if replayed:
+            headers[REPLAYED_HEADER] = "true"
+        return Response(
+            self.body,
+            status_code=self.status_code,
+            headers=headers,
+            media_type=self.media_type,
+        )
+
+
+class IdempotencyStore(Protocol):
+    """Storage for first responses; ``TTLCache`` is the in-memory default.
+
+    Implement ``get``/``set`` over Redis or a database table to share
+    responses between processes.
+    """
+
+    def get(self, key: str) -> StoredResponse | None: ...
+
+    def set(self, key: str, value: StoredResponse, *, ttl: float | None = None) -> None: ...
+
+
+def _stored(result: Any) -> StoredResponse | None:
+    """Return a replayable copy of ``result``, or None if it must not be replayed."""
+    if isinstance(result, Response):
+        body = getattr(result, "body", None)
+        # Server errors are retryable, and streamed bodies cannot be kept.
+        if result.status_code >= 500 or not isinstance(body, bytes):
+            return None
+        headers = tuple(
+            (name, value)
+            for name, value in result.headers.items()
+            if name.lower() != "content-length"
+        )
+        return StoredResponse(result.status_code, body, headers, result.media_type)
+    parts = result if isinstance(result, tuple) else (result,)
+    headers = tuple((part.k, part.v) for part in parts if isinstance(part, HttpHeader))
+    content = [part for part in parts if not isinstance(part, HttpHeader)]
+    head = [part for part in content if getattr(part, "tag", "") in _HEAD_TAGS]
+    body = [part for part in content if getattr(part, "tag", "") not in _HEAD_TAGS]
+    return StoredResponse(
+        200,
+        to_xml(tuple(body)).encode("utf-8"),
+        headers,
+        "text/html",
+        fragment=True,
+        head=to_xml(tuple(head)).encode("utf-8") if head else b"",
+    )
+
+
+class _Markup:
+    """Stored markup that FastHTML renders like the content it was captured from."""
+
+    def __init__(self, html: bytes, tag: str = "") -> None:
+        self.html = html.decode("utf-8")
+        # FastHTML moves items tagged "title"/"meta" into <head> on full pages.
+        self.tag = tag
+
+    def __ft__(self) -> NotStr:
+        return NotStr(self.html)
+
+
+def _replay(stored: StoredResponse) -> Any:
+    if not stored.fragment:
+        return stored.to_response(replayed=True)
+    content = [_Markup(stored.body)]
+    if stored.head:
+        tag = "title" if b"<title" in stored.head else "meta"
+        content.insert(0, _Markup(stored.head, tag))
+    headers = [HttpHeader(name, value) for name, value in stored.headers]
+    return (*content, *headers, HttpHeader(REPLAYED_HEADER, "true"))
+
+
+def idempotent(
+    *,
+    ttl: float | None = 300.0,
+    max_entries: int = 1024,
+    store: IdempotencyStore | None = None,
+    scope: Callable[[Request], Any] | None = None,
+    header: str = IDEMPOTENCY_HEADER,
+) -> Callable:
+    """Decorator that runs a write route at most once per idempotency key.
+
+    Requests carrying ``header`` (sent by ``OptimisticAction``) are keyed by
+    method, path, ``scope`` and the header value. The first request runs the
+    handler; repeats within ``ttl`` get the stored first response, marked
+    with an ``Idempotent-Replayed: true`` header. Duplicates that arrive while
+    the first request is still running wait for it instead of running
+    concurrently. Requests without the header run normally.
+
+    Args:
+        ttl: Seconds a first response is replayed (None to keep it until evicted).
+        max_entries: Size of the default in-memory store (least recently used evicted).
+        store: Shared store for first responses (defaults to an in-memory ``TTLCache``).
+        scope: Function returning a per-user value (e.g. the session user id),
+            so one user's key can never replay another user's response.
+        header: Request header carrying the key.
+
+    Returns:
+        Decorator function. The decorated route gains a ``store`` attribute.
+
+    Example:
+        >>> @app.post("/items/{item_id}/archive")
+        >>> @idempotent(scope=lambda req: req.session.get("user_id"))
+        >>> def archive(req: Request, item_id: int):
+        >>>     items.archive(item_id)
+        >>>     return ItemRow(items[item_id])
+
+    Note:
+        The first request's result is returned unchanged; only a copy is kept
+        for replay. Responses with a 5xx status, streamed bodies and exceptions
+        are not stored, so the client may retry them. Duplicates waiting on
+        an unstored response run the handler themselves, and duplicates of
+        a request that raised get its exception. Waiting for an in-flight
+        duplicate only works within one process; a shared ``store`` covers
+        completed requests. The route must take the request; decorating one
+        that does not raises ``TypeError``.
+    """
+    responses: IdempotencyStore = (
+        store if store is not None else TTLCache(max_entries=max_entries, ttl=ttl)
+    )
+    flights = SingleFlight()
+
+    def key_for(request: Request | None) -> str | None:
+        if request is None:
+            return None
+        value = request.headers.get(header)
+        if not value or len(value) > _MAX_KEY_LENGTH:
+            return None
+        owner = "" if scope is None else repr(scope(request))
+        return f"{request.method} {request.url.path} {owner} {value}"
+
+    def capture(key: str, result: Any) -> StoredResponse | None:
+        stored = _stored(result)
+        if stored is not None:
+            responses.set(key, stored, ttl=ttl)
+        return stored
+
+    def decorator(func: Callable) -> Callable:
+        _require_request_param(func, "idempotent")
+
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = key_for(_find_request(args, kwargs))
+            if key is None:
+                return await func(*args, **kwargs)
+            outcome: list[Any] = []
+
+            async def run() -> StoredResponse | None:
+                result = await func(*args, **kwargs)
+                outcome.append(result)
+                return capture(key, result)
+
+            while True:
+                stored = responses.get(key)
+                if stored is not None:
+                    return _replay(stored)
+                stored = await flights.run_async(key, run)
+                if outcome:
+                    # This request ran the handler; FastHTML renders its result as usual.
+                    return outcome[0]
+                if stored is not None:
+                    return _replay(stored)
+                # The first response could not be stored, so run this request too.
+
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = key_for(_find_request(args, kwargs))
+            if key is None:
+                return func(*args, **kwargs)
+            outcome: list[Any] = []
+
+            def run() -> StoredResponse | None:
+                result = func(*args, **kwargs)
+                outcome.append(result)
+                return capture(key, result)
+
+            while True:
+                stored = responses.get(key)
+                if stored is not None:
+                    return _replay(stored)
+                stored = flights.run(key, run)
+                if outcome:
+                    return outcome[0]
+                if stored is not None:
+                    return _replay(stored)
+
+        wrapper: Any = async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        wrapper.store = responses
+        return cast(Callable, wrapper)
+
+    return decorator
@@ -4,15 +4,36 @@ Ready-to-use components for common HTMX patterns like live search,
 infinite scroll, auto-refresh, lazy loading, and optimistic UI actions.
 """
 
+import asyncio
+import base64
+import inspect
 import json
+import logging
+import re
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from itertools import dropwhile, islice
 from typing import Any
+from urllib.parse import urlencode
 
 from fasthtml.common import Div, Input
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
 
 from ..components.forms.button import Button
 from ..core.base import merge_classes
 from ..utils.attrs import convert_attrs
 
+_logger = logging.getLogger(__name__)
+_LAZY_NAME_RE = re.compile(r"^[A-Za-z0-9_.:-]+$")
+
+
+def _validate_lazy_name(name: str) -> str:
+    """Return ``name`` if it is safe inside a CSS attribute selector."""
+    if not _LAZY_NAME_RE.fullmatch(name):
+        msg = f"Invalid LazyLoad batch name or key: {name!r}"
+        raise ValueError(msg)
+    return name
+
 
 def _is_numeric_threshold(value: str) -> bool:
     try:
@@ -22,13 +43,41 @@ def _is_numeric_threshold(value: str) -> bool:
     return 0.0 <= parsed <= 1.0
 
 
-def _build_optimistic_dispatch_script(event_name: str, detail: dict[str, Any]) -> str:
+def _keyset(key: str | Sequence[str] | Callable[[Any], Any]) -> Callable[[Any], tuple[Any, ...]]:
+    """Return a function reading an item's keyset values as a tuple."""
+    if callable(key):
+        func = key
+        return lambda item: (
+            tuple(value) if isinstance(value := func(item), (list, tuple)) else (value,)
+        )
+    fields = (key,) if isinstance(key, str) else tuple(key)
+
+    def values(item: Any) -> tuple[Any, ...]:
+        if isinstance(item, Mapping):
+            return tuple(item[field] for field in fields)
+        return tuple(getattr(item, field) for field in fields)
+
+    return values
+
+
+def _encode_cursor(values: tuple[Any, ...]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _build_optimistic_dispatch_script(
+    event_name: str, detail: dict[str, Any], *, idempotency: bool = False
+) -> str:
     """Build a small inline script that dispatches a bubbling CustomEvent."""
     event_json = json.dumps(event_name)
     detail_json = json.dumps(detail)
+    if idempotency:
+        detail_json = (
+            f"Object.assign({detail_json},"
+            "{idempotencyKey:this.dataset.faststrapIdempotencyKey||null})"
+        )
     return (
-        f"this.dispatchEvent(new CustomEvent({event_json}, "
-        f"{{bubbles:true,detail:{detail_json}}}));"
+        f"this.dispatchEvent(new CustomEvent({event_json}, {{bubbles:true,detail:{detail_json}}}));"
     )
 
 
@@ -80,16 +129,21 @@ def ActiveSearch(
         Uses `hx-trigger="keyup changed delay:{debounce}ms"` for debouncing.
         The server endpoint should accept the search query as a query parameter
         with the name specified in the `name` argument (default: "q").
+        `hx-sync="this:replace"` cancels a pending request when a newer one
+        starts; decorate the endpoint with `@search_cache()` to share results
+        for repeated queries.
     """
     # Build HTMX attributes
     hx_attrs = {
         "hx_get": endpoint,
         "hx_target": target,
         "hx_trigger": f"keyup changed delay:{debounce}ms",
+        # A new keystroke aborts the in-flight request, so stale results never land.
+        "hx_sync": "this:replace",
     }
 
     # Merge with user-provided HTMX attrs (allow override)
-    for key in ["hx_indicator", "hx_swap", "hx_push_url"]:
+    for key in ["hx_indicator", "hx_swap", "hx_push_url", "hx_sync"]:
         if key in kwargs:
             hx_attrs[key] = kwargs.pop(key)
 
@@ -203,10 +257,138 @@ def InfiniteScroll(
     return Div(content, **attrs)
 
 
+def infinite_cursor(cursor: str | None) -> tuple[Any, ...] | None:
+    """Decode an ``infinite_page`` cursor into the keyset values it encodes.
+
+    Use the values in the next page's query, e.g.
+    ``WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC``.
+
+    Args:
+        cursor: Cursor from the request, or None for the first page
+
+    Returns:
+        Tuple of key values of the last item already shown, or None
+
+    Raises:
+        ValueError: If the cursor was not produced by ``infinite_page``
+    """
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list):
+        msg = f"Invalid infinite scroll cursor: {cursor!r}"
+        raise ValueError(msg)
+    return tuple(values)
+
+
+def infinite_page(
+    items: Iterable[Any],
+    cursor: str | None,
+    render_item: Callable[[Any], Any],
+    page_size: int = 20,
+    *,
+    endpoint: str,
+    key: str | Sequence[str] | Callable[[Any], Any] = "id",
+    descending: bool = False,
+    prefetch: int | None = 600,
+    cursor_param: str = "cursor",
+    **kwargs: Any,
+) -> tuple[Any, ...]:
+    """Render one page of an infinite feed plus the sentinel for the next page.
+
+    Pages are addressed by an opaque keyset cursor (the key of the last item
+    shown) instead of an offset, so page 500 costs the same as page 1. The
+    sentinel is an ``InfiniteScroll`` that replaces itself with the next
+    page, and starts loading it ``prefetch`` pixels before it scrolls into
+    view so the feed does not stall at the bottom.
+
+    Args:
+        items: Items in key order. Either rows already positioned after the
+            cursor (a query filtered with ``infinite_cursor``) or a sorted
+            sequence, which is searched for the cursor position.
+        cursor: Cursor from the request (None for the first page)
+        render_item: Function rendering one item
+        page_size: Items per page
+        endpoint: Feed URL; the next cursor is added as ``cursor_param``
+        key: Field name, field names, or function giving each item's unique,
+            JSON-serializable sort key (add an id as a tie-breaker)
+        descending: Whether items are sorted by descending key
+        prefetch: Pixels before the viewport at which to load the next page
+            (None to wait until the sentinel is revealed)
+        cursor_param: Query param carrying the cursor
+        **kwargs: Additional attributes for the sentinel (e.g. ``content``)
+
+    Returns:
+        Tuple of rendered items, followed by the sentinel when more remain
+
+    Example:
+        >>> @app.get("/feed")
+        >>> def feed(cursor: str | None = None):
+        >>>     after = infinite_cursor(cursor)
+        >>>     rows = db.execute(
+        >>>         "SELECT * FROM posts WHERE id > ? ORDER BY id LIMIT 21",
+        >>>         (after[0] if after else 0,),
+        >>>     )
+        >>>     return infinite_page(rows, cursor, PostCard, 20, endpoint="/feed")
+
+    Note:
+        Only ``page_size + 1`` items are read from iterators, so passing a
+        query with ``LIMIT page_size + 1`` is enough to know whether another
+        page exists. Iterators that start before the cursor are skipped
+        item by item; push the cursor into the query instead.
+    """
+    if page_size < 1:
+        msg = f"page_size must be >= 1, got {page_size}"
+        raise ValueError(msg)
+    keyset = _keyset(key)
+    after = infinite_cursor(cursor)
+
+    def past(item: Any) -> bool:
+        values = keyset(item)
+        return values < after if descending else values > after  # type: ignore[operator]
+
+    rows: Iterable[Any]
+    if after is None:
+        rows = items
+    elif isinstance(items, Sequence) and not isinstance(items, (str, bytes)):
+        # Binary search for the first item past the cursor.
+        lo, hi = 0, len(items)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if past(items[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        rows = items[lo : lo + page_size + 1]
+    else:
+        rows = dropwhile(lambda item: not past(item), items)
+
+    page = list(islice(rows, page_size + 1))
+    rendered = tuple(render_item(item) for item in page[:page_size])
+    if len(page) <= page_size:
+        return rendered
+
+    query = urlencode({cursor_param: _encode_cursor(keyset(page[page_size - 1]))})
+    sentinel = InfiniteScroll(
+        endpoint=f"{endpoint}{'&' if '?' in endpoint else '?'}{query}",
+        target="this",
+        threshold=f"{prefetch}px" if prefetch else "0px",
+        hx_swap=kwargs.pop("hx_swap", "outerHTML"),
+        **kwargs,
+    )
+    return (*rendered, sentinel)
+
+
 def AutoRefresh(
     endpoint: str,
     target: str,
     interval: int = 5000,
+    max_interval: int | None = None,
+    backoff: float = 2.0,
+    pause_hidden: bool | None = None,
     **kwargs: Any,
 ) -> Div:
     """Auto-refreshing content section.
@@ -217,6 +399,14 @@ def AutoRefresh(
         endpoint: Server endpoint to poll (e.g., "/api/metrics")
         target: CSS selector for where to render updates (usually self with "this")
         interval: Milliseconds between requests (default: 5000 = 5 seconds)
+        max_interval: Enables adaptive polling: while the server answers
+            ``304 Not Modified`` the delay grows by ``backoff`` up to this many
+            milliseconds, and resets to ``interval`` after a change
+        backoff: Multiplier applied to the delay after each unchanged response
+        pause_hidden: Skip polls while the browser tab is hidden (needs the
+            Faststrap runtime; no eval'd trigger filter, so it works under a
+            strict CSP). Defaults to on for adaptive polling and off for a
+            fixed interval
         **kwargs: Additional HTML attributes
 
     Returns:
@@ -233,23 +423,43 @@ def AutoRefresh(
         ...     interval=3000
         ... )
 
-        With initial content:
+        Back off to one poll a minute while nothing changes:
         >>> AutoRefresh(
         ...     endpoint="/api/status",
         ...     target="this",
-        ...     interval=5000,
-        ...     content=Div("Loading status...")
+        ...     interval=2000,
+        ...     max_interval=60000,
         ... )
 
     Note:
         Use `target="this"` to replace the AutoRefresh element itself.
         The server should return HTML that will replace the target content.
+        Pair the endpoint with `versioned_response()` so unchanged content is
+        answered with `304` without rendering. Adaptive polling needs the
+        Faststrap runtime from `add_bootstrap(app)`; it sends `If-None-Match`
+        itself, skips the swap on `304`, and stops on HTMX's `286` status.
     """
+    if max_interval is not None and max_interval < interval:
+        msg = f"max_interval must be >= interval ({interval}), got {max_interval}"
+        raise ValueError(msg)
+    if backoff < 1:
+        msg = f"backoff must be >= 1, got {backoff}"
+        raise ValueError(msg)
+
+    if pause_hidden is None:
+        pause_hidden = max_interval is not None
+
+    if max_interval is None:
+        trigger = f"every {interval}ms"
+    else:
+        # The runtime schedules each poll itself so the delay can adapt.
+        trigger = "faststrap:refresh"
+
     # Build HTMX attributes
     hx_attrs = {
         "hx_get": endpoint,
         "hx_target": target,
-        "hx_trigger": f"every {interval}ms",
+        "hx_trigger": trigger,
         "hx_swap": kwargs.pop("hx_swap", "innerHTML"),
     }
 
@@ -270,6 +480,20 @@ def AutoRefresh(
         "cls": all_classes,
         **hx_attrs,
     }
+    if max_interval is None:
+        if pause_hidden:
+            # The runtime cancels the poll on htmx:confirm while the tab is hidden.
+            attrs["data_fs_refresh_hidden"] = "pause"
+    else:
+        attrs.update(
+            {
+                "data_fs_refresh": "true",
+                "data_fs_refresh_interval": str(interval),
+                "data_fs_refresh_max": str(max_interval),
+                "data_fs_refresh_backoff": str(backoff),
+                "data_fs_refresh_hidden": "pause" if pause_hidden else "run",
+            }
+        )
     attrs.update(convert_attrs(kwargs))
 
     return Div(content, **attrs)
@@ -279,6 +503,9 @@ def LazyLoad(
     endpoint: str,
     trigger: str = "revealed",
     placeholder: Any | None = None,
+    batch: str | None = None,
+    key: str | None = None,
+    batch_window: int = 50,
     **kwargs: Any,
 ) -> Div:
     """Lazy-loaded content block.
@@ -289,6 +516,11 @@ def LazyLoad(
         endpoint: Server endpoint to fetch content (e.g., "/api/widget")
         trigger: HTMX trigger event (default: "revealed")
         placeholder: Content to show before loading (default: "Loading...")
+        batch: Batch name; blocks sharing a batch and endpoint are loaded with
+            one request (see `lazy_batch`)
+        key: Fragment key sent to the batch endpoint (required with `batch`)
+        batch_window: Milliseconds to collect revealed blocks before the
+            batch request is sent
         **kwargs: Additional HTML attributes
 
     Returns:
@@ -311,10 +543,41 @@ def LazyLoad(
         ...     placeholder=Button("Load Details")
         ... )
 
+        Load several dashboard widgets with one request:
+        >>> LazyLoad(endpoint="/dashboard/fragments", batch="dashboard", key="revenue")
+        >>> LazyLoad(endpoint="/dashboard/fragments", batch="dashboard", key="signups")
+
     Note:
         Perfect for below-the-fold content, charts, or heavy components.
         The server endpoint should return HTML to replace the placeholder.
+        Batched blocks are loaded by the Faststrap runtime from
+        `add_bootstrap(app)` when revealed (or right away with
+        `trigger="load"`), and their content is swapped into the block.
     """
+    if batch is not None:
+        if not key:
+            msg = "LazyLoad(batch=...) needs a fragment key"
+            raise ValueError(msg)
+        _validate_lazy_name(batch)
+        _validate_lazy_name(key)
+        batch_attrs: dict[str, Any] = {
+            "data_fs_lazy_batch": batch,
+            "data_fs_lazy_key": key,
+            "data_fs_lazy_endpoint": endpoint,
+        }
+        if trigger.strip() == "load":
+            batch_attrs["data_fs_lazy_trigger"] = "load"
+        if batch_window != 50:
+            batch_attrs["data_fs_lazy_window"] = str(batch_window)
+        attrs: dict[str, Any] = {
+            "cls": merge_classes("lazy-load", kwargs.pop("cls", "")),
+            **batch_attrs,
+        }
+        attrs.update(convert_attrs(kwargs))
+        if placeholder is None:
+            placeholder = Div("Loading...", cls="text-center text-muted py-3")
+        return Div(placeholder, **attrs)
+
     # Build HTMX attributes
     hx_attrs = {
         "hx_get": endpoint,
@@ -323,16 +586,16 @@ def LazyLoad(
     }
 
     # Merge with user-provided HTMX attrs
-    for key in ["hx_target", "hx_indicator"]:
-        if key in kwargs:
-            hx_attrs[key] = kwargs.pop(key)
+    for attr in ["hx_target", "hx_indicator"]:
+        if attr in kwargs:
+            hx_attrs[attr] = kwargs.pop(attr)
 
     # Build classes
     user_cls = kwargs.pop("cls", "")
     all_classes = merge_classes("lazy-load", user_cls)
 
     # Build final attributes
-    attrs: dict[str, Any] = {
+    attrs = {
         "cls": all_classes,
         **hx_attrs,
     }
@@ -345,6 +608,76 @@ def LazyLoad(
     return Div(placeholder, **attrs)
 
 
+async def _call_fragment(handler: Callable[..., Any], request: Any) -> Any:
+    if asyncio.iscoroutinefunction(handler):
+        return await handler(request)
+    result = await run_in_threadpool(handler, request)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def lazy_batch(
+    request: Any,
+    handlers: Mapping[str, Callable[..., Any]],
+    *,
+    error: Any = None,
+) -> tuple[Any, ...] | Response:
+    """Render the fragments requested by a batch of ``LazyLoad`` blocks.
+
+    The runtime sends the block keys as repeated ``keys`` params plus the
+    ``batch`` name. Each requested handler is called with the request, all
+    of them concurrently (sync handlers run in the threadpool), and every
+    result is returned as an out-of-band swap into its block, so one
+    response fills the whole batch. Unknown keys are ignored, and a missing
+    or malformed ``batch`` name or key gets a ``400`` without running any
+    handler.
+
+    Args:
+        request: Current request
+        handlers: Mapping of fragment key to a handler taking the request
+        error: Content shown in a block whose handler raised (the exception
+            is logged); defaults to a short "Failed to load." notice
+
+    Returns:
+        Tuple of out-of-band fragments, or a ``400`` response for a bad request
+
+    Example:
+        >>> @app.get("/dashboard/fragments")
+        >>> async def dashboard_fragments(req: Request):
+        >>>     return await lazy_batch(req, {
+        >>>         "revenue": revenue_card,
+        >>>         "signups": signups_chart,
+        >>>     })
+    """
+    params = request.query_params
+    try:
+        batch = _validate_lazy_name(params.get("batch", ""))
+        # Validate every key before any handler runs, so a bad key wastes no work.
+        keys = [
+            _validate_lazy_name(key)
+            for key in dict.fromkeys(params.getlist("keys"))
+            if key in handlers
+        ]
+    except ValueError as exc:
+        return Response(str(exc), status_code=400, media_type="text/plain")
+    results = await asyncio.gather(
+        *(_call_fragment(handlers[key], request) for key in keys),
+        return_exceptions=True,
+    )
+
+    fragments: list[Any] = []
+    for key, result in zip(keys, results, strict=True):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            _logger.error("LazyLoad fragment %r failed", key, exc_info=result)
+            result = error if error is not None else Div("Failed to load.", cls="text-muted small")
+        selector = f'[data-fs-lazy-batch="{batch}"][data-fs-lazy-key="{key}"]'
+        fragments.append(Div(result, hx_swap_oob=f"innerHTML:{selector}"))
+    return tuple(fragments)
+
+
 def LoadingButton(
     *children: Any,
     endpoint: str,
@@ -436,6 +769,7 @@ def OptimisticAction(
     commit_event: str = "faststrap:optimistic:commit",
     rollback_event: str = "faststrap:optimistic:rollback",
     variant: str = "primary",
+    idempotency: bool = False,
     **kwargs: Any,
 ) -> Any:
     """Button preset for optimistic UI updates with explicit rollback contract.
@@ -448,6 +782,15 @@ def OptimisticAction(
     All events dispatch from the button element with bubbling enabled and
     include a detail object:
     `{actionId, endpoint, method, target, payload, reason}`.
+
+    With `idempotency=True` every request carries an
+    `Idempotency-Key: <action_id>:<nonce>` header (also sent as
+    `idempotencyKey` in the event detail). The browser generates the nonce
+    when a request is configured, so cached or shared copies of the markup
+    never share a key. Retries of the same action reuse the key; it is
+    dropped once the server has answered, so the next click is a new action.
+    Pair the route with `@idempotent()` to turn duplicate requests into
+    replays of the first response.
     """
     normalized_method = method.lower()
     if normalized_method not in {"get", "post", "put", "patch", "delete"}:
@@ -468,22 +811,26 @@ def OptimisticAction(
     before_script = _build_optimistic_dispatch_script(
         apply_event,
         {**base_detail, "reason": "before-request"},
+        idempotency=idempotency,
     )
     commit_script = (
         "if(event.detail.successful){"
         + _build_optimistic_dispatch_script(
             commit_event,
             {**base_detail, "reason": "success"},
+            idempotency=idempotency,
         )
         + "}"
     )
     rollback_script = _build_optimistic_dispatch_script(
         rollback_event,
         {**base_detail, "reason": "response-error"},
+        idempotency=idempotency,
     )
     rollback_send_error_script = _build_optimistic_dispatch_script(
         rollback_event,
         {**base_detail, "reason": "network-error"},
+        idempotency=idempotency,
     )
 
     hx_method_attr = f"hx_{normalized_method}"
@@ -495,6 +842,22 @@ def OptimisticAction(
         "hx-on::response-error": rollback_script,
         "hx-on::send-error": rollback_send_error_script,
     }
+    if idempotency:
+        action_js = json.dumps(resolved_action_id)
+        # The key is made in the browser, so cached or shared markup never shares one.
+        hx_attrs["hx-on::config-request"] = (
+            "if(!this.dataset.faststrapIdempotencyKey){"
+            + f'this.dataset.faststrapIdempotencyKey={action_js}+":"+'
+            + "(window.crypto&&crypto.randomUUID?crypto.randomUUID():"
+            + "Math.random().toString(36).slice(2)+Date.now().toString(36));}"
+            + 'event.detail.headers["Idempotency-Key"]=this.dataset.faststrapIdempotencyKey;'
+        )
+        # Drop the key once the server answered; network failures keep it for retries.
+        hx_attrs["hx-on::after-request"] = (
+            commit_script
+            + "if(event.detail.xhr&&event.detail.xhr.status){"
+            + "delete this.dataset.faststrapIdempotencyKey;}"
+        )
 
     if target:
         hx_attrs["hx_target"] = target
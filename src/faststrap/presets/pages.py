@@ -0,0 +1,147 @@
+"""HTMX-aware page rendering.
+
+Routes return only their content; ``@page`` wraps it in the layout for full
+page loads and skips the layout entirely for HTMX partial requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, cast
+
+from fasthtml.common import HttpHeader
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ._cache import _find_request, _require_request_param
+
+# Tags FastHTML moves into <head>, so they must stay outside the layout.
+_HEAD_TAGS = frozenset({"title", "meta", "link", "style", "base"})
+# FastHTML already sends ``Vary`` on these for every non-Response result.
+_FASTHTML_VARY = ("HX-Request", "HX-History-Restore-Request")
+
+
+def _is_partial(request: Request | None) -> bool:
+    if request is None:
+        return False
+    headers = request.headers
+    if "hx-request" not in headers or "hx-history-restore-request" in headers:
+        return False
+    # Boosted links and forms swap the whole body, so they need the shell.
+    return headers.get("hx-boosted") != "true"
+
+
+def _vary_names(value: str | None) -> set[str]:
+    return {name.strip().lower() for name in (value or "").split(",") if name.strip()}
+
+
+def _add_vary(parts: tuple[Any, ...], names: list[str]) -> tuple[Any, ...]:
+    """Add the ``names`` FastHTML does not already send to the ``Vary`` header."""
+    present = _vary_names(", ".join(_FASTHTML_VARY))
+    for part in parts:
+        if isinstance(part, HttpHeader) and part.k.lower() == "vary":
+            present |= _vary_names(str(part.v))
+    missing = [name for name in names if name.lower() not in present]
+    if not missing:
+        return parts
+    for i, part in enumerate(parts):
+        if isinstance(part, HttpHeader) and part.k.lower() == "vary":
+            merged = HttpHeader(part.k, ", ".join([str(part.v), *missing]))
+            return (*parts[:i], merged, *parts[i + 1 :])
+    return (*parts, HttpHeader("Vary", ", ".join(missing)))
+
+
+def page(
+    layout: Callable[..., Any],
+    *,
+    target: str | None = None,
+    context: Callable[[Request], dict[str, Any]] | None = None,
+    **layout_kwargs: Any,
+) -> Callable:
+    """Decorator that applies a layout on full page loads only.
+
+    The route returns just its content. Plain requests, boosted requests and
+    history restores get ``layout(*content, **layout_kwargs)``; other HTMX
+    requests get the content alone, and the layout (and ``context``) is never
+    called. Responses carry a ``Vary`` header on the HTMX request headers so
+    caches keep the two variants apart. The route must take the request
+    (``req: Request``), since that is how full pages are told apart.
+
+    Args:
+        layout: Layout callable, e.g. ``DashboardLayout``.
+        target: Element id the layout swaps page content into. HTMX requests
+            aimed at any other element still get the content alone (never a
+            nested layout), but without ``Title``/``Meta`` and other head
+            tags, so a widget swap does not retitle the page. ``None``
+            (default) treats every HTMX request as a page swap.
+        context: Function returning extra layout kwargs for a request (e.g. the
+            user menu or sidebar counts); only called for full pages.
+        **layout_kwargs: Static layout kwargs.
+
+    Returns:
+        Decorator function
+
+    Example:
+        >>> @app.get("/orders")
+        >>> @page(DashboardLayout, title="Orders", sidebar_items=NAV,
+        >>>       context=lambda req: {"user": UserMenu(req.session["user"])})
+        >>> def orders(req: Request):
+        >>>     return Title("Orders"), OrdersTable(load_orders())
+
+    Note:
+        ``Title``, ``Meta``, ``Link``, ``Style`` and ``Base`` tags and
+        ``HttpHeader`` items stay outside the layout. ``Response`` objects are
+        returned as-is apart from the ``Vary`` header.
+
+    Raises:
+        TypeError: If the decorated route has no request parameter.
+    """
+    vary = [*_FASTHTML_VARY, "HX-Boosted"]
+    if target is not None:
+        vary.append("HX-Target")
+
+    def render(request: Request | None, result: Any) -> Any:
+        if isinstance(result, Response):
+            present = _vary_names(result.headers.get("vary"))
+            for name in vary:
+                if name.lower() not in present:
+                    result.headers.add_vary_header(name)
+            return result
+        parts = tuple(result) if isinstance(result, (list, tuple)) else (result,)
+        if _is_partial(request):
+            hx_target = cast(Request, request).headers.get("hx-target")
+            if target is not None and hx_target != target:
+                parts = tuple(p for p in parts if getattr(p, "tag", "") not in _HEAD_TAGS)
+        else:
+            kept: list[Any] = []
+            content: list[Any] = []
+            for part in parts:
+                if isinstance(part, HttpHeader) or getattr(part, "tag", "") in _HEAD_TAGS:
+                    kept.append(part)
+                else:
+                    content.append(part)
+            kwargs = dict(layout_kwargs)
+            if context is not None and request is not None:
+                kwargs.update(context(request))
+            parts = (*kept, layout(*content, **kwargs))
+        return _add_vary(parts, vary)
+
+    def decorator(func: Callable) -> Callable:
+        _require_request_param(func, "page")
+
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await func(*args, **kwargs)
+            return render(_find_request(args, kwargs), result)
+
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = func(*args, **kwargs)
+            return render(_find_request(args, kwargs), result)
+
+        wrapper = async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        return cast(Callable, wrapper)
+
+    return decorator
@@ -4,10 +4,15 @@ Utilities for setting HTMX response headers and creating common response pattern
 These helpers eliminate boilerplate for HTMX server-side interactions.
 """
 
+import asyncio
 import json
 import re
-from typing import Any
+from collections.abc import Callable
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, cast
 
+from fasthtml.common import Div, to_xml
 from starlette.responses import Response
 
 from ..components.feedback.toast import Toast
@@ -258,3 +263,169 @@ def toast_response(
     if isinstance(content, (list, tuple)):
         return (*content, toast)
     return (content, toast)
+
+
+class ToastBatch:
+    """Collects toast notices for one response and renders them as one OOB block.
+
+    Identical notices (same message and variant) are merged into one toast
+    with a count, and at most ``max_toasts`` toasts are shown; the rest are
+    summarized in a final "+N more" toast.
+
+    Args:
+        max_toasts: Maximum number of toasts rendered, including the summary
+        toast_id: ID of the ``ToastContainer`` element
+        **toast_kwargs: Additional ``Toast`` kwargs applied to every toast
+
+    Example:
+        >>> batch = ToastBatch(max_toasts=3)
+        >>> for row in rows:
+        >>>     if not valid(row):
+        >>>         batch.add("Row failed validation", "danger",
+        >>>                   plural="{count} rows failed validation")
+        >>> return (ImportSummary(rows), batch.render())
+    """
+
+    def __init__(
+        self, *, max_toasts: int = 3, toast_id: str = "toast-container", **toast_kwargs: Any
+    ) -> None:
+        if max_toasts < 1:
+            msg = f"max_toasts must be >= 1, got {max_toasts}"
+            raise ValueError(msg)
+        self.max_toasts = max_toasts
+        self.toast_id = toast_id
+        self.toast_kwargs = toast_kwargs
+        # (message, variant) -> [count, plural], in first-seen order.
+        self._notices: dict[tuple[str, str], list[Any]] = {}
+
+    def __len__(self) -> int:
+        return sum(count for count, _ in self._notices.values())
+
+    def add(self, message: str, variant: str = "info", *, plural: str | None = None) -> None:
+        """Record a notice; repeats are merged into one toast with a count.
+
+        Args:
+            message: Toast message text
+            variant: Toast variant (success, danger, warning, info)
+            plural: Message used when the notice repeats, formatted with
+                ``{count}`` (default: ``"<message> (×<count>)"``)
+        """
+        entry = self._notices.setdefault((message, variant), [0, plural])
+        entry[0] += 1
+        if plural is not None:
+            entry[1] = plural
+
+    def toasts(self) -> list[Any]:
+        """Return the ``Toast`` components for the collected notices."""
+        rendered: list[Any] = []
+        for (message, variant), (count, plural) in self._notices.items():
+            if count > 1:
+                message = plural.format(count=count) if plural else f"{message} (\u00d7{count})"
+            rendered.append(Toast(message, variant=variant, **self.toast_kwargs))  # type: ignore[arg-type]
+        if len(rendered) > self.max_toasts:
+            hidden = rendered[self.max_toasts - 1 :]
+            rendered = rendered[: self.max_toasts - 1]
+            rendered.append(Toast(f"+{len(hidden)} more notifications", **self.toast_kwargs))
+        return rendered
+
+    def render(self) -> Any | None:
+        """Return one ``hx-swap-oob`` block holding every toast, or None if empty."""
+        toasts = self.toasts()
+        if not toasts:
+            return None
+        return Div(*toasts, hx_swap_oob=f"afterbegin:#{self.toast_id}")
+
+
+_TOAST_BATCH: ContextVar[ToastBatch | None] = ContextVar("faststrap_toast_batch", default=None)
+
+
+def notify(message: str, variant: str = "info", *, plural: str | None = None) -> None:
+    """Add a toast notice to the current ``@toast_batch`` response.
+
+    Callable from anywhere the handler reaches (helpers, services, loops),
+    so notices do not have to be threaded back through return values.
+
+    Raises:
+        RuntimeError: If no ``@toast_batch`` route is running
+    """
+    batch = _TOAST_BATCH.get()
+    if batch is None:
+        msg = "notify() needs a route decorated with @toast_batch()"
+        raise RuntimeError(msg)
+    batch.add(message, variant, plural=plural)
+
+
+def _with_toasts(result: Any, block: Any | None) -> Any:
+    if block is None:
+        return result
+    if isinstance(result, Response):
+        body = getattr(result, "body", None)
+        if not isinstance(body, bytes) or not (result.media_type or "").startswith("text/html"):
+            return result
+        headers = {k: v for k, v in result.headers.items() if k.lower() != "content-length"}
+        return Response(
+            body + to_xml(block).encode("utf-8"),
+            status_code=result.status_code,
+            headers=headers,
+            media_type=result.media_type,
+        )
+    if isinstance(result, (list, tuple)):
+        return (*result, block)
+    return (result, block)
+
+
+def toast_batch(
+    *, max_toasts: int = 3, toast_id: str = "toast-container", **toast_kwargs: Any
+) -> Callable:
+    """Decorator that gives a route a request-scoped ``ToastBatch``.
+
+    Notices added with ``notify()`` while the handler runs are merged,
+    capped and appended to the response as a single out-of-band block for
+    the ``ToastContainer``.
+
+    Args:
+        max_toasts: Maximum number of toasts rendered, including the summary
+        toast_id: ID of the ``ToastContainer`` element
+        **toast_kwargs: Additional ``Toast`` kwargs applied to every toast
+
+    Returns:
+        Decorator function
+
+    Example:
+        >>> @app.post("/import")
+        >>> @toast_batch(max_toasts=3)
+        >>> def import_rows(req: Request, file: UploadFile):
+        >>>     for row in parse(file):
+        >>>         save_row(row)  # calls notify("Row failed validation", "danger")
+        >>>     notify("Import finished", "success")
+        >>>     return ImportSummary()
+
+    Note:
+        Non-HTML responses (redirects, JSON) are returned unchanged.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            batch = ToastBatch(max_toasts=max_toasts, toast_id=toast_id, **toast_kwargs)
+            token = _TOAST_BATCH.set(batch)
+            try:
+                result = await func(*args, **kwargs)
+            finally:
+                _TOAST_BATCH.reset(token)
+            return _with_toasts(result, batch.render())
+
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            batch = ToastBatch(max_toasts=max_toasts, toast_id=toast_id, **toast_kwargs)
+            token = _TOAST_BATCH.set(batch)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _TOAST_BATCH.reset(token)
+            return _with_toasts(result, batch.render())
+
+        wrapper = async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        return cast(Callable, wrapper)
+
+    return decorator
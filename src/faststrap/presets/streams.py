@@ -2,11 +2,61 @@
 
 from __future__ import annotations
 
+import asyncio
+import importlib
+import inspect
 import json
-from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
-from typing import Any
+import threading
+from collections import Counter, deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Hashable, Iterable, Iterator
+from contextlib import suppress
+from itertools import chain, islice
+from typing import Any, Literal
 
+from fasthtml.common import FT, to_xml
+from starlette.concurrency import iterate_in_threadpool
+from starlette.requests import Request
 from starlette.responses import StreamingResponse
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from ._cache import TTLCache
+
+_DISCONNECT_POLL_SECONDS = 0.5
+_RESYNC_EVENT = "resync"
+
+
+_FRAGMENTS: TTLCache[str] = TTLCache(max_entries=256, ttl=None)
+_KEY_LEAVES = (int, float, bool, type(None))
+
+
+def _fragment_key(node: Any) -> Hashable:
+    """Return a key describing ``node``'s content (TypeError when it has no safe key)."""
+    if isinstance(node, FT):
+        return (
+            node.tag,
+            tuple(_fragment_key(child) for child in node.children),
+            tuple((name, _fragment_key(value)) for name, value in node.attrs.items()),
+        )
+    if type(node) is str:
+        return node
+    if type(node) in _KEY_LEAVES:
+        # Keep the type so 1, 1.0 and True do not share a rendering.
+        return (type(node), node)
+    # Other objects may render differently over time, so they are not cached.
+    raise TypeError(type(node).__name__)
+
+
+def _render_fragment(component: Any) -> str:
+    """Render ``component`` to compact HTML, reusing renders of identical content."""
+    try:
+        key = _fragment_key(component)
+    except TypeError:
+        return str(to_xml(component, indent=False))
+    html = _FRAGMENTS.get(key)
+    if html is None:
+        html = str(to_xml(component, indent=False))
+        _FRAGMENTS.set(key, html)
+    return html
 
 
 def sse_event(
@@ -16,7 +66,15 @@ def sse_event(
     event_id: str | None = None,
     retry: int | None = None,
 ) -> dict[str, Any]:
-    """Build a normalized SSE event payload dict."""
+    """Build a normalized SSE event payload dict.
+
+    FastHTML components in ``data`` are rendered to HTML here, once, so the
+    payload can be sent to many streams. Identical fragments (e.g. an
+    unchanged KPI card rebuilt on every tick) are served from a small
+    content-keyed cache instead of being serialized again.
+    """
+    if isinstance(data, FT):
+        data = _render_fragment(data)
     return {
         "data": data,
         "event": event,
@@ -30,60 +88,272 @@ def sse_comment(text: str = "keep-alive") -> dict[str, Any]:
     return {"comment": text}
 
 
-def _format_sse_event(payload: dict[str, Any]) -> str:
+def _load_orjson() -> Any:
+    try:
+        return importlib.import_module("orjson")
+    except ImportError:
+        return None
+
+
+_orjson = _load_orjson()
+
+
+def _json_data(data: Any) -> str | bytes:
+    if _orjson is not None:
+        try:
+            return bytes(_orjson.dumps(data, default=str, option=_orjson.OPT_NON_STR_KEYS))
+        except TypeError:
+            pass
+    return json.dumps(data, default=str)
+
+
+def _data_lines(text: str) -> str:
+    """Return ``text`` as ``data:`` lines, splitting on SSE line breaks."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if text.endswith("\n"):
+        text = text[:-1]
+    return "data: " + text.replace("\n", "\ndata: ") + "\n"
+
+
+def _data_lines_bytes(raw: bytes) -> bytes:
+    if b"\r" in raw:
+        raw = raw.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    if raw.endswith(b"\n"):
+        raw = raw[:-1]
+    return b"data: " + raw.replace(b"\n", b"\ndata: ") + b"\n"
+
+
+def _format_sse_event(payload: dict[str, Any]) -> bytes:
     if "comment" in payload:
-        comment = payload.get("comment", "")
-        lines = str(comment).splitlines() or [""]
-        return "\n".join(f": {line}" for line in lines) + "\n\n"
+        lines = str(payload.get("comment", "")).splitlines() or [""]
+        return ("\n".join(f": {line}" for line in lines) + "\n\n").encode("utf-8")
 
-    data = payload.get("data", "")
+    head = ""
     event = payload.get("event")
+    if event:
+        head = f"event: {event}\n"
     event_id = payload.get("id")
+    if event_id:
+        head += f"id: {event_id}\n"
     retry = payload.get("retry")
+    if retry is not None:
+        head += f"retry: {int(retry)}\n"
 
-    if isinstance(data, (dict, list, tuple)):
-        data_str = json.dumps(data, default=str)
-    else:
-        data_str = "" if data is None else str(data)
+    data = payload.get("data", "")
+    if type(data) is not str and type(data) is not bytes:
+        if isinstance(data, (dict, list, tuple)):
+            data = _json_data(data)
+        elif isinstance(data, FT):
+            data = _render_fragment(data)
+        elif isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        elif data is None:
+            data = ""
+        elif not isinstance(data, (str, bytes)):
+            data = str(data)
+    if type(data) is bytes:
+        # Pre-serialized bytes (e.g. ``orjson.dumps(...)``) are sent as-is.
+        if b"\n" in data or b"\r" in data:
+            return head.encode("utf-8") + _data_lines_bytes(data) + b"\n"
+        return b"%sdata: %s\n\n" % (head.encode("utf-8"), data)
+    if "\n" in data or "\r" in data:
+        return (head + _data_lines(data) + "\n").encode("utf-8")
+    # Fast path: single-line text is one concatenation and one encode.
+    return f"{head}data: {data}\n\n".encode()
 
-    lines = data_str.splitlines() or [""]
-    parts: list[str] = []
-    if event:
-        parts.append(f"event: {event}")
-    if event_id:
-        parts.append(f"id: {event_id}")
-    if retry is not None:
-        parts.append(f"retry: {int(retry)}")
-    parts.extend(f"data: {line}" for line in lines)
-    return "\n".join(parts) + "\n\n"
+
+def _encode_sse(item: Any) -> bytes:
+    # Pre-formatted frames (e.g. from SSEBroker) pass through untouched.
+    if isinstance(item, (bytes, bytearray)):
+        return bytes(item)
+    return _format_sse_event(item if isinstance(item, dict) else {"data": item})
 
 
-def _iter_sse(events: Iterable[Any]) -> Iterator[str]:
+def _iter_sse(events: Iterable[Any]) -> Iterator[bytes]:
     for item in events:
-        payload = item if isinstance(item, dict) else {"data": item}
-        yield _format_sse_event(payload)
+        yield _encode_sse(item)
 
 
-async def _aiter_sse(events: AsyncIterable[Any]) -> AsyncIterator[str]:
-    async for item in events:
-        payload = item if isinstance(item, dict) else {"data": item}
-        yield _format_sse_event(payload)
+async def _aiter_sse(events: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    try:
+        async for item in events:
+            yield _encode_sse(item)
+    finally:
+        # Close the source right away so subscriptions end with the response.
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def _as_async(events: Iterable[Any] | AsyncIterable[Any]) -> AsyncIterator[Any]:
+    if isinstance(events, AsyncIterable):
+        return aiter(events)
+    return iterate_in_threadpool(events)
+
+
+_END = object()
+
+
+class _SourcePump:
+    """Reads an event source from one long-lived task into a one-slot queue.
+
+    Every step of the source runs in the same task, so async generators may
+    hold cancel scopes, task groups or context variables across ``yield``
+    while the consumer races ``next()`` against its own timers.
+    """
+
+    def __init__(self, events: Iterable[Any] | AsyncIterable[Any]) -> None:
+        self._events = events
+        self._queue: asyncio.Queue[tuple[Any, BaseException | None]] = asyncio.Queue(maxsize=1)
+        self._task = asyncio.ensure_future(self._run(_as_async(events)))
+        self._get: asyncio.Future[tuple[Any, BaseException | None]] | None = None
+
+    async def _run(self, source: AsyncIterator[Any]) -> None:
+        try:
+            async for item in source:
+                await self._queue.put((item, None))
+            await self._queue.put((_END, None))
+        except Exception as exc:
+            await self._queue.put((_END, exc))
+        finally:
+            # Close the source here, in the task that iterated it.
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def next(self, timeout: float | None) -> tuple[bool, Any]:
+        """Return ``(True, item)``, or ``(False, None)`` if ``timeout`` passes first.
+
+        Raises ``StopAsyncIteration`` when the source is exhausted and
+        re-raises the source's own errors.
+        """
+        if self._get is None:
+            self._get = asyncio.ensure_future(self._queue.get())
+        done, _ = await asyncio.wait({self._get}, timeout=timeout)
+        if not done:
+            return False, None
+        item, error = self._get.result()
+        self._get = None
+        if item is _END:
+            if error is not None:
+                raise error
+            raise StopAsyncIteration
+        return True, item
+
+    async def aclose(self) -> None:
+        """Stop the source now instead of at its next yield."""
+        for future in (self._get, self._task):
+            if future is not None:
+                future.cancel()
+                with suppress(BaseException):
+                    await future
+        close = getattr(self._events, "close", None)
+        if close is not None and not isinstance(self._events, AsyncIterable):
+            # A worker thread may still be inside the generator.
+            with suppress(ValueError):
+                close()
+
+
+async def _live_sse(
+    events: Iterable[Any] | AsyncIterable[Any],
+    *,
+    heartbeat: float | None,
+    request: Request | None,
+) -> AsyncIterator[bytes]:
+    """Relay ``events`` while sending keep-alive pings and watching the client."""
+    pump = _SourcePump(events)
+    ping = _format_sse_event(sse_comment())
+    loop = asyncio.get_running_loop()
+    last_sent = loop.time()
+    try:
+        while True:
+            waits = [_DISCONNECT_POLL_SECONDS] if request is not None else []
+            if heartbeat is not None:
+                waits.append(max(0.0, last_sent + heartbeat - loop.time()))
+            try:
+                received, item = await pump.next(min(waits))
+            except StopAsyncIteration:
+                return
+            if received:
+                yield _encode_sse(item)
+                last_sent = loop.time()
+                continue
+            if request is not None and await request.is_disconnected():
+                return
+            if heartbeat is not None and loop.time() - last_sent >= heartbeat:
+                yield ping
+                last_sent = loop.time()
+    finally:
+        await pump.aclose()
+
+
+def _request_last_event_id(request: Request | None) -> str | None:
+    """Return the ``Last-Event-ID`` header, or the ``last_event_id`` query param.
+
+    ``SSETarget`` sends the query param when it reconnects itself.
+    """
+    if request is None:
+        return None
+    return request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+
+
+async def _prepend_frames(frames: list[bytes], events: AsyncIterable[Any]) -> AsyncIterator[Any]:
+    iterator = events.__aiter__()
+    try:
+        for frame in frames:
+            yield frame
+        async for item in iterator:
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
 
 
 def SSEStream(
     events: Iterable[Any] | AsyncIterable[Any],
     *,
     headers: dict[str, str] | None = None,
+    heartbeat: float | None = None,
+    request: Request | None = None,
+    history: SSEEventLog | None = None,
+    topic: str | None = None,
 ) -> StreamingResponse:
     """Create a StreamingResponse for Server-Sent Events (SSE).
 
     Args:
-        events: Iterable or async iterable of SSE payloads.
+        events: Iterable or async iterable of SSE payloads. ``bytes`` items
+            are treated as already formatted frames and sent as-is.
         headers: Optional extra headers.
+        heartbeat: Seconds of silence before a ``: keep-alive`` comment is
+            sent, so proxies do not close idle connections (default: off).
+            Sync sources are then read in the threadpool.
+        request: The current request. When given, the stream polls for a
+            client disconnect and closes ``events`` straight away, freeing
+            workers and DB cursors held by the generator.
+        history: Event log that ``events`` records its frames in (see
+            ``SSEEventLog.record``). A reconnecting client's ``Last-Event-ID``
+            (read from ``request``) gets the frames it missed, or a ``resync``
+            event, before ``events`` starts.
+        topic: Topic of ``history`` this stream replays (required with it).
 
     Returns:
         StreamingResponse configured for text/event-stream.
     """
+    if heartbeat is not None and heartbeat <= 0:
+        msg = f"heartbeat must be > 0, got {heartbeat}"
+        raise ValueError(msg)
+    if history is not None:
+        if topic is None:
+            msg = "SSEStream(history=...) needs the topic to replay"
+            raise ValueError(msg)
+        backlog = history.replay(topic, _request_last_event_id(request))
+        if backlog:
+            if isinstance(events, AsyncIterable):
+                events = _prepend_frames(backlog, events)
+            else:
+                events = chain(backlog, events)
     base_headers = {
         "Cache-Control": "no-cache",
         "Connection": "keep-alive",
@@ -92,10 +362,598 @@ def SSEStream(
     if headers:
         base_headers.update(headers)
 
-    body_iter: Iterable[str] | AsyncIterator[str]
-    if isinstance(events, AsyncIterable):
+    body_iter: Iterable[bytes] | AsyncIterator[bytes]
+    if heartbeat is not None or request is not None:
+        body_iter = _live_sse(events, heartbeat=heartbeat, request=request)
+    elif isinstance(events, AsyncIterable):
         body_iter = _aiter_sse(events)
     else:
         body_iter = _iter_sse(events)
 
     return StreamingResponse(body_iter, media_type="text/event-stream", headers=base_headers)
+
+
+def _throttle_key(per_key: str | Callable[[Any], Hashable] | None) -> Callable[[Any], Hashable]:
+    if per_key is None:
+        return lambda payload: None
+    if callable(per_key):
+        return per_key
+    return lambda payload: payload.get(per_key) if isinstance(payload, dict) else None
+
+
+async def sse_throttle(
+    events: Iterable[Any] | AsyncIterable[Any],
+    *,
+    per_key: str | Callable[[Any], Hashable] | None = "event",
+    interval: float = 0.25,
+) -> AsyncIterator[Any]:
+    """Coalesce a high-frequency event source to at most one batch per ``interval``.
+
+    Within each window only the latest payload per key is kept; when the
+    window closes the kept payloads are yielded together, in the order their
+    keys first appeared. The first event after a quiet period goes out
+    immediately, and pending payloads are flushed on time even when the
+    source goes idle. Comments pass straight through.
+
+    Args:
+        events: Sync or async iterable of SSE payloads (sync sources are read
+            in the threadpool).
+        per_key: Payload dict key to coalesce by (``"event"`` keeps the
+            latest event of each name), a callable returning the key, or
+            None to keep only the latest payload overall.
+        interval: Window length in seconds (0.25 gives about 4 updates per
+            second per key).
+
+    Returns:
+        Async iterator of payloads, ready to pass to ``SSEStream``.
+
+    Example:
+        >>> @app.get("/metrics/stream")
+        >>> async def metrics_stream(req: Request):
+        >>>     return SSEStream(sse_throttle(kpi_updates(), interval=0.25), request=req)
+    """
+    if interval <= 0:
+        msg = f"interval must be > 0, got {interval}"
+        raise ValueError(msg)
+    key_of = _throttle_key(per_key)
+    pump = _SourcePump(events)
+    loop = asyncio.get_running_loop()
+    latest: dict[Hashable, Any] = {}
+    flush_at = loop.time()
+    try:
+        while True:
+            timeout = max(0.0, flush_at - loop.time()) if latest else None
+            try:
+                received, item = await pump.next(timeout)
+            except StopAsyncIteration:
+                break
+            if received:
+                if _is_comment(item):
+                    yield item
+                    continue
+                latest[key_of(item)] = item
+            if latest and loop.time() >= flush_at:
+                batch = list(latest.values())
+                latest.clear()
+                for payload in batch:
+                    yield payload
+                flush_at = loop.time() + interval
+        for payload in latest.values():
+            yield payload
+    finally:
+        await pump.aclose()
+
+
+def _is_comment(payload: Any) -> bool:
+    return isinstance(payload, dict) and "comment" in payload
+
+
+class SSEEventLog:
+    """Per-topic ring buffer of SSE frames with monotonically increasing ids.
+
+    ``record`` stamps each event with its topic's next ``id:`` (1, 2, 3, ...)
+    and keeps the last ``size`` frames. The log owns the ids, so an
+    ``event_id`` passed to ``sse_event`` is replaced. When a client
+    reconnects with ``Last-Event-ID``, ``replay`` returns the frames it
+    missed, or a single ``resync`` event when they are no longer buffered.
+    Comments are never logged.
+
+    Args:
+        size: Frames kept per topic.
+
+    Example:
+        >>> log = SSEEventLog(size=500)
+        >>> frame = log.record("orders", sse_event(row_html, event="order"))
+        >>> log.replay("orders", request.headers.get("last-event-id"))
+    """
+
+    def __init__(self, size: int = 1000) -> None:
+        if size < 1:
+            msg = f"size must be >= 1, got {size}"
+            raise ValueError(msg)
+        self.size = size
+        self._lock = threading.Lock()
+        self._frames: dict[str, deque[tuple[int, bytes]]] = {}
+        self._last_ids: dict[str, int] = {}
+
+    def last_id(self, topic: str) -> int:
+        """Return the id of the newest event recorded on ``topic`` (0 if none)."""
+        with self._lock:
+            return self._last_ids.get(topic, 0)
+
+    def record(self, topic: str, payload: Any) -> bytes:
+        """Format ``payload`` with the topic's next id, log it, and return the frame."""
+        if _is_comment(payload):
+            return _encode_sse(payload)
+        return self._stamp(topic, _encode_sse(_without_id(payload)))
+
+    def _stamp(self, topic: str, body: bytes) -> bytes:
+        with self._lock:
+            event_id = self._last_ids.get(topic, 0) + 1
+            self._last_ids[topic] = event_id
+            frame = b"id: %d\n" % event_id + body
+            frames = self._frames.get(topic)
+            if frames is None:
+                frames = self._frames[topic] = deque(maxlen=self.size)
+            frames.append((event_id, frame))
+        return frame
+
+    def replay(self, topic: str, last_event_id: str | int | None) -> list[bytes]:
+        """Return the frames recorded on ``topic`` after ``last_event_id``.
+
+        Returns an empty list when ``last_event_id`` is None (a fresh
+        connection), and a single ``resync`` event (whose id is the newest
+        id) when the missed events have left the buffer or the id is unknown,
+        e.g. after a server restart. Clients should reload their state when
+        they receive ``resync``.
+        """
+        if last_event_id is None or last_event_id == "":
+            return []
+        try:
+            last = int(last_event_id)
+        except ValueError:
+            last = -1
+        with self._lock:
+            newest = self._last_ids.get(topic, 0)
+            frames = self._frames.get(topic, ())
+            oldest = frames[0][0] if frames else newest + 1
+            if 0 <= last <= newest and last >= oldest - 1:
+                return [frame for _, frame in islice(frames, last - oldest + 1, None)]
+        resync = sse_event("", event=_RESYNC_EVENT, event_id=str(newest))
+        return [_encode_sse(resync)]
+
+    def clear(self, topic: str | None = None) -> None:
+        """Drop buffered frames for ``topic`` (or every topic); ids keep increasing."""
+        with self._lock:
+            if topic is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(topic, None)
+
+
+def _without_id(payload: Any) -> Any:
+    if isinstance(payload, dict) and payload.get("id") is not None:
+        return {**payload, "id": None}
+    return payload
+
+
+SSEOverflowPolicy = Literal["drop-oldest", "drop-newest", "coalesce", "disconnect"]
+
+_OVERFLOW_POLICIES = ("drop-oldest", "drop-newest", "coalesce", "disconnect")
+
+
+class _Subscriber:
+    """One connected client: a bounded frame queue plus a wake-up event on its loop."""
+
+    __slots__ = ("closed", "event", "lock", "loop", "max_queue", "named", "policy", "queue")
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        max_queue: int | None,
+        policy: SSEOverflowPolicy,
+        named: bool = False,
+    ) -> None:
+        self.loop = loop
+        # Multiplexed subscribers receive frames renamed to their topic.
+        self.named = named
+        self.max_queue = max_queue
+        self.policy = policy
+        self.queue: deque[tuple[str | None, bytes]] = deque()
+        self.lock = threading.Lock()
+        self.event = asyncio.Event()
+        self.closed = False
+
+    def push(
+        self, name: str | None, frame: bytes, running: asyncio.AbstractEventLoop | None
+    ) -> int:
+        """Queue ``frame`` and return how many frames were dropped to bound the queue."""
+        with self.lock:
+            if self.closed:
+                return 0
+            dropped = self._enqueue(name, frame)
+        if self.loop is running:
+            self.event.set()
+            return dropped
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            # The subscriber's loop has already shut down.
+            pass
+        return dropped
+
+    def _enqueue(self, name: str | None, frame: bytes) -> int:
+        queue = self.queue
+        if self.policy == "coalesce" and name is not None:
+            # A newer event of the same name supersedes the undelivered one.
+            for index in range(len(queue) - 1, -1, -1):
+                if queue[index][0] == name:
+                    del queue[index]
+                    queue.append((name, frame))
+                    return 1
+        if self.max_queue is None or len(queue) < self.max_queue:
+            queue.append((name, frame))
+            return 0
+        if self.policy == "drop-newest":
+            return 1
+        if self.policy == "disconnect":
+            dropped = len(queue) + 1
+            queue.clear()
+            self.closed = True
+            return dropped
+        queue.popleft()
+        queue.append((name, frame))
+        return 1
+
+    def pop(self) -> bytes | None:
+        with self.lock:
+            return self.queue.popleft()[1] if self.queue else None
+
+
+def _named_frame(frame: bytes, topic: str) -> bytes:
+    """Return ``frame`` with its ``event:`` name replaced by ``topic``."""
+    if frame.startswith(b":"):
+        return frame
+    lines = [line for line in frame.split(b"\n") if not line.startswith(b"event:")]
+    return b"event: " + topic.encode("utf-8") + b"\n" + b"\n".join(lines)
+
+
+class SSEBroker:
+    """In-process SSE hub that formats each published event once per topic.
+
+    ``publish`` turns the payload into SSE bytes a single time and hands the
+    same bytes object to every subscriber, so fan-out cost does not grow with
+    rendering work. ``publish`` is safe to call from sync routes or worker
+    threads as well as from async code.
+
+    Every subscriber has its own queue bounded by ``max_queue``, so a slow
+    client cannot grow server memory without limit. When a queue is full the
+    ``overflow`` policy decides what happens:
+
+    - ``"drop-oldest"``: discard the oldest undelivered frame (default).
+    - ``"drop-newest"``: discard the frame being published.
+    - ``"coalesce"``: a new event replaces any undelivered event with the
+      same ``event`` name (latest state wins); otherwise the oldest frame
+      is dropped.
+    - ``"disconnect"``: end the slow client's stream; ``EventSource``
+      reconnects and starts from fresh state.
+
+    With ``history``, published events get increasing ``id:`` values and a
+    reconnecting client receives the events it missed (see ``SSEEventLog``).
+
+    Args:
+        max_queue: Maximum undelivered frames per subscriber (None for unbounded).
+        overflow: Policy applied when a subscriber's queue is full.
+        history: ``SSEEventLog``, or the number of events to keep per topic
+            for ``Last-Event-ID`` replay (None to disable).
+
+    ``multiplex`` merges several topics into one stream whose events are
+    named after their topic, so one ``EventSource`` can feed many widgets.
+
+    Example:
+        >>> broker = SSEBroker(max_queue=64, overflow="coalesce")
+        >>>
+        >>> @app.get("/dashboard/stream")
+        >>> async def dashboard_stream():
+        >>>     return broker.stream("dashboard")
+        >>>
+        >>> broker.publish("dashboard", sse_event(render_stats(), event="stats"))
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue: int | None = 256,
+        overflow: SSEOverflowPolicy = "drop-oldest",
+        history: int | SSEEventLog | None = None,
+    ) -> None:
+        if max_queue is not None and max_queue < 1:
+            msg = f"max_queue must be >= 1, got {max_queue}"
+            raise ValueError(msg)
+        if overflow not in _OVERFLOW_POLICIES:
+            msg = f"overflow must be one of {', '.join(_OVERFLOW_POLICIES)}, got {overflow!r}"
+            raise ValueError(msg)
+        self.max_queue = max_queue
+        self.overflow: SSEOverflowPolicy = overflow
+        self.history = SSEEventLog(history) if isinstance(history, int) else history
+        self._lock = threading.Lock()
+        self._topics: dict[str, set[_Subscriber]] = {}
+        self._dropped: Counter[str] = Counter()
+        self._disconnected: Counter[str] = Counter()
+
+    def subscriber_count(self, topic: str | None = None) -> int:
+        """Return the number of subscribers on ``topic`` (or on every topic)."""
+        with self._lock:
+            if topic is not None:
+                return len(self._topics.get(topic, ()))
+            return len(set().union(*self._topics.values()))
+
+    def stats(self, topic: str | None = None) -> dict[str, int]:
+        """Return queue metrics for ``topic`` (or for every topic).
+
+        Keys: ``subscribers``, ``queued`` (undelivered frames across
+        subscribers), ``max_depth`` (deepest subscriber queue), ``dropped``
+        (frames discarded by the overflow policy) and ``disconnected``
+        (subscribers ended by the ``"disconnect"`` policy). Drop counters are
+        cumulative for the broker's lifetime.
+        """
+        with self._lock:
+            if topic is None:
+                subscribers = list(set().union(*self._topics.values()))
+                dropped = sum(self._dropped.values())
+                disconnected = sum(self._disconnected.values())
+            else:
+                subscribers = list(self._topics.get(topic, ()))
+                dropped = self._dropped[topic]
+                disconnected = self._disconnected[topic]
+        depths = [len(subscriber.queue) for subscriber in subscribers]
+        return {
+            "subscribers": len(subscribers),
+            "queued": sum(depths),
+            "max_depth": max(depths, default=0),
+            "dropped": dropped,
+            "disconnected": disconnected,
+        }
+
+    def publish(self, topic: str, payload: Any) -> int:
+        """Format ``payload`` once and queue it for every subscriber of ``topic``.
+
+        ``payload`` may be an ``sse_event``/``sse_comment`` dict, plain data
+        (sent as ``data:``), or already formatted ``bytes``. Returns the
+        number of subscribers the event was queued for (subscribers dropped
+        by the ``"disconnect"`` policy are not counted). With ``history``,
+        events are logged even when nobody is subscribed.
+        """
+        if self.history is not None and not _is_comment(payload):
+            body = _encode_sse(_without_id(payload))
+            # Stamp and snapshot together so a joining subscriber gets each
+            # event exactly once, either replayed or pushed.
+            with self._lock:
+                frame = self.history._stamp(topic, body)
+                subscribers = tuple(self._topics.get(topic, ()))
+            if not subscribers:
+                return 0
+        else:
+            with self._lock:
+                subscribers = tuple(self._topics.get(topic, ()))
+            if not subscribers:
+                return 0
+            frame = _encode_sse(payload)
+
+        name = payload.get("event") if isinstance(payload, dict) else None
+        try:
+            running: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        named: bytes | None = None
+        queued = dropped = disconnected = 0
+        for subscriber in subscribers:
+            if subscriber.closed:
+                continue
+            if subscriber.named:
+                # Renamed once per publish and shared by multiplexed subscribers.
+                if named is None:
+                    named = _named_frame(frame, topic)
+                dropped += subscriber.push(topic, named, running)
+            else:
+                dropped += subscriber.push(name, frame, running)
+            if subscriber.closed:
+                disconnected += 1
+            else:
+                queued += 1
+        if dropped:
+            with self._lock:
+                self._dropped[topic] += dropped
+                self._disconnected[topic] += disconnected
+        return queued
+
+    def subscribe(
+        self, topic: str, *, last_event_id: str | int | None = None
+    ) -> AsyncIterator[bytes]:
+        """Yield formatted SSE frames published to ``topic``.
+
+        The subscription starts when iteration starts and ends when the
+        generator is closed or cancelled (e.g. when the client disconnects),
+        or when the ``"disconnect"`` overflow policy drops this subscriber.
+        With ``history``, events after ``last_event_id`` are replayed first.
+        """
+        return self._listen((topic,), named=False, last_event_id=last_event_id)
+
+    def subscribe_many(self, *topics: str) -> AsyncIterator[bytes]:
+        """Yield frames from several topics, each renamed to ``event: <topic>``.
+
+        All topics share one queue, so ordering across topics is preserved.
+        Events are not replayed: ids are per topic and cannot resume a merged
+        stream.
+        """
+        if not topics:
+            msg = "subscribe_many() needs at least one topic"
+            raise ValueError(msg)
+        return self._listen(tuple(dict.fromkeys(topics)), named=True, last_event_id=None)
+
+    async def _listen(
+        self, topics: tuple[str, ...], *, named: bool, last_event_id: str | int | None
+    ) -> AsyncIterator[bytes]:
+        subscriber = _Subscriber(
+            asyncio.get_running_loop(),
+            max_queue=self.max_queue,
+            policy=self.overflow,
+            named=named,
+        )
+        backlog: list[bytes] = []
+        with self._lock:
+            for topic in topics:
+                self._topics.setdefault(topic, set()).add(subscriber)
+            if self.history is not None and not named:
+                backlog = self.history.replay(topics[0], last_event_id)
+        try:
+            for missed in backlog:
+                yield missed
+            while True:
+                while (frame := subscriber.pop()) is not None:
+                    yield frame
+                if subscriber.closed:
+                    return
+                subscriber.event.clear()
+                if not subscriber.queue and not subscriber.closed:
+                    await subscriber.event.wait()
+        finally:
+            with self._lock:
+                for topic in topics:
+                    subscribers = self._topics.get(topic)
+                    if subscribers is not None:
+                        subscribers.discard(subscriber)
+                        if not subscribers:
+                            del self._topics[topic]
+
+    def stream(
+        self,
+        topic: str,
+        *,
+        headers: dict[str, str] | None = None,
+        heartbeat: float | None = 15.0,
+        request: Request | None = None,
+        last_event_id: str | int | None = None,
+    ) -> StreamingResponse:
+        """Return an ``SSEStream`` response subscribed to ``topic``.
+
+        ``last_event_id`` defaults to the request's ``Last-Event-ID`` header
+        (or ``last_event_id`` query param, which ``SSETarget`` sends when it
+        reconnects itself).
+        """
+        if last_event_id is None:
+            last_event_id = _request_last_event_id(request)
+        return SSEStream(
+            self.subscribe(topic, last_event_id=last_event_id),
+            headers=headers,
+            heartbeat=heartbeat,
+            request=request,
+        )
+
+    def multiplex(
+        self,
+        *topics: str,
+        headers: dict[str, str] | None = None,
+        heartbeat: float | None = 15.0,
+        request: Request | None = None,
+    ) -> StreamingResponse:
+        """Return one ``SSEStream`` carrying every topic in ``topics``.
+
+        Each event's name is set to its topic, so several ``SSETarget``
+        components sharing the endpoint pick their updates with
+        ``event="<topic>"`` over a single connection.
+
+        Example:
+            >>> @app.get("/dashboard/live")
+            >>> async def live(req: Request):
+            >>>     return broker.multiplex("orders", "revenue", "alerts", request=req)
+            >>>
+            >>> SSETarget(endpoint="/dashboard/live", event="orders")
+        """
+        return SSEStream(
+            self.subscribe_many(*topics), headers=headers, heartbeat=heartbeat, request=request
+        )
+
+    async def websocket(
+        self,
+        websocket: WebSocket,
+        *topics: str,
+        on_message: Callable[[Any], Any] | None = None,
+    ) -> None:
+        """Relay ``topics`` to ``websocket`` until the client disconnects.
+
+        The WebSocket transport for ``WSTarget``: each frame is sent as the
+        same SSE-formatted bytes an ``SSEStream`` would carry, so both
+        transports share swap modes and event names (one topic keeps each
+        event's own name, several topics are named after their topic like
+        ``multiplex``). A reconnecting ``WSTarget`` sends ``last_event_id``
+        so single-topic sockets resume from ``history``.
+
+        Messages from the client are decoded as JSON when possible and passed
+        to ``on_message`` (sync or async). A non-None return value is sent
+        back to this client as an SSE payload, e.g. an ``sse_event`` ack.
+
+        Example:
+            >>> async def board_socket(ws: WebSocket):
+            >>>     await broker.websocket(ws, "board", on_message=apply_board_edit)
+            >>>
+            >>> app.routes.append(WebSocketRoute("/board/ws", board_socket))
+            >>> WSTarget(Board(), endpoint="/board/ws", event="board")
+        """
+        if not topics:
+            msg = "websocket() needs at least one topic"
+            raise ValueError(msg)
+        await websocket.accept()
+        frames = (
+            self.subscribe(topics[0], last_event_id=websocket.query_params.get("last_event_id"))
+            if len(topics) == 1
+            else self.subscribe_many(*topics)
+        )
+        send_lock = asyncio.Lock()
+
+        async def send(frame: bytes) -> None:
+            async with send_lock:
+                await websocket.send_bytes(frame)
+
+        async def relay() -> None:
+            async for frame in frames:
+                await send(frame)
+            # The overflow policy dropped this client; ask it to reconnect.
+            await websocket.close(code=1013)
+
+        async def listen() -> None:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                if on_message is None:
+                    continue
+                text = message.get("text")
+                if text is None:
+                    text = (message.get("bytes") or b"").decode("utf-8")
+                try:
+                    data = json.loads(text)
+                except ValueError:
+                    data = text
+                reply = on_message(data)
+                if inspect.isawaitable(reply):
+                    reply = await reply
+                if reply is not None:
+                    await send(_encode_sse(reply))
+
+        tasks = [asyncio.ensure_future(relay()), asyncio.ensure_future(listen())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                with suppress(WebSocketDisconnect):
+                    task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                with suppress(BaseException):
+                    await task
+            aclose = getattr(frames, "aclose", None)
+            if aclose is not None:
+                await aclose()
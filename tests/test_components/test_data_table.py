@@ -1,7 +1,9 @@
 """Tests for DataTable component."""
 
+import re
 from concurrent.futures import ThreadPoolExecutor
 
+import pytest
 from fasthtml.common import to_xml
 
 from faststrap import DataTable
@@ -129,3 +131,134 @@ def test_data_table_auto_ids_are_unique_across_threads():
 
     ids = [html.split('id="', 1)[1].split('"', 1)[0] for html in rendered]
     assert len(ids) == len(set(ids))
+
+
+def test_data_table_virtual_renders_window_between_spacers():
+    data = [{"name": f"user-{i}"} for i in range(1000)]
+    html = to_xml(
+        DataTable(
+            data,
+            virtual=True,
+            row_height=30,
+            per_page=50,
+            page=3,
+            endpoint="/users",
+            filters={"team": "ops"},
+            table_id="users",
+        )
+    )
+
+    assert 'data-fs-virtual="true"' in html
+    assert 'data-fs-virtual-target="#users-body"' in html
+    assert 'data-fs-virtual-url="/users?team=ops&amp;per_page=50"' in html
+    assert 'data-fs-virtual-total="1000"' in html
+    assert 'id="users-body"' in html
+    assert 'data-fs-virtual-page="3"' in html
+    # Page 3 plus its overscan page: rows 100-199.
+    assert "user-99<" not in html
+    assert "user-100<" in html
+    assert "user-199<" in html
+    assert "user-200<" not in html
+    assert "height: 3000px;" in html
+    assert "height: 24000px;" in html
+    assert "pagination" not in html
+
+
+def test_data_table_virtual_uses_server_window_with_total_rows():
+    window = [{"name": "user-100"}, {"name": "user-101"}]
+    html = to_xml(
+        DataTable(
+            window,
+            virtual=True,
+            row_height=10,
+            per_page=1,
+            page=101,
+            total_rows=500,
+            endpoint="/users",
+        )
+    )
+
+    assert "user-100<" in html
+    assert "user-101<" in html
+    assert "height: 1000px;" in html
+    assert "height: 3980px;" in html
+
+
+def test_data_table_virtual_sorts_before_slicing_the_window():
+    data = [{"n": n} for n in (5, 3, 9, 1, 7, 2, 8, 0, 6, 4)]
+    options = {"virtual": True, "per_page": 2, "endpoint": "/nums", "sortable": True}
+    html = to_xml(DataTable(data, page=2, sort="-n", **options))
+
+    # Page 2 and the page after it, taken from the descending order 9..0.
+    assert re.findall(r"<td>(\d+)</td>", html) == ["7", "6", "5", "4"]
+
+    server_window = to_xml(DataTable(data[:2], total_rows=10, sort="n", **options))
+    assert re.findall(r"<td>(\d+)</td>", server_window) == ["5", "3"]
+
+
+def test_data_table_virtual_requires_endpoint():
+    with pytest.raises(ValueError, match="endpoint"):
+        DataTable([{"name": "Alice"}], virtual=True)
+
+
+def test_data_table_formatters_apply_to_rendered_rows():
+    html = to_xml(
+        DataTable(
+            [{"name": "<i>Ann</i>", "revenue": 1500.0}, {"name": "Ben", "revenue": None}],
+            formatters={"revenue": "{:,.2f}"},
+            none_as="-",
+        )
+    )
+
+    assert "<td>1,500.00</td>" in html
+    assert "<td>-</td>" in html
+    assert "<td>&lt;i&gt;Ann&lt;/i&gt;</td>" in html
+
+
+def test_data_table_row_key_renders_stable_row_ids():
+    html = to_xml(
+        DataTable(
+            [{"id": 7, "name": "Ann"}, {"id": "a/b", "name": "Ben"}],
+            row_key="id",
+            table_id="orders",
+        )
+    )
+
+    assert '<tbody id="orders-body">' in html
+    assert '<tr id="orders-row-7">' in html
+    assert 'id="orders-row-h' in html
+
+    with pytest.raises(ValueError, match="row_key"):
+        DataTable([{"name": "Ann"}], row_key="id")
+
+
+def test_data_table_diff_emits_only_changed_rows():
+    old = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"}]
+    new = [
+        {"id": 0, "name": "z"},
+        {"id": 1, "name": "a"},
+        {"id": 3, "name": "C"},
+        {"id": 4, "name": "d"},
+    ]
+
+    html = to_xml(DataTable.diff(old, new, row_key="id", table_id="t"))
+
+    assert html.startswith("<template>")
+    assert '<tr id="t-row-2" hx-swap-oob="delete"></tr>' in html
+    assert '<tr id="t-row-3" hx-swap-oob="true"><td>3</td><td>C</td></tr>' in html
+    assert '<tbody hx-swap-oob="afterbegin:#t-body"><tr id="t-row-0">' in html
+    assert '<tbody hx-swap-oob="afterend:#t-row-3"><tr id="t-row-4">' in html
+    assert "t-row-1" not in html
+    assert to_xml(DataTable.diff(old, old, row_key="id", table_id="t")) == "<template></template>"
+
+
+def test_data_table_diff_replaces_body_when_rows_reorder():
+    rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+    html = to_xml(DataTable.diff(rows, rows[::-1], row_key="id", table_id="t"))
+
+    assert 'hx-swap-oob="true" id="t-body"' in html
+    assert html.index("t-row-2") < html.index("t-row-1")
+
+    with pytest.raises(ValueError, match="unique"):
+        DataTable.diff(rows, [rows[0], rows[0]], row_key="id", table_id="t")
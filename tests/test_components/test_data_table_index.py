@@ -0,0 +1,194 @@
+"""Tests for DataTableIndex."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from fasthtml.common import to_xml
+
+from faststrap import DataTable, DataTableIndex
+from faststrap.components.display.data_table import _matches_search
+from faststrap.components.display.data_table_index import _sort_key, _sort_records
+
+ROWS = [
+    {"name": "Alice", "team": "Engineering", "city": "Straße"},
+    {"name": "Bob", "team": "Operations", "city": None},
+    {"name": "Carla", "team": "Ops", "city": "Lagos"},
+    {"name": "Dan", "team": "engineering", "city": "Oslo", "age": 41},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_indexes():
+    DataTableIndex.invalidate()
+    yield
+    DataTableIndex.invalidate()
+
+
+@pytest.mark.parametrize("ngram", [None, 1, 2, 3])
+@pytest.mark.parametrize(
+    "query", ["a", "AL", "eng", "ops", "strasse", "41", "none", "lagos", "xyz", "o\x00s"]
+)
+def test_index_search_matches_linear_semantics(ngram, query):
+    index = DataTableIndex(ROWS, ngram=ngram)
+    expected = [
+        pos
+        for pos, row in enumerate(index.records)
+        if _matches_search(row, columns=index.columns, query=query)
+    ]
+
+    assert index.search(query) == expected
+
+
+def test_index_search_includes_index_values_when_enabled():
+    index = DataTableIndex(ROWS, include_index=True)
+
+    assert index.search("3") == [3]
+    assert DataTableIndex(ROWS).search("3") == []
+
+
+def test_index_search_does_not_match_across_cells():
+    index = DataTableIndex([{"a": "ab", "b": "cd"}])
+
+    assert index.search("bc") == []
+    assert index.search("cd") == [0]
+
+
+def test_data_table_uses_index_for_search():
+    index = DataTableIndex(ROWS)
+    html = to_xml(DataTable(index, searchable=True, search="oper"))
+
+    assert "Bob" in html
+    assert "Alice" not in html
+
+
+def test_data_table_rejects_columns_with_index():
+    with pytest.raises(ValueError, match="DataTableIndex"):
+        DataTable(DataTableIndex(ROWS), columns=["name"])
+
+
+def test_shared_index_rebuilds_only_on_version_change():
+    calls: list[int] = []
+
+    def load():
+        calls.append(1)
+        return ROWS
+
+    first = DataTableIndex.shared("people", load, version=1)
+    again = DataTableIndex.shared("people", load, version=1)
+    rebuilt = DataTableIndex.shared("people", load, version=2)
+
+    assert first is again
+    assert rebuilt is not first
+    assert len(calls) == 2
+
+    DataTableIndex.invalidate("people")
+    DataTableIndex.shared("people", load, version=2)
+    assert len(calls) == 3
+
+
+def test_shared_index_builds_outside_the_global_lock():
+    started, release = threading.Event(), threading.Event()
+    calls: list[str] = []
+
+    def slow_load():
+        calls.append("slow")
+        started.set()
+        release.wait(5)
+        return ROWS
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        slow = [pool.submit(DataTableIndex.shared, "slow", slow_load, version=1) for _ in range(2)]
+        assert started.wait(5)
+        # Another key builds while the slow one is still loading.
+        other = pool.submit(DataTableIndex.shared, "other", ROWS, version=1).result(timeout=5)
+        release.set()
+        first, second = (future.result(timeout=5) for future in slow)
+
+    assert other.records == ROWS
+    assert first is second
+    assert calls == ["slow"]
+
+
+def test_data_table_index_is_exported_from_components():
+    from faststrap.components import DataTableIndex as exported
+
+    assert exported is DataTableIndex
+
+
+MIXED_ROWS = [
+    {"name": "bob", "score": 3, "active": True, "joined": date(2024, 3, 1), "mix": "b"},
+    {"name": "Alice", "score": None, "active": False, "joined": None, "mix": 2},
+    {"name": "carl", "score": 3.0, "active": True, "joined": date(2023, 1, 5), "mix": None},
+    {"name": "alice", "score": -1, "active": None, "joined": date(2024, 3, 1), "mix": "A"},
+    {"name": None, "score": 10, "active": False, "joined": date(2022, 7, 9), "mix": 1.5},
+]
+
+
+@pytest.mark.parametrize("column", ["name", "score", "active", "joined", "mix"])
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+def test_index_sort_matches_single_column_reference(column, direction):
+    reference = sorted(
+        range(len(MIXED_ROWS)),
+        key=lambda pos: _sort_key(MIXED_ROWS[pos].get(column)),
+        reverse=direction == "desc",
+    )
+    index = DataTableIndex(MIXED_ROWS)
+
+    assert index.sort([(column, direction)]) == reference
+    assert _sort_records(MIXED_ROWS, [(column, direction)]) == reference
+
+
+def test_index_infers_column_types_once():
+    index = DataTableIndex(MIXED_ROWS)
+
+    assert index.column_type("name") == "text"
+    assert index.column_type("score") == "numeric"
+    assert index.column_type("active") == "bool"
+    assert index.column_type("joined") == "date"
+    assert index.column_type("mix") == "mixed"
+
+
+def test_index_multi_column_sort_and_cached_permutations():
+    rows = [
+        {"region": "west", "revenue": 5},
+        {"region": "east", "revenue": 1},
+        {"region": "west", "revenue": 9},
+        {"region": "east", "revenue": 7},
+    ]
+    index = DataTableIndex(rows)
+    specs = [("region", "asc"), ("revenue", "desc")]
+
+    first = index.sort(specs)
+    assert first == [3, 1, 2, 0]
+    first.reverse()
+    assert index.sort(specs) == [3, 1, 2, 0]
+    assert index.sort(specs, positions=[0, 1, 2]) == [1, 2, 0]
+
+
+def test_data_table_multi_sort_query_contract():
+    rows = [
+        {"region": "west", "revenue": 5},
+        {"region": "east", "revenue": 1},
+        {"region": "east", "revenue": 7},
+    ]
+    html = to_xml(
+        DataTable(
+            rows,
+            sortable=True,
+            sort=["region", "-revenue"],
+            pagination=True,
+            per_page=1,
+            base_url="/sales",
+        )
+    )
+
+    assert "sort=region&amp;sort=-revenue&amp;page=2" in html
+    assert html.index("<td>7</td>") < html.index("<td>1</td>") < html.index("<td>5</td>")
+    assert 'aria-sort="ascending"' in html
+    assert html.count("aria-sort=") == 1
+
+    params = DataTable.export_params(sort=["region", "-revenue"])
+    assert params == {"sort": ["region", "-revenue"]}
+    assert DataTable.export_params(sort="-revenue") == {"sort": "revenue", "direction": "desc"}
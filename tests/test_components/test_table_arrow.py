@@ -0,0 +1,93 @@
+"""Tests for Apache Arrow input to Table.from_df and DataTable."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from fasthtml.common import to_xml
+
+from faststrap import DataTable, Table
+from faststrap.components.display._arrow import _arrow_search, _arrow_sort
+from faststrap.components.display.data_table import _matches_search
+from faststrap.components.display.data_table_index import _sort_records
+
+pa = pytest.importorskip("pyarrow")
+
+ROWS = [
+    {"name": "bob", "score": 3, "active": True, "joined": date(2024, 3, 1)},
+    {"name": "Alice", "score": None, "active": False, "joined": None},
+    {"name": "carl", "score": 3, "active": True, "joined": date(2023, 1, 5)},
+    {"name": "alice", "score": -1, "active": None, "joined": date(2024, 3, 1)},
+    {"name": None, "score": 10, "active": False, "joined": date(2022, 7, 9)},
+]
+
+
+def _body(html: str) -> str:
+    return html[html.index("<tbody") : html.index("</tbody>")]
+
+
+def test_table_from_df_accepts_arrow_table_and_reader() -> None:
+    table = pa.Table.from_pylist(ROWS)
+    reader = pa.RecordBatchReader.from_batches(table.schema, table.to_batches(max_chunksize=2))
+
+    html = to_xml(Table.from_df(reader, max_rows=3, none_as="-", formatters={"joined": "%d/%m/%Y"}))
+
+    assert "<td>01/03/2024</td>" in html
+    assert "<td>Alice</td><td>-</td><td>False</td><td>-</td>" in html
+    assert "alice" not in html
+    assert _body(to_xml(Table.from_df(table))) == _body(to_xml(Table.from_df(ROWS)))
+
+
+def test_table_from_df_rejects_missing_arrow_columns() -> None:
+    with pytest.raises(ValueError, match="not found"):
+        Table.from_df(pa.Table.from_pylist(ROWS), columns=["missing"])
+
+
+@pytest.mark.parametrize("query", ["ALI", "3", "true", "2024", "xyz"])
+def test_arrow_search_matches_list_search(query: str) -> None:
+    table = pa.Table.from_pylist(ROWS)
+    expected = [
+        pos
+        for pos, row in enumerate(ROWS)
+        if _matches_search(row, columns=list(ROWS[0]), query=query)
+    ]
+
+    assert _arrow_search(table, query, include_index=False) == expected
+
+
+@pytest.mark.parametrize("column", ["name", "score", "active", "joined"])
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+def test_arrow_sort_matches_list_sort(column: str, direction: str) -> None:
+    table = pa.Table.from_pylist(ROWS)
+    specs = [(column, direction)]
+
+    assert _arrow_sort(table, specs) == _sort_records(ROWS, specs)
+    assert _arrow_sort(table, specs, [0, 2, 3]) == [
+        [0, 2, 3][pos] for pos in _sort_records([ROWS[0], ROWS[2], ROWS[3]], specs)
+    ]
+
+
+def test_data_table_renders_arrow_like_list_data() -> None:
+    table = pa.Table.from_pylist(ROWS)
+    options = {
+        "searchable": True,
+        "search": "a",
+        "sortable": True,
+        "sort": ["-score", "name"],
+        "include_index": True,
+        "pagination": True,
+        "per_page": 2,
+        "page": 2,
+    }
+
+    assert _body(to_xml(DataTable(table, **options))) == _body(to_xml(DataTable(ROWS, **options)))
+
+
+def test_data_table_accepts_record_batch_pages() -> None:
+    batch = pa.RecordBatch.from_pylist(ROWS)
+    html = to_xml(DataTable(batch, pagination=True, per_page=2, page=2))
+
+    assert "<td>carl</td>" in html
+    assert "<td>alice</td>" in html
+    assert "<td>bob</td>" not in html
@@ -84,3 +84,117 @@ def test_table_from_df_rejects_missing_requested_columns() -> None:
         raise AssertionError("Expected ValueError for unknown column")
     except ValueError as exc:
         assert "Requested columns not found" in str(exc)
+
+
+def test_table_from_df_applies_column_formatters() -> None:
+    df = pd.DataFrame(
+        {
+            "name": ["<b>Alice</b>", None],
+            "revenue": [1234.5, float("nan")],
+            "ts": pd.to_datetime(["2024-01-31 10:00", None]),
+            "count": [3, 4],
+        }
+    )
+    html = to_xml(
+        Table.from_df(  # type: ignore[attr-defined]
+            df,
+            formatters={"revenue": "{:,.2f}", "ts": "%Y-%m-%d"},
+            none_as="n/a",
+        )
+    )
+
+    assert "<td>1,234.50</td>" in html
+    assert "<td>2024-01-31</td>" in html
+    assert "<td>&lt;b&gt;Alice&lt;/b&gt;</td>" in html
+    assert "<td>3</td>" in html
+    assert html.count("<td>n/a</td>") == 3
+
+
+def test_table_from_df_pandas_matches_record_rendering() -> None:
+    rows = [
+        {"name": "Alice & Bob", "age": 25, "score": 0.1, "active": True},
+        {"name": "Carla", "age": 31, "score": 2.5, "active": False},
+    ]
+
+    from_frame = to_xml(Table.from_df(pd.DataFrame(rows)))  # type: ignore[attr-defined]
+    from_records = to_xml(Table.from_df(rows))  # type: ignore[attr-defined]
+
+    assert from_frame == from_records
+
+
+def test_table_from_df_record_formatters_accept_callables() -> None:
+    rows = [{"amount": 5, "note": None}, {"amount": 12, "note": "x<y"}]
+    html = to_xml(
+        Table.from_df(  # type: ignore[attr-defined]
+            rows,
+            formatters={"amount": lambda value: f"${value}", "note": "[{}]"},
+            none_as="-",
+        )
+    )
+
+    assert "<td>$5</td>" in html
+    assert "<td>-</td>" in html
+    assert "<td>[x&lt;y]</td>" in html
+
+
+def test_table_from_df_strftime_formatter_skips_non_dates() -> None:
+    from datetime import date
+
+    rows = [{"when": date(2024, 3, 1)}, {"when": "unknown"}, {"when": 7}]
+    html = to_xml(Table.from_df(rows, formatters={"when": "%d/%m/%Y"}))  # type: ignore[attr-defined]
+
+    assert "<td>01/03/2024</td>" in html
+    assert "<td>unknown</td>" in html
+    assert "<td>7</td>" in html
+
+
+def test_table_from_df_polars_formatters() -> None:
+    pl = pytest.importorskip("polars")
+    from datetime import datetime
+
+    df = pl.DataFrame(
+        {
+            "revenue": [1234.5, None],
+            "ts": [datetime(2024, 1, 31, 10), None],
+            "label": ["a&b", "c"],
+        }
+    )
+    html = to_xml(
+        Table.from_df(  # type: ignore[attr-defined]
+            df, formatters={"revenue": "{:,.2f}", "ts": "%Y-%m-%d"}, none_as="n/a"
+        )
+    )
+
+    assert "<td>1,234.50</td>" in html
+    assert "<td>2024-01-31</td>" in html
+    assert "<td>a&amp;b</td>" in html
+    assert html.count("<td>n/a</td>") == 2
+
+
+def test_table_stream_matches_from_df_markup() -> None:
+    rows = [{"name": f"<{i}>", "score": i} for i in range(5)]
+
+    chunks = list(Table.stream((row for row in rows), chunk_rows=2, striped=True))
+    frame_chunks = list(Table.stream(pd.DataFrame(rows), chunk_rows=3, include_index=True))
+
+    assert len(chunks) == 5
+    assert chunks[0].rstrip().endswith("<tbody>")
+    assert chunks[-1].startswith("</tbody>")
+    assert "".join(chunks) == to_xml(Table.from_df(rows, striped=True))
+    assert "".join(frame_chunks) == to_xml(Table.from_df(pd.DataFrame(rows), include_index=True))
+
+
+def test_table_stream_pulls_rows_lazily() -> None:
+    pulled: list[int] = []
+
+    def rows():
+        for i in range(10):
+            pulled.append(i)
+            yield {"n": i}
+
+    stream = Table.stream(rows(), chunk_rows=4)
+    assert len(pulled) == 4
+    next(stream)
+    next(stream)
+    assert len(pulled) == 4
+    assert "No data available" in "".join(Table.stream(iter([]), columns=["n"]))
@@ -0,0 +1,39 @@
+"""Tests for WSTarget component."""
+
+from fasthtml.common import to_xml
+
+from faststrap import WSTarget
+
+
+def test_ws_target_default_attrs() -> None:
+    target = WSTarget("Waiting...", endpoint="/live/ws")
+    html = to_xml(target)
+
+    assert 'data-fs-ws="true"' in html
+    assert 'data-fs-ws-endpoint="/live/ws"' in html
+    assert 'data-fs-ws-event="message"' in html
+    assert 'data-fs-ws-swap="inner"' in html
+    assert 'class="faststrap-ws-target"' in html
+    assert 'aria-live="polite"' in html
+    assert "data-fs-ws-reconnect" not in html
+
+
+def test_ws_target_customization() -> None:
+    target = WSTarget(
+        endpoint="wss://example.com/ws",
+        event="board",
+        swap="append",
+        target="#cards",
+        reconnect=False,
+        retry=1000,
+        cls="custom",
+    )
+    html = to_xml(target)
+
+    assert 'data-fs-ws-endpoint="wss://example.com/ws"' in html
+    assert 'data-fs-ws-event="board"' in html
+    assert 'data-fs-ws-swap="append"' in html
+    assert 'data-fs-ws-target="#cards"' in html
+    assert 'data-fs-ws-reconnect="false"' in html
+    assert 'data-fs-ws-retry="1000"' in html
+    assert "custom" in html
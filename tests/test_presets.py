@@ -1,8 +1,14 @@
 """Tests for presets module (interactions, responses, auth)."""
 
-from fasthtml.common import Response, to_xml
+import asyncio
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from fasthtml.common import FastHTML, Li, Response, to_xml
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
+from starlette.testclient import TestClient
 
 from faststrap.presets import (
     ActiveSearch,
@@ -12,10 +18,16 @@ from faststrap.presets import (
     LoadingButton,
     LocationAction,
     OptimisticAction,
+    ToastBatch,
     hx_redirect,
     hx_refresh,
     hx_trigger,
+    infinite_cursor,
+    infinite_page,
+    lazy_batch,
+    notify,
     require_auth,
+    toast_batch,
 )
 
 
@@ -29,6 +41,7 @@ def test_active_search():
     assert "#results" in html
     assert "hx-get" in html
     assert "hx-trigger" in html
+    assert 'hx-sync="this:replace"' in html
 
 
 def test_infinite_scroll():
@@ -51,6 +64,77 @@ def test_infinite_scroll_threshold_modes():
     assert 'data-fs-infinite-margin="200px"' in margin_html
 
 
+def _next_cursor(page) -> str:
+    url = page[-1].attrs["hx-get"]
+    return parse_qs(urlsplit(url).query)["cursor"][0]
+
+
+def test_infinite_page_walks_a_sorted_list_by_keyset_cursor():
+    rows = [{"id": i, "title": f"Post {i}"} for i in range(1, 46)]
+    render = lambda row: Li(row["title"])  # noqa: E731
+
+    first = infinite_page(rows, None, render, 20, endpoint="/feed?tab=all")
+    sentinel = to_xml(first[-1])
+    assert len(first) == 21
+    assert 'hx-get="/feed?tab=all&amp;cursor=' in sentinel
+    assert 'hx-target="this"' in sentinel
+    assert 'hx-swap="outerHTML"' in sentinel
+    assert 'data-fs-infinite-margin="600px"' in sentinel
+    assert infinite_cursor(_next_cursor(first)) == (20,)
+
+    second = infinite_page(rows, _next_cursor(first), render, 20, endpoint="/feed")
+    assert to_xml(second[0], indent=False) == "<li>Post 21</li>"
+    last = infinite_page(rows, _next_cursor(second), render, 20, endpoint="/feed")
+    assert [to_xml(item, indent=False) for item in last] == [
+        f"<li>Post {i}</li>" for i in range(41, 46)
+    ]
+
+
+def test_infinite_page_reads_only_one_extra_row_from_iterators():
+    consumed: list[int] = []
+
+    def query_after(after):
+        # Stands in for "WHERE (score, id) < (?, ?) ORDER BY score DESC, id DESC".
+        for score, row_id in [(9, 4), (9, 2), (7, 5), (5, 1), (3, 3)]:
+            if after is None or (score, row_id) < after:
+                consumed.append(row_id)
+                yield {"score": score, "id": row_id}
+
+    page = infinite_page(
+        query_after(None),
+        None,
+        lambda row: row["id"],
+        2,
+        endpoint="/top",
+        key=("score", "id"),
+        descending=True,
+        prefetch=None,
+    )
+    assert page[:2] == (4, 2)
+    assert consumed == [4, 2, 5]
+    assert 'hx-trigger="revealed"' in to_xml(page[-1])
+
+    cursor = _next_cursor(page)
+    assert infinite_cursor(cursor) == (9, 2)
+    rest = infinite_page(
+        query_after(infinite_cursor(cursor)),
+        cursor,
+        lambda row: row["id"],
+        2,
+        endpoint="/top",
+        key=("score", "id"),
+        descending=True,
+    )
+    assert rest[:2] == (5, 1)
+
+
+def test_infinite_page_rejects_bad_input():
+    with pytest.raises(ValueError, match="Invalid infinite scroll cursor"):
+        infinite_cursor("not-a-cursor")
+    with pytest.raises(ValueError, match="page_size"):
+        infinite_page([], None, str, 0, endpoint="/feed")
+
+
 def test_auto_refresh():
     """AutoRefresh creates polling element."""
     refresh = AutoRefresh(endpoint="/metrics", target="this", interval=5000)
@@ -59,6 +143,35 @@ def test_auto_refresh():
     assert "/metrics" in html
     assert "5000" in html or "5s" in html
     assert "hx-get" in html
+    assert html == (
+        '<div hx-get="/metrics" hx-trigger="every 5000ms" hx-swap="innerHTML" hx-target="this"'
+        ' class="auto-refresh">\n  <div class="text-muted">Loading...</div>\n</div>\n'
+    )
+
+
+def test_auto_refresh_adaptive_polling_uses_runtime():
+    html = to_xml(
+        AutoRefresh(endpoint="/metrics", target="this", interval=2000, max_interval=60000)
+    )
+
+    assert 'hx-trigger="faststrap:refresh"' in html
+    assert 'data-fs-refresh="true"' in html
+    assert 'data-fs-refresh-interval="2000"' in html
+    assert 'data-fs-refresh-max="60000"' in html
+    assert 'data-fs-refresh-backoff="2.0"' in html
+    assert 'data-fs-refresh-hidden="pause"' in html
+
+    visible_only = to_xml(
+        AutoRefresh(endpoint="/m", target="this", max_interval=60000, pause_hidden=False)
+    )
+    assert 'data-fs-refresh-hidden="run"' in visible_only
+
+    paused = to_xml(AutoRefresh(endpoint="/metrics", target="this", pause_hidden=True))
+    assert 'hx-trigger="every 5000ms"' in paused
+    assert 'data-fs-refresh-hidden="pause"' in paused
+    assert "document.hidden" not in paused
+    with pytest.raises(ValueError, match="max_interval"):
+        AutoRefresh(endpoint="/metrics", target="this", interval=5000, max_interval=1000)
 
 
 def test_lazy_load():
@@ -70,6 +183,75 @@ def test_lazy_load():
     assert "hx-get" in html
 
 
+def test_lazy_load_batch_mode_defers_to_runtime():
+    html = to_xml(LazyLoad(endpoint="/dash/fragments", batch="dash", key="revenue"))
+
+    assert "hx-get" not in html
+    assert 'data-fs-lazy-batch="dash"' in html
+    assert 'data-fs-lazy-key="revenue"' in html
+    assert 'data-fs-lazy-endpoint="/dash/fragments"' in html
+    with pytest.raises(ValueError, match="fragment key"):
+        LazyLoad(endpoint="/dash/fragments", batch="dash")
+    with pytest.raises(ValueError, match="Invalid LazyLoad"):
+        LazyLoad(endpoint="/dash/fragments", batch="dash", key='x"]')
+
+
+def test_lazy_batch_renders_fragments_concurrently_as_oob_swaps():
+    app = FastHTML()
+    release = threading.Event()
+
+    async def revenue(req):
+        # Only finishes once the sync handler has started in the threadpool.
+        await asyncio.to_thread(release.wait, 5)
+        return Li("$1,284")
+
+    def signups(req):
+        release.set()
+        return Li(req.query_params["batch"])
+
+    def broken(req):
+        raise RuntimeError("boom")
+
+    @app.get("/dash/fragments")
+    async def fragments(req: Request):
+        return await lazy_batch(req, {"revenue": revenue, "signups": signups, "map": broken})
+
+    response = TestClient(app).get(
+        "/dash/fragments?batch=dash&keys=revenue&keys=signups&keys=map&keys=nope",
+        headers={"HX-Request": "true"},
+    )
+    html = response.text
+
+    assert response.status_code == 200
+    assert (
+        """hx-swap-oob='innerHTML:[data-fs-lazy-batch="dash"][data-fs-lazy-key="revenue"]'"""
+        in html
+    )
+    assert "<li>$1,284</li>" in html and "<li>dash</li>" in html
+    assert "Failed to load." in html
+    assert "nope" not in html
+
+
+def test_lazy_batch_rejects_bad_input_with_400_before_running_handlers():
+    app = FastHTML()
+    calls: list[str] = []
+
+    def fragment(req):
+        calls.append("ran")
+        return Li("ok")
+
+    @app.get("/dash/fragments")
+    async def fragments(req: Request):
+        return await lazy_batch(req, {"ok": fragment, 'bad"]': fragment})
+
+    client = TestClient(app)
+    for query in ("keys=ok", "batch=a%20b&keys=ok", "batch=dash&keys=ok&keys=bad%22%5D"):
+        response = client.get(f"/dash/fragments?{query}")
+        assert response.status_code == 400
+        assert "Invalid LazyLoad" in response.text
+    assert calls == []
+
+
 def test_loading_button():
     """LoadingButton creates button with loading state."""
     btn = LoadingButton("Save", endpoint="/save")
@@ -101,6 +283,28 @@ def test_optimistic_action_contract_attributes():
     assert "hx-on::response-error" in html
 
 
+def test_optimistic_action_sends_idempotency_key():
+    def render() -> str:
+        return to_xml(
+            OptimisticAction(
+                "Archive", endpoint="/items/1/archive", action_id="archive-1", idempotency=True
+            )
+        )
+
+    html = render()
+    # The nonce is made in the browser, so the markup is safe to cache and share.
+    assert html == render()
+    assert "data-faststrap-idempotency-key" not in html
+    assert "if(!this.dataset.faststrapIdempotencyKey)" in html
+    assert 'event.detail.headers["Idempotency-Key"]' in html
+    assert "delete this.dataset.faststrapIdempotencyKey" in html
+    assert "idempotencyKey:this.dataset.faststrapIdempotencyKey" in html
+
+    plain = to_xml(OptimisticAction("Archive", endpoint="/items/1/archive"))
+    assert "Idempotency-Key" not in plain
+    assert "idempotencyKey" not in plain
+
+
 def test_optimistic_action_invalid_method_raises():
     """OptimisticAction validates allowed HTTP methods."""
     try:
@@ -242,3 +446,77 @@ def test_require_auth_custom_session_key():
         return "Content"
 
     assert callable(route)
+
+
+def test_toast_batch_merges_duplicates_and_caps_toasts():
+    """ToastBatch merges repeated notices and summarizes the overflow."""
+    batch = ToastBatch(max_toasts=3)
+    assert batch.render() is None
+
+    for _ in range(3):
+        batch.add("Row failed validation", "danger", plural="{count} rows failed validation")
+    batch.add("Saved", "success")
+    batch.add("Saved", "success")
+    batch.add("Slow import", "warning")
+    batch.add("Check headers", "warning")
+
+    html = to_xml(batch.render())
+    assert len(batch) == 7
+    assert html.count('hx-swap-oob="afterbegin:#toast-container"') == 1
+    assert "3 rows failed validation" in html
+    assert "Saved (\u00d72)" in html
+    assert "+2 more notifications" in html
+    assert "Slow import" not in html
+    assert html.count('role="alert"') == 3
+
+
+def test_toast_batch_decorator_is_request_scoped():
+    """Notices from nested helpers are appended to the handler's response."""
+
+    def helper():
+        notify("Row failed", "danger")
+
+    @toast_batch()
+    def handler():
+        helper()
+        helper()
+        return Li("done")
+
+    content, block = handler()
+    assert to_xml(content) == "<li>done</li>\n"
+    assert "Row failed (\u00d72)" in to_xml(block)
+    with pytest.raises(RuntimeError, match="toast_batch"):
+        notify("outside")
+
+
+def test_toast_batch_decorator_async_and_responses():
+    """Async handlers, tuples and non-HTML responses are handled."""
+
+    @toast_batch(toast_id="alerts")
+    async def tuple_handler():
+        await asyncio.sleep(0)
+        notify("Done", "success")
+        return Li("a"), Li("b")
+
+    @toast_batch()
+    def redirect_handler():
+        notify("Ignored")
+        return RedirectResponse("/", status_code=303)
+
+    @toast_batch()
+    def html_handler():
+        notify("Hello")
+        return Response("<p>x</p>", media_type="text/html")
+
+    @toast_batch()
+    def quiet_handler():
+        return Li("a")
+
+    result = asyncio.run(tuple_handler())
+    assert len(result) == 3
+    assert 'hx-swap-oob="afterbegin:#alerts"' in to_xml(result[2])
+    assert isinstance(redirect_handler(), RedirectResponse)
+    response = html_handler()
+    assert response.body.startswith(b"<p>x</p><div")
+    assert b"Hello" in response.body
+    assert to_xml(quiet_handler()) == "<li>a</li>\n"
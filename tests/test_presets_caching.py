@@ -0,0 +1,282 @@
+"""Tests for response caching presets."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fasthtml.common import FastHTML, Li, Ul
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from faststrap import DataTable
+from faststrap.presets import cached_datatable, search_cache, versioned_response
+from faststrap.presets._cache import SingleFlight, TTLCache
+from faststrap.presets.caching import datatable_cache_key
+
+ROWS = [{"name": "Alice", "revenue": 5}, {"name": "Bob", "revenue": 9}]
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+def _request(query: bytes, path: str = "/sales", headers: list | None = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query,
+            "headers": headers or [],
+        }
+    )
+
+
+def test_ttl_cache_evicts_lru_and_expires_entries():
+    now = [0.0]
+    cache: TTLCache[str] = TTLCache(max_entries=2, ttl=10, clock=lambda: now[0])
+
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "C")
+    assert cache.get("b") is None
+
+    now[0] = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_datatable_cache_key_is_canonical():
+    first = datatable_cache_key(_request(b"sort=-revenue&region=eu&status=open"))
+    second = datatable_cache_key(
+        _request(b"status=open&sort=revenue&direction=desc&page=1&region=eu")
+    )
+
+    assert first == second
+    assert datatable_cache_key(_request(b"q=bo")) != datatable_cache_key(_request(b"q=al"))
+
+
+def test_cached_datatable_reuses_renders_and_answers_304():
+    app = FastHTML()
+    calls: list[str | None] = []
+    version = {"value": 1}
+
+    @app.get("/sales")
+    @cached_datatable(version=lambda: version["value"])
+    def sales(req: Request, sort: str | None = None):
+        calls.append(sort)
+        return DataTable(ROWS, sortable=True, sort=sort, table_id="sales", endpoint="/sales")
+
+    client = TestClient(app)
+    htmx = {"HX-Request": "true"}
+
+    first = client.get("/sales?sort=name", headers=htmx)
+    again = client.get("/sales?sort=%2Bname&page=1", headers=htmx)
+    etag = first.headers["etag"]
+
+    assert again.text == first.text
+    assert len(calls) == 1
+
+    not_modified = client.get("/sales?sort=name", headers={**htmx, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert len(calls) == 1
+
+    full_page = client.get("/sales?sort=name")
+    assert "<html>" in full_page.text.lower() or "<!doctype html>" in full_page.text.lower()
+    assert full_page.headers["etag"] != etag
+    assert len(calls) == 1
+
+    version["value"] = 2
+    refreshed = client.get("/sales?sort=name", headers={**htmx, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert len(calls) == 2
+
+    assert sales.invalidate(version=2) == 1
+    client.get("/sales?sort=name", headers=htmx)
+    assert len(calls) == 3
+
+
+def test_cached_datatable_invalidate_changes_the_etag():
+    app = FastHTML()
+    rows = list(ROWS)
+
+    @app.get("/sales")
+    @cached_datatable(version="static")
+    def sales(req: Request):
+        return DataTable(rows, table_id="sales", endpoint="/sales")
+
+    client = TestClient(app)
+    htmx = {"HX-Request": "true"}
+    etag = client.get("/sales", headers=htmx).headers["etag"]
+
+    rows.append({"name": "Cy", "revenue": 1})
+    sales.invalidate()
+    fresh = client.get("/sales", headers={**htmx, "If-None-Match": etag})
+
+    assert fresh.status_code == 200
+    assert "Cy" in fresh.text
+    assert fresh.headers["etag"] != etag
+
+
+def test_cached_datatable_warns_without_a_version():
+    with pytest.warns(UserWarning, match="without a version"):
+
+        @cached_datatable()
+        def sales(req: Request):
+            return DataTable(ROWS)
+
+
+def test_cached_datatable_requires_a_request_parameter():
+    with pytest.raises(TypeError, match="req: Request"):
+
+        @cached_datatable(version=1)
+        def sales(sort: str | None = None):
+            return DataTable(ROWS)
+
+    @cached_datatable(version=1)
+    def by_name(request, sort: str | None = None):
+        return DataTable(ROWS)
+
+
+def test_search_cache_requires_a_request_parameter():
+    with pytest.raises(TypeError, match="search_cache"):
+
+        @search_cache()
+        async def search(q: str = ""):
+            return Ul()
+
+
+def test_versioned_response_skips_rendering_unchanged_fragments():
+    app = FastHTML()
+    state = {"version": 1, "renders": 0}
+
+    def panel():
+        state["renders"] += 1
+        return Ul(Li(f"v{state['version']}"))
+
+    @app.get("/stats")
+    def stats(req: Request):
+        return versioned_response(req, state["version"], panel)
+
+    client = TestClient(app)
+    htmx = {"HX-Request": "true"}
+
+    first = client.get("/stats", headers=htmx)
+    etag = first.headers["etag"]
+    assert "<li>v1</li>" in first.text
+    assert first.headers["cache-control"] == "no-cache"
+
+    unchanged = client.get("/stats", headers={**htmx, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert state["renders"] == 1
+
+    state["version"] = 2
+    changed = client.get("/stats", headers={**htmx, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert "<li>v2</li>" in changed.text
+    assert changed.headers["etag"] != etag
+
+
+def test_search_cache_normalizes_queries_and_answers_304():
+    app = FastHTML()
+    calls: list[str] = []
+
+    @app.get("/search")
+    @search_cache()
+    def search(req: Request, q: str = "", team: str = ""):
+        calls.append(q)
+        return Ul(*(Li(name) for name in ("Ada", "Adele") if name.casefold().startswith(q)))
+
+    client = TestClient(app)
+    htmx = {"HX-Request": "true"}
+
+    first = client.get("/search?q=%20ADA%20", headers=htmx)
+    again = client.get("/search?q=ada", headers=htmx)
+    assert calls == ["ada"]
+    assert again.text == first.text
+    assert "Ada" in first.text and "Adele" not in first.text
+
+    etag = first.headers["etag"]
+    not_modified = client.get("/search?q=Ada", headers={**htmx, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    client.get("/search?q=ada&team=core", headers=htmx)
+    assert calls == ["ada", "ada"]
+    assert search.invalidate() == 2
+
+
+def test_search_cache_scope_keeps_users_apart():
+    app = FastHTML()
+    calls: list[str] = []
+
+    @app.get("/search")
+    @search_cache(version=1, scope=lambda req: req.headers.get("x-user"))
+    def search(req: Request, q: str = ""):
+        user = req.headers["x-user"]
+        calls.append(user)
+        return Ul(Li(f"{user}: {q}"))
+
+    client = TestClient(app)
+    ada = client.get("/search?q=notes", headers={"HX-Request": "true", "X-User": "ada"})
+    bob = client.get("/search?q=notes", headers={"HX-Request": "true", "X-User": "bob"})
+    again = client.get("/search?q=notes", headers={"HX-Request": "true", "X-User": "ada"})
+
+    assert "ada: notes" in ada.text and "bob: notes" in bob.text
+    assert again.text == ada.text
+    assert calls == ["ada", "bob"]
+
+
+@pytest.mark.anyio
+async def test_search_cache_collapses_concurrent_identical_queries():
+    calls: list[str] = []
+    release = asyncio.Event()
+    htmx = [(b"hx-request", b"true")]
+
+    @search_cache()
+    async def search(req: Request, q: str = ""):
+        calls.append(q)
+        await release.wait()
+        return Ul(Li(q))
+
+    pending = [
+        asyncio.ensure_future(search(_request(query, "/search", htmx), q=raw))
+        for query, raw in ((b"q=Bob", "Bob"), (b"q=bob%20", "bob "), (b"q=bo", "bo"))
+    ]
+    while len(calls) < 2:
+        await asyncio.sleep(0)
+    release.set()
+    first, second, other = await asyncio.gather(*pending)
+
+    assert sorted(calls) == ["bo", "bob"]
+    assert first.body == second.body == b"<ul>\n  <li>bob</li>\n</ul>\n"
+    assert first.headers["etag"] == second.headers["etag"] != other.headers["etag"]
+
+
+def test_single_flight_shares_one_call_across_threads():
+    flights = SingleFlight()
+    started = threading.Event()
+    calls: list[int] = []
+
+    def load() -> int:
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return 42
+
+    results: list[int] = []
+    leader = threading.Thread(target=lambda: results.append(flights.run("k", load)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(flights.run("k", load))) for _ in range(3)
+    ]
+    for thread in followers:
+        thread.start()
+    for thread in (leader, *followers):
+        thread.join()
+
+    assert results == [42, 42, 42, 42]
+    assert len(calls) == 1
@@ -0,0 +1,84 @@
+"""Tests for streaming export responses."""
+
+import sqlite3
+
+import pytest
+
+from faststrap import datatable_export_params
+from faststrap.presets import export_response
+
+ROWS = [
+    {"id": i, "region": ["eu", "us"][i % 2], "revenue": (i * 7) % 5, "name": f"n{i}"}
+    for i in range(10)
+]
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+async def _body(response) -> str:
+    chunks: list[str] = []
+    async for chunk in response.body_iterator:
+        chunks.append(chunk.decode() if isinstance(chunk, (bytes, bytearray)) else str(chunk))
+    return "".join(chunks)
+
+
+@pytest.mark.anyio
+async def test_export_response_applies_datatable_semantics_for_every_source() -> None:
+    pd = pytest.importorskip("pandas")
+    params = {
+        **datatable_export_params(sort=["-revenue", "id"], search="n", filters={"region": "eu"}),
+        "format": "csv",
+    }
+    expected = "id,region,revenue,name\r\n2,eu,4,n2\r\n4,eu,3,n4\r\n6,eu,2,n6\r\n8,eu,1,n8\r\n0,eu,0,n0\r\n"
+
+    for source in (ROWS, pd.DataFrame(ROWS), iter(ROWS)):
+        response = export_response(source, params, filters=["region"], chunk_rows=2)
+        assert response.media_type == "text/csv; charset=utf-8"
+        assert await _body(response) == expected
+
+
+@pytest.mark.anyio
+async def test_export_response_streams_cursor_as_ndjson() -> None:
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    db.execute("CREATE TABLE orders (id, region, revenue, name)")
+    db.executemany("INSERT INTO orders VALUES (?, ?, ?, ?)", [tuple(r.values()) for r in ROWS])
+
+    response = export_response(
+        db.execute("SELECT * FROM orders"),
+        {"region": ["eu", "us"], "revenue": "0", "filename": "../daily report"},
+        format="ndjson",
+        filters=["region", "revenue"],
+    )
+
+    assert response.headers["content-disposition"] == 'attachment; filename="daily report.ndjson"'
+    assert await _body(response) == (
+        '{"id": 0, "region": "eu", "revenue": 0, "name": "n0"}\n'
+        '{"id": 5, "region": "us", "revenue": 0, "name": "n5"}\n'
+    )
+
+
+@pytest.mark.anyio
+async def test_export_response_json_array_and_missing_values() -> None:
+    response = export_response([{"a": 1, "b": None}, {"a": float("nan"), "b": "x"}], format="json")
+
+    assert await _body(response) == '[\n{"a": 1, "b": null},\n{"a": null, "b": "x"}\n]\n'
+
+
+@pytest.mark.anyio
+async def test_export_response_ignores_params_not_listed_in_filters() -> None:
+    params = {"region": "eu", "name": "n3", "format": "ndjson"}
+
+    unfiltered = await _body(export_response(ROWS, params))
+    by_region = await _body(export_response(iter(ROWS), params, filters="region"))
+
+    assert unfiltered.count("\n") == len(ROWS)
+    assert by_region.count("\n") == 5
+    assert '"name": "n3"' not in by_region
+
+
+def test_export_response_rejects_unsupported_format() -> None:
+    with pytest.raises(ValueError, match="csv, ndjson and json"):
+        export_response(ROWS, {"format": "xlsx"})
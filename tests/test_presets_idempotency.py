@@ -0,0 +1,166 @@
+"""Tests for the idempotent route decorator."""
+
+import asyncio
+
+import pytest
+from fasthtml.common import FastHTML, HttpHeader, Li, Title, to_xml
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.testclient import TestClient
+
+from faststrap.presets import idempotent
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+def test_idempotent_replays_first_response_for_repeated_key():
+    app = FastHTML()
+    writes: list[int] = []
+
+    @app.post("/items/{item_id}/archive")
+    @idempotent(scope=lambda req: req.headers.get("x-user"))
+    def archive(req: Request, item_id: int):
+        writes.append(item_id)
+        return Li(f"archived {item_id} (write {len(writes)})")
+
+    client = TestClient(app)
+    key = {"HX-Request": "true", "Idempotency-Key": "archive-1:abc", "X-User": "ada"}
+
+    first = client.post("/items/1/archive", headers=key)
+    again = client.post("/items/1/archive", headers=key)
+    assert writes == [1]
+    assert again.text == first.text == "<li>archived 1 (write 1)</li>\n"
+    assert again.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+
+    client.post("/items/1/archive", headers={**key, "X-User": "bob"})
+    client.post("/items/1/archive", headers={**key, "Idempotency-Key": "archive-1:def"})
+    client.post("/items/1/archive", headers={"HX-Request": "true"})
+    assert writes == [1, 1, 1, 1]
+
+
+def test_idempotent_does_not_store_server_errors():
+    calls: list[int] = []
+
+    @idempotent()
+    def flaky(req: Request):
+        calls.append(1)
+        return Response("busy", status_code=503 if len(calls) == 1 else 201)
+
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/pay",
+            "headers": [(b"idempotency-key", b"pay:1")],
+        }
+    )
+    assert flaky(request).status_code == 503
+    assert flaky(request).status_code == 201
+    replay = flaky(request)
+    assert replay.status_code == 201
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_idempotent_coalesces_in_flight_duplicates():
+    calls: list[int] = []
+    release = asyncio.Event()
+
+    @idempotent()
+    async def pay(req: Request):
+        calls.append(1)
+        await release.wait()
+        return Li("paid")
+
+    def request() -> Request:
+        return Request(
+            {
+                "type": "http",
+                "method": "POST",
+                "path": "/pay",
+                "headers": [(b"idempotency-key", b"pay:2")],
+            }
+        )
+
+    pending = [asyncio.ensure_future(pay(request())) for _ in range(3)]
+    while not calls:
+        await asyncio.sleep(0)
+    release.set()
+    first, *replays = await asyncio.gather(*pending)
+
+    assert len(calls) == 1
+    # The request that ran gets its own result, rendered by FastHTML as usual.
+    assert to_xml(first) == "<li>paid</li>\n"
+    for replay in replays:
+        body, replayed = replay
+        assert to_xml(body) == "<li>paid</li>\n"
+        assert (replayed.k, replayed.v) == ("Idempotent-Replayed", "true")
+
+
+def test_idempotent_replays_full_pages_through_fasthtml():
+    app = FastHTML()
+    writes: list[int] = []
+
+    @app.post("/pay")
+    @idempotent()
+    def pay(req: Request):
+        writes.append(1)
+        return Title("Paid"), Li("paid"), HttpHeader("X-Receipt", "r-1")
+
+    client = TestClient(app)
+    key = {"Idempotency-Key": "pay:3"}
+
+    first = client.post("/pay", headers=key)
+    again = client.post("/pay", headers=key)
+
+    assert writes == [1]
+    assert "<title>Paid</title>" in first.text and "<!doctype html>" in first.text.lower()
+    assert "<!doctype html>" in again.text.lower() and "<li>paid</li>" in again.text
+    head = again.text.split("</head>")[0]
+    assert "<title>Paid</title>" in head
+    assert again.headers["x-receipt"] == first.headers["x-receipt"] == "r-1"
+    assert again.headers["idempotent-replayed"] == "true"
+
+
+@pytest.mark.anyio
+async def test_idempotent_reruns_duplicates_when_first_response_is_not_stored():
+    calls: list[int] = []
+    release = asyncio.Event()
+
+    @idempotent()
+    async def export(req: Request):
+        calls.append(1)
+        await release.wait()
+        return StreamingResponse(iter([b"row"]))
+
+    def request() -> Request:
+        return Request(
+            {
+                "type": "http",
+                "method": "POST",
+                "path": "/export",
+                "headers": [(b"idempotency-key", b"export:1")],
+            }
+        )
+
+    pending = [asyncio.ensure_future(export(request())) for _ in range(3)]
+    while not calls:
+        await asyncio.sleep(0)
+    release.set()
+    responses = await asyncio.gather(*pending)
+
+    assert len(calls) == 3
+    assert len({id(response) for response in responses}) == 3
+
+
+def test_idempotent_requires_a_request_parameter():
+    with pytest.raises(TypeError, match="@idempotent needs the route to take the request"):
+
+        @idempotent()
+        def archive(item_id: int):
+            return Li("archived")
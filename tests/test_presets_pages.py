@@ -0,0 +1,112 @@
+"""Tests for the HTMX-aware page decorator."""
+
+import pytest
+from fasthtml.common import Div, FastHTML, HttpHeader, Li, P, Title
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.testclient import TestClient
+
+from faststrap import DashboardLayout
+from faststrap.presets import page
+
+HX = {"HX-Request": "true"}
+
+
+def _app(**options):
+    app = FastHTML()
+    calls: list[dict] = []
+
+    def layout(*content, **kwargs):
+        calls.append(kwargs)
+        return DashboardLayout(*content, **kwargs)
+
+    @app.get("/orders")
+    @page(layout, title="Shop", context=lambda req: {"user": P("ada")}, **options)
+    def orders(req: Request):
+        return Title("Orders"), Li("order 1"), HttpHeader("X-Rows", "1")
+
+    @app.get("/api")
+    @page(layout)
+    async def api(req: Request):
+        return JSONResponse({"ok": True})
+
+    return TestClient(app), calls
+
+
+def test_page_skips_layout_for_htmx_partials():
+    client, calls = _app()
+
+    full = client.get("/orders")
+    assert "dashboard-layout" in full.text
+    assert "<title>Orders</title>" in full.text
+    assert "<p>ada</p>" in full.text
+    assert full.headers["x-rows"] == "1"
+    assert calls == [{"title": "Shop", "user": calls[0]["user"]}]
+
+    partial = client.get("/orders", headers=HX)
+    assert "dashboard-layout" not in partial.text
+    assert "<li>order 1</li>" in partial.text
+    assert partial.headers["x-rows"] == "1"
+    assert len(calls) == 1
+    for response in (full, partial):
+        names = [name.strip() for name in response.headers["vary"].split(",")]
+        assert sorted(names) == ["HX-Boosted", "HX-History-Restore-Request", "HX-Request"]
+
+
+def test_page_renders_layout_for_boosted_and_history_restore():
+    client, calls = _app()
+
+    boosted = client.get("/orders", headers={**HX, "HX-Boosted": "true"})
+    restore = client.get("/orders", headers={**HX, "HX-History-Restore-Request": "true"})
+
+    assert "dashboard-layout" in boosted.text
+    assert "dashboard-layout" in restore.text
+    assert len(calls) == 2
+
+
+def test_page_target_never_nests_layout_for_other_targets():
+    client, calls = _app(target="main")
+
+    main = client.get("/orders", headers={**HX, "HX-Target": "main"})
+    widget = client.get("/orders", headers={**HX, "HX-Target": "nav"})
+
+    assert "dashboard-layout" not in main.text and "dashboard-layout" not in widget.text
+    assert "<title>Orders</title>" in main.text
+    assert "<title>" not in widget.text and "<li>order 1</li>" in widget.text
+    assert widget.headers["x-rows"] == "1"
+    assert calls == []
+    assert client.get("/orders").headers["vary"].count("HX-Target") == 1
+
+
+def test_page_passes_responses_through_with_vary():
+    client, calls = _app()
+
+    response = client.get("/api")
+    assert response.json() == {"ok": True}
+    assert response.headers["vary"] == "HX-Request, HX-History-Restore-Request, HX-Boosted"
+    assert calls == []
+
+
+def test_page_merges_route_vary_header():
+    app = FastHTML()
+
+    @app.get("/")
+    @page(Div)
+    def home(req: Request):
+        return Li("a"), HttpHeader("Vary", "Accept-Language, HX-Boosted")
+
+    names = [n.strip() for n in TestClient(app).get("/").headers["vary"].split(",")]
+    assert sorted(names) == [
+        "Accept-Language",
+        "HX-Boosted",
+        "HX-History-Restore-Request",
+        "HX-Request",
+    ]
+
+
+def test_page_requires_request_parameter():
+    with pytest.raises(TypeError, match="@page needs the route to take the request"):
+
+        @page(Div, cls="shell")
+        def content():
+            return Li("a")
@@ -1,8 +1,27 @@
 """Tests for SSE stream helpers."""
 
+import asyncio
+import contextvars
+import threading
+import time
+
+import anyio
 import pytest
+from fasthtml.common import Div, P
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Route, WebSocketRoute
+from starlette.testclient import TestClient
 
-from faststrap.presets import SSEStream, sse_comment, sse_event
+from faststrap.presets import (
+    SSEBroker,
+    SSEEventLog,
+    SSEStream,
+    sse_comment,
+    sse_event,
+    sse_throttle,
+    streams,
+)
 
 
 @pytest.fixture
@@ -42,3 +61,486 @@ async def test_sse_stream_formats_events() -> None:
     assert "id: 1" in body
     assert "retry: 5000" in body
     assert ": keepalive" in body
+
+
+def test_sse_encoder_produces_bytes_for_each_data_kind(monkeypatch) -> None:
+    monkeypatch.setattr(streams, "_orjson", None)
+    encode = streams._encode_sse
+
+    assert encode(sse_event("one line", event="tick", event_id="7")) == (
+        b"event: tick\nid: 7\ndata: one line\n\n"
+    )
+    assert encode("a\r\nb\rc\n") == b"data: a\ndata: b\ndata: c\n\n"
+    assert encode(sse_event(b'{"pre":1}')) == b'data: {"pre":1}\n\n'
+    assert encode(sse_event({"n": 1})) == b'data: {"n": 1}\n\n'
+    assert encode(sse_event(Div(P("hi"), id="panel"))) == (
+        b'data: <div id="panel"><p>hi</p></div>\n\n'
+    )
+    assert encode(sse_event(None)) == b"data: \n\n"
+    assert encode(sse_comment("a\nb")) == b": a\n: b\n\n"
+
+
+def test_sse_event_renders_components_once_and_reuses_identical_fragments() -> None:
+    def card(value: int):
+        return Div(P("Orders"), P(f"{value}", cls="fs-3"), id="kpi")
+
+    first = sse_event(card(42), event="kpi")
+    again = sse_event(card(42), event="kpi")
+    changed = sse_event(card(43), event="kpi")
+
+    assert first["data"] == '<div id="kpi"><p>Orders</p><p class="fs-3">42</p></div>'
+    assert again["data"] is first["data"]
+    assert changed["data"] is not first["data"]
+    assert "43" in changed["data"]
+
+
+def test_sse_comment_splits_on_every_line_break() -> None:
+    frame = streams._encode_sse(sse_comment("one\rretry: 1\r\ntwo\nthree"))
+
+    assert frame == b": one\n: retry: 1\n: two\n: three\n\n"
+    assert streams._encode_sse(sse_comment("")) == b": \n\n"
+
+
+def test_sse_event_component_text_keeps_line_breaks() -> None:
+    frame = streams._encode_sse(sse_event(Div(P("line one\nline two"), hx_vals={"a": 1})))
+
+    lines = [line.removeprefix(b"data: ") for line in frame.strip().split(b"\n")]
+    assert b"\n".join(lines).decode() == (
+        "<div hx-vals='{\"a\": 1}'><p>line one\nline two</p></div>"
+    )
+
+
+@pytest.mark.anyio
+async def test_sse_stream_sends_heartbeats_while_async_source_is_idle() -> None:
+    closed = asyncio.Event()
+
+    async def events():
+        try:
+            yield sse_event("first")
+            await asyncio.sleep(60)
+        finally:
+            closed.set()
+
+    body = SSEStream(events(), heartbeat=0.02).body_iterator
+
+    assert await body.__anext__() == b"data: first\n\n"
+    assert await asyncio.wait_for(body.__anext__(), 1) == b": keep-alive\n\n"
+    await body.aclose()
+    assert closed.is_set()
+
+
+@pytest.mark.anyio
+async def test_sse_stream_iterates_source_directly_by_default() -> None:
+    async def events():
+        yield sse_event("one")
+
+    body = SSEStream(events()).body_iterator
+
+    assert body.ag_code.co_name == "_aiter_sse"
+    assert [frame async for frame in body] == [b"data: one\n\n"]
+
+
+@pytest.mark.anyio
+async def test_sse_stream_steps_async_source_in_one_task() -> None:
+    marker: contextvars.ContextVar[str] = contextvars.ContextVar("marker", default="unset")
+    closed = asyncio.Event()
+
+    async def events():
+        # A cancel scope held across yields must be exited in the task that entered it.
+        with anyio.CancelScope():
+            marker.set("kept")
+            yield sse_event("one")
+            await asyncio.sleep(0.05)
+            yield sse_event(marker.get())
+            try:
+                await asyncio.sleep(60)
+            finally:
+                closed.set()
+
+    body = SSEStream(events(), heartbeat=0.01).body_iterator
+
+    assert await body.__anext__() == b"data: one\n\n"
+    frame = await asyncio.wait_for(body.__anext__(), 1)
+    while frame == b": keep-alive\n\n":
+        frame = await asyncio.wait_for(body.__anext__(), 1)
+    assert frame == b"data: kept\n\n"
+    await body.aclose()
+    assert closed.is_set()
+
+
+@pytest.mark.anyio
+async def test_sse_stream_sends_heartbeats_for_blocking_sync_source() -> None:
+    release = threading.Event()
+
+    def events():
+        yield "one"
+        release.wait(5)
+        yield "two"
+
+    body = SSEStream(events(), heartbeat=0.02).body_iterator
+
+    assert await body.__anext__() == b"data: one\n\n"
+    assert await asyncio.wait_for(body.__anext__(), 1) == b": keep-alive\n\n"
+    release.set()
+    frames = [frame async for frame in body]
+    assert frames[-1] == b"data: two\n\n"
+    assert set(frames[:-1]) <= {b": keep-alive\n\n"}
+
+
+@pytest.mark.anyio
+async def test_sse_stream_closes_source_when_client_disconnects(monkeypatch) -> None:
+    monkeypatch.setattr(streams, "_DISCONNECT_POLL_SECONDS", 0.01)
+    connected = [True]
+    closed = asyncio.Event()
+
+    async def receive():
+        return {"type": "http.request" if connected[0] else "http.disconnect"}
+
+    async def events():
+        try:
+            yield sse_event("ready")
+            await asyncio.sleep(60)
+        finally:
+            closed.set()
+
+    request = Request({"type": "http", "method": "GET", "headers": []}, receive)
+    body = SSEStream(events(), heartbeat=None, request=request).body_iterator
+
+    assert await body.__anext__() == b"data: ready\n\n"
+    connected[0] = False
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(body.__anext__(), 1)
+    assert closed.is_set()
+
+
+@pytest.mark.anyio
+async def test_sse_broker_formats_once_and_shares_frames() -> None:
+    broker = SSEBroker()
+    first = broker.subscribe("dash")
+    second = broker.subscribe("dash")
+    pending = [asyncio.ensure_future(first.__anext__()), asyncio.ensure_future(second.__anext__())]
+    await asyncio.sleep(0)
+
+    assert broker.subscriber_count("dash") == 2
+    assert broker.publish("dash", sse_event("hi", event="stats")) == 2
+    assert broker.publish("other", "ignored") == 0
+
+    frames = await asyncio.gather(*pending)
+    assert frames[0] == b"event: stats\ndata: hi\n\n"
+    assert frames[0] is frames[1]
+
+    await first.aclose()
+    await second.aclose()
+    assert broker.subscriber_count() == 0
+
+
+@pytest.mark.anyio
+async def test_sse_broker_publish_from_thread_wakes_subscriber() -> None:
+    broker = SSEBroker()
+    events = broker.subscribe("jobs")
+    pending = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+
+    thread = threading.Thread(target=broker.publish, args=("jobs", sse_event({"done": 1})))
+    thread.start()
+    thread.join()
+
+    assert await asyncio.wait_for(pending, 1) == b'data: {"done": 1}\n\n'
+    await events.aclose()
+
+
+@pytest.mark.anyio
+async def test_sse_broker_stream_passes_frames_through() -> None:
+    broker = SSEBroker()
+    response = broker.stream("feed")
+    body = response.body_iterator
+    pending = asyncio.ensure_future(body.__anext__())
+    while not broker.subscriber_count("feed"):
+        await asyncio.sleep(0)
+    broker.publish("feed", sse_comment("ping"))
+
+    assert response.media_type == "text/event-stream"
+    assert await asyncio.wait_for(pending, 1) == b": ping\n\n"
+    await body.aclose()
+    assert broker.subscriber_count("feed") == 0
+
+
+async def _drain(events, count: int) -> list[bytes]:
+    return [await asyncio.wait_for(events.__anext__(), 1) for _ in range(count)]
+
+
+async def _slow_subscriber(broker: SSEBroker, topic: str):
+    # Start the subscription, then stop reading to simulate a stalled client.
+    events = broker.subscribe(topic)
+    first = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+    broker.publish(topic, "hello")
+    assert await first == b"data: hello\n\n"
+    return events
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("overflow", "expected"),
+    [
+        ("drop-oldest", [b"data: 3\n\n", b"data: 4\n\n"]),
+        ("drop-newest", [b"data: 0\n\n", b"data: 1\n\n"]),
+    ],
+)
+async def test_sse_broker_bounds_slow_subscriber_queue(overflow, expected) -> None:
+    broker = SSEBroker(max_queue=2, overflow=overflow)
+    events = await _slow_subscriber(broker, "feed")
+
+    for value in range(5):
+        broker.publish("feed", value)
+
+    assert broker.stats("feed") == {
+        "subscribers": 1,
+        "queued": 2,
+        "max_depth": 2,
+        "dropped": 3,
+        "disconnected": 0,
+    }
+    assert await _drain(events, 2) == expected
+    await events.aclose()
+
+
+@pytest.mark.anyio
+async def test_sse_broker_coalesces_by_event_name() -> None:
+    broker = SSEBroker(max_queue=3, overflow="coalesce")
+    events = await _slow_subscriber(broker, "dash")
+
+    for value in range(50):
+        broker.publish("dash", sse_event(value, event="stats"))
+        broker.publish("dash", sse_event(value, event="load"))
+    broker.publish("dash", sse_event("!", event="alert"))
+
+    assert broker.stats("dash")["dropped"] == 98
+    assert await _drain(events, 3) == [
+        b"event: stats\ndata: 49\n\n",
+        b"event: load\ndata: 49\n\n",
+        b"event: alert\ndata: !\n\n",
+    ]
+    await events.aclose()
+
+
+@pytest.mark.anyio
+async def test_sse_broker_disconnects_slow_consumer() -> None:
+    broker = SSEBroker(max_queue=2, overflow="disconnect")
+    fast = broker.subscribe("feed")
+    greeting = asyncio.ensure_future(fast.__anext__())
+    await asyncio.sleep(0)
+    slow = await _slow_subscriber(broker, "feed")
+    assert await greeting == b"data: hello\n\n"
+
+    received: list[bytes] = []
+    for value in range(3):
+        assert broker.publish("feed", value) == (2 if value < 2 else 1)
+        received += await _drain(fast, 1)
+
+    with pytest.raises(StopAsyncIteration):
+        await slow.__anext__()
+    assert broker.stats() == {
+        "subscribers": 1,
+        "queued": 0,
+        "max_depth": 0,
+        "dropped": 3,
+        "disconnected": 1,
+    }
+    assert received == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+    await fast.aclose()
+
+
+def test_sse_broker_rejects_unknown_overflow_policy() -> None:
+    with pytest.raises(ValueError, match="overflow must be one of"):
+        SSEBroker(overflow="block")  # type: ignore[arg-type]
+
+
+def test_sse_event_log_assigns_ids_and_replays_or_resyncs() -> None:
+    log = SSEEventLog(size=3)
+
+    assert log.record("t", sse_event("a", event="x", event_id="ignored")) == (
+        b"id: 1\nevent: x\ndata: a\n\n"
+    )
+    for value in "bcd":
+        log.record("t", value)
+    assert log.record("t", sse_comment()) == b": keep-alive\n\n"
+
+    assert log.last_id("t") == 4
+    assert log.replay("t", None) == []
+    assert log.replay("t", "4") == []
+    assert log.replay("t", "2") == [b"id: 3\ndata: c\n\n", b"id: 4\ndata: d\n\n"]
+    assert log.replay("t", 1) == [
+        b"id: 2\ndata: b\n\n",
+        b"id: 3\ndata: c\n\n",
+        b"id: 4\ndata: d\n\n",
+    ]
+
+    resync = [b"event: resync\nid: 4\ndata: \n\n"]
+    assert log.replay("t", "0") == resync
+    assert log.replay("t", "99") == resync
+    assert log.replay("t", "junk") == resync
+
+
+@pytest.mark.anyio
+async def test_sse_broker_replays_missed_events_from_last_event_id() -> None:
+    broker = SSEBroker(history=10)
+    broker.publish("feed", "one")
+    broker.publish("feed", "two")
+    broker.publish("feed", sse_event("three", event="note"))
+
+    request = Request({"type": "http", "method": "GET", "headers": [(b"last-event-id", b"1")]})
+    body = broker.stream("feed", request=request, heartbeat=None).body_iterator
+
+    assert await body.__anext__() == b"id: 2\ndata: two\n\n"
+    assert await body.__anext__() == b"id: 3\nevent: note\ndata: three\n\n"
+    pending = asyncio.ensure_future(body.__anext__())
+    while not broker.subscriber_count("feed"):
+        await asyncio.sleep(0)
+    assert broker.publish("feed", "four") == 1
+    assert await asyncio.wait_for(pending, 1) == b"id: 4\ndata: four\n\n"
+    await body.aclose()
+
+
+def test_sse_stream_replays_history_from_last_event_id() -> None:
+    log = SSEEventLog()
+    for value in ("one", "two", "three"):
+        log.record("feed", value)
+
+    async def live():
+        yield log.record("feed", "four")
+
+    async def feed(request: Request):
+        source = live() if request.query_params.get("mode") == "async" else iter(["plain"])
+        return SSEStream(source, request=request, history=log, topic="feed")
+
+    client = TestClient(Starlette(routes=[Route("/feed", feed)]))
+    resumed = client.get("/feed?mode=async", headers={"Last-Event-ID": "1"})
+    assert resumed.text == ("id: 2\ndata: two\n\nid: 3\ndata: three\n\nid: 4\ndata: four\n\n")
+
+    by_query = client.get("/feed?last_event_id=3")
+    assert by_query.text == "id: 4\ndata: four\n\ndata: plain\n\n"
+    assert client.get("/feed").text == "data: plain\n\n"
+    assert "event: resync" in client.get("/feed", headers={"Last-Event-ID": "99"}).text
+
+    with pytest.raises(ValueError, match="topic"):
+        SSEStream(iter(()), history=log)
+
+
+@pytest.mark.anyio
+async def test_sse_throttle_keeps_latest_payload_per_event_name() -> None:
+    async def burst():
+        for value in range(100):
+            yield sse_event(value, event="cpu")
+            yield sse_event(-value, event="mem")
+        yield sse_comment("ping")
+
+    payloads = [item async for item in sse_throttle(burst(), interval=10)]
+
+    assert payloads == [
+        sse_event(0, event="cpu"),
+        sse_comment("ping"),
+        sse_event(-99, event="mem"),
+        sse_event(99, event="cpu"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_sse_throttle_flushes_on_time_while_source_is_idle() -> None:
+    async def updates():
+        for value in range(5):
+            yield {"data": value, "kpi": "orders"}
+        await asyncio.sleep(60)
+
+    throttled = sse_throttle(updates(), per_key="kpi", interval=0.02)
+
+    assert await throttled.__anext__() == {"data": 0, "kpi": "orders"}
+    assert await asyncio.wait_for(throttled.__anext__(), 1) == {"data": 4, "kpi": "orders"}
+    await throttled.aclose()
+
+
+@pytest.mark.anyio
+async def test_sse_throttle_steps_async_source_in_one_task() -> None:
+    closed = asyncio.Event()
+
+    async def updates():
+        try:
+            with anyio.CancelScope():
+                for value in range(3):
+                    yield {"data": value, "kpi": "orders"}
+                    await asyncio.sleep(0.01)
+                await asyncio.sleep(60)
+        finally:
+            closed.set()
+
+    throttled = sse_throttle(updates(), per_key="kpi", interval=0.005)
+
+    seen = [await asyncio.wait_for(throttled.__anext__(), 1) for _ in range(3)]
+    assert [payload["data"] for payload in seen] == [0, 1, 2]
+    await throttled.aclose()
+    assert closed.is_set()
+
+
+@pytest.mark.anyio
+async def test_sse_throttle_accepts_sync_sources_in_sse_stream() -> None:
+    body = SSEStream(
+        sse_throttle(iter(range(50)), per_key=None, interval=10), heartbeat=None
+    ).body_iterator
+
+    assert [frame async for frame in body] == [b"data: 0\n\n", b"data: 49\n\n"]
+
+
+@pytest.mark.anyio
+async def test_sse_broker_multiplexes_topics_as_event_names() -> None:
+    broker = SSEBroker(history=5)
+    merged = broker.subscribe_many("orders", "revenue")
+    single = broker.subscribe("orders")
+    pending = [asyncio.ensure_future(merged.__anext__()), asyncio.ensure_future(single.__anext__())]
+    while broker.subscriber_count("orders") < 2:
+        await asyncio.sleep(0)
+
+    assert broker.subscriber_count() == 2
+    broker.publish("orders", sse_event("<tr>1</tr>", event="row"))
+    broker.publish("revenue", "42")
+
+    assert await pending[0] == b"event: orders\nid: 1\ndata: <tr>1</tr>\n\n"
+    assert await pending[1] == b"id: 1\nevent: row\ndata: <tr>1</tr>\n\n"
+    assert await merged.__anext__() == b"event: revenue\nid: 1\ndata: 42\n\n"
+
+    await merged.aclose()
+    await single.aclose()
+    assert broker.subscriber_count() == 0
+    response = broker.multiplex("orders", "revenue", heartbeat=None)
+    assert response.media_type == "text/event-stream"
+
+
+def test_sse_broker_relays_topics_over_websocket() -> None:
+    broker = SSEBroker(history=5)
+    broker.publish("board", sse_event("missed", event="card"))
+    broker.publish("board", sse_event("seen", event="card"))
+    moves: list[object] = []
+
+    def on_message(data: object) -> dict:
+        moves.append(data)
+        return sse_event("ok", event="ack")
+
+    async def board(websocket) -> None:
+        await broker.websocket(websocket, "board", on_message=on_message)
+
+    app = Starlette(routes=[WebSocketRoute("/ws", board)])
+    with TestClient(app).websocket_connect("/ws?last_event_id=1") as ws:
+        assert ws.receive_bytes() == b"id: 2\nevent: card\ndata: seen\n\n"
+        while not broker.subscriber_count("board"):
+            time.sleep(0.01)
+        broker.publish("board", sse_event("<li>3</li>", event="card"))
+        assert ws.receive_bytes() == b"id: 3\nevent: card\ndata: <li>3</li>\n\n"
+
+        ws.send_json({"event": "move", "data": {"card": "3"}})
+        assert ws.receive_bytes() == b"event: ack\ndata: ok\n\n"
+    assert moves == [{"event": "move", "data": {"card": "3"}}]
+
+    for _ in range(100):
+        if not broker.subscriber_count():
+            break
+        time.sleep(0.01)
+    assert broker.subscriber_count() == 0